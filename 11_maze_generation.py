@@ -1,50 +1,450 @@
+"""
+迷路の自動生成
+
+このプログラムは、完全迷路（perfect maze: 任意の2マスを結ぶ道がちょうど1本）を生成します。
+- 迷路は1マス1バイトの bytearray（WALL=1 / PASSAGE=0、行優先）で保持
+- 再帰を使わない反復的バックトラック（DFS）: 戻り方向をマス自体に書き込むため追加のスタック不要
+- Wilson のアルゴリズム（ループ消去ランダムウォーク、一様ランダムな全域木）
+- Eller のアルゴリズム（1行ずつ確定していくため、幅に比例するメモリだけで生成できる）
+  - iter_maze_rows / write_maze: 確定した行から順にファイルやソケットへ流す（高さに制限なし）
+- Kruskal のアルゴリズム（壁をランダム順に見て Union-Find で閉路を避ける）
+- seed を指定すると同じ迷路を再現できる（省略時は random モジュールの乱数を使うため random.seed() も効く）
+
+再帰版は大きさ 65 前後で Python の再帰上限に達していましたが、
+これらは 10001x10001 のような巨大な迷路も生成できます（1億マスで約 100MB）。
+追加のメモリは、バックトラックと Wilson が迷路そのものだけ、Eller が幅に比例する分だけです。
+Kruskal は壁の順序と Union-Find の配列に 1マスあたり約 5 バイトを使うため、
+巨大な迷路ではバックトラックか Eller（iter_maze_rows）を使います。
+"""
+
+import io
+import os
 import random
+import socket
+import sys
+import time
+import tracemalloc
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WALL = 1
+PASSAGE = 0
+ALGORITHMS = ('backtracker', 'wilson', 'eller', 'kruskal')
+
+# 反復的バックトラックで「どの方向から来たか」をマスに書き込む値（2〜5）と始点の印
+_FROM_DIRECTION = 2
+_ROOT = 6
+# 生成後に印をすべて通路に戻す変換表
+_CLEAR_MARKS = bytes(PASSAGE if 2 <= value <= _ROOT else value for value in range(256))
+# 表示用の変換表（壁 '#'、通路 ' '）
+_TEXT = bytes(ord('#') if value == WALL else ord(' ') for value in range(256))
+
+
+def _check_size(width, height):
+    if width % 2 == 0 or height % 2 == 0 or width < 3 or height < 3:
+        raise ValueError("迷路サイズは3以上の奇数にしてください (例: 21)")
+
+
+def _rng(seed):
+    """乱数生成器（seed が None なら random モジュール自体を使い、random.seed() で再現できるようにする）"""
+    return random if seed is None else random.Random(seed)
+
+
+def _offsets(width):
+    """2マス先への移動量（左・右・上・下）"""
+    return (-2, 2, -2 * width, 2 * width)
+
+
+def _carve_backtracker(grid, width, height, rng):
+    """明示的な状態で行う深さ優先の穴掘り（再帰なし）"""
+    offsets = _offsets(width)
+    random_value = rng.random
+    top, bottom = 2 * width, (height - 2) * width
+    current = width + 1
+    grid[current] = _ROOT
+
+    while True:
+        x = current % width
+        candidates = []
+        if x > 1 and grid[current - 2] == WALL:
+            candidates.append(0)
+        if x < width - 2 and grid[current + 2] == WALL:
+            candidates.append(1)
+        if current > top and grid[current - top] == WALL:
+            candidates.append(2)
+        if current < bottom and grid[current + top] == WALL:
+            candidates.append(3)
+
+        if candidates:
+            direction = candidates[int(random_value() * len(candidates))]
+            offset = offsets[direction]
+            grid[current + offset // 2] = PASSAGE
+            current += offset
+            grid[current] = _FROM_DIRECTION + direction  # 戻り道の記録
+        else:
+            mark = grid[current]
+            if mark == _ROOT:
+                break
+            current -= offsets[mark - _FROM_DIRECTION]  # 来た方向へ戻る
+
+
+def _carve_wilson(grid, width, height, rng):
+    """ループ消去ランダムウォークで全域木を作る（マスの一覧は作らず、迷路の外に状態を持たない）"""
+    offsets = _offsets(width)
+    random_value = rng.random
+    top, bottom = 2 * width, (height - 2) * width
+    columns, rows = (width - 1) // 2, (height - 1) // 2
+    first = rng.randrange(columns * rows)
+    grid[(first // columns * 2 + 1) * width + first % columns * 2 + 1] = PASSAGE
+
+    for y in range(1, height - 1, 2):
+        for start in range(y * width + 1, y * width + width - 1, 2):
+            if grid[start] == PASSAGE:
+                continue
+            # 木に当たるまで歩き、各マスに最後に出た方向を書く（上書きでループが消える）
+            current = start
+            while grid[current] != PASSAGE:
+                x = current % width
+                candidates = []
+                if x > 1:
+                    candidates.append(0)
+                if x < width - 2:
+                    candidates.append(1)
+                if current > top:
+                    candidates.append(2)
+                if current < bottom:
+                    candidates.append(3)
+                direction = candidates[int(random_value() * len(candidates))]
+                grid[current] = _FROM_DIRECTION + direction
+                current += offsets[direction]
+            # 記録した方向をたどって木に加える
+            current = start
+            while grid[current] != PASSAGE:
+                offset = offsets[grid[current] - _FROM_DIRECTION]
+                grid[current] = PASSAGE
+                grid[current + offset // 2] = PASSAGE
+                current += offset
+
+
+def _eller_rows(width, height, rng):
+    """
+    Eller のアルゴリズムで迷路を1行ずつ生成する（幅に比例するメモリのみ）
+
+    Yields:
+        bytearray: 上から順に確定した行（長さ width）
+    """
+    _check_size(width, height)
+    columns = (width - 1) // 2
+    last_row = (height - 1) // 2 - 1
+    random_value = rng.random
+    sets = [0] * columns  # 各列のマスが属する集合（0 は未割り当て）
+    next_set = 1
+
+    yield bytearray([WALL]) * width
+    for row in range(last_row + 1):
+        members = {}
+        for column in range(columns):
+            if not sets[column]:
+                sets[column] = next_set
+                next_set += 1
+            members.setdefault(sets[column], []).append(column)
+
+        # 横方向: 異なる集合の隣り合うマスをランダムに（最終行では必ず）つなぐ
+        cells = bytearray([WALL]) * width
+        for column in range(columns):
+            cells[2 * column + 1] = PASSAGE
+        for column in range(columns - 1):
+            a, b = sets[column], sets[column + 1]
+            if a != b and (row == last_row or random_value() < 0.5):
+                cells[2 * column + 2] = PASSAGE
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                # 小さい方の集合のマスを大きい方へ付け替える
+                for merged in members.pop(b):
+                    sets[merged] = a
+                    members[a].append(merged)
+        yield cells
+        if row == last_row:
+            break
+
+        # 縦方向: 各集合から少なくとも1マスは下へ伸ばす
+        below = bytearray([WALL]) * width
+        next_sets = [0] * columns
+        for label, cells_of_set in members.items():
+            down = [column for column in cells_of_set if random_value() < 0.5]
+            if not down:
+                down = [cells_of_set[int(random_value() * len(cells_of_set))]]
+            for column in down:
+                below[2 * column + 1] = PASSAGE
+                next_sets[column] = label
+        sets = next_sets
+        yield below
+    yield bytearray([WALL]) * width
+
+
+def _find(parent, i):
+    """Union-Find の根（経路を半分に縮める）"""
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _carve_kruskal(grid, width, height, rng):
+    """
+    壁をランダム順に調べ、別々の集合を隔てる壁だけを壊す
+
+    壁の順序（8 バイト x 約 width * height / 2）と Union-Find の親の配列（4 バイト x 部屋の数）を
+    迷路とは別に持つため、巨大な迷路ではメモリが迷路そのものの約 5 倍必要になる。
+    """
+    columns, rows = (width - 1) // 2, (height - 1) // 2
+    for y in range(1, height - 1, 2):
+        grid[y * width + 1:y * width + width - 1:2] = bytes(columns)
+
+    walls = array('q')
+    for y in range(1, height - 1):
+        start = 2 if y % 2 else 1
+        walls.extend(range(y * width + start, y * width + width - 1, 2))
+    rng.shuffle(walls)
+
+    parent = array('i', range(columns * rows))
+    remaining = columns * rows - 1
+    for wall in walls:
+        y, x = divmod(wall, width)
+        if y % 2:
+            a = (y // 2) * columns + (x - 1) // 2
+            b = a + 1
+        else:
+            a = (y // 2 - 1) * columns + x // 2
+            b = a + columns
+        root_a, root_b = _find(parent, a), _find(parent, b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+            grid[wall] = PASSAGE
+            remaining -= 1
+            if not remaining:
+                break
+
+
+def generate_maze_grid(width=21, height=None, seed=None, algorithm='backtracker'):
+    """
+    完全迷路を1マス1バイトの bytearray として生成する
+
+    Args:
+        width (int): 横のマス数（奇数）
+        height (int): 縦のマス数（奇数、省略時は width と同じ）
+        seed: 乱数の種（同じ値なら同じ迷路、省略時は random モジュールの乱数）
+        algorithm (str): 'backtracker' / 'wilson' / 'eller' / 'kruskal'
+            （'kruskal' だけは迷路の約 5 倍の作業用メモリを使う）
+
+    Returns:
+        bytearray: 行優先の迷路（WALL=1 / PASSAGE=0）。
+            入口は (1, 0)、出口は (height - 2, width - 1)（行, 列）の外周
+    """
+    height = width if height is None else height
+    _check_size(width, height)
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"algorithm は {ALGORITHMS} のいずれかです: {algorithm}")
+    rng = _rng(seed)
+
+    if algorithm == 'eller':
+        grid = bytearray()
+        for row in _eller_rows(width, height, rng):
+            grid += row
+    else:
+        grid = bytearray([WALL]) * (width * height)
+        if algorithm == 'backtracker':
+            _carve_backtracker(grid, width, height, rng)
+            grid = grid.translate(_CLEAR_MARKS)
+        elif algorithm == 'wilson':
+            _carve_wilson(grid, width, height, rng)
+        else:
+            _carve_kruskal(grid, width, height, rng)
+
+    start, goal = maze_endpoints(width, height)
+    grid[start[0] * width + start[1]] = PASSAGE
+    grid[goal[0] * width + goal[1]] = PASSAGE
+    return grid
+
+
+def maze_endpoints(width, height=None):
+    """入口（スタート）と出口（ゴール）の (行, 列)"""
+    height = width if height is None else height
+    return (1, 0), (height - 2, width - 1)
+
 
-def generate_maze(size=21):
+def maze_array(grid, width, height=None):
+    """bytearray の迷路をコピーせずに (height, width) の NumPy 配列として参照する"""
+    if np is None:
+        raise ImportError("maze_array には NumPy が必要です（pip install numpy）")
+    height = width if height is None else height
+    return np.frombuffer(grid, dtype=np.uint8).reshape(height, width)
+
+
+def format_maze(grid, width, height=None):
     """
-    再帰的バックトラック（DFS）で perfect maze を生成する。
+    bytearray の迷路を1行ずつ文字列にする（'#' 壁, ' ' 通路, 'S' スタート, 'G' ゴール）
+
+    Yields:
+        str: 迷路の各行
+    """
+    height = width if height is None else height
+    (start_row, start_col), (goal_row, goal_col) = maze_endpoints(width, height)
+    for y in range(height):
+        line = bytearray(grid[y * width:(y + 1) * width].translate(_TEXT))
+        if y == start_row:
+            line[start_col] = ord('S')
+        if y == goal_row:
+            line[goal_col] = ord('G')
+        yield line.decode('ascii')
+
+
+def iter_maze_rows(width=21, height=None, seed=None):
+    """
+    Eller のアルゴリズムで迷路を上から1行ずつ生成する
+
+    行は確定した時点で返され、保持する状態は1行分の集合番号だけ（メモリは幅に比例）。
+    同じ seed なら generate_maze_grid(..., algorithm='eller') と同じ迷路になる。
+
+    Yields:
+        bytearray: 各行（WALL=1 / PASSAGE=0、入口と出口は通路）
+    """
+    height = width if height is None else height
+    (start_row, start_col), (goal_row, goal_col) = maze_endpoints(width, height)
+    for y, row in enumerate(_eller_rows(width, height, _rng(seed))):
+        if y == start_row:
+            row[start_col] = PASSAGE
+        if y == goal_row:
+            row[goal_col] = PASSAGE
+        yield row
+
+
+def write_maze(output, width=21, height=None, seed=None, buffer_rows=64):
+    """
+    迷路を文字（'#', ' ', 'S', 'G'）で1行ずつ書き出す（迷路全体をメモリに持たない）
+
+    Args:
+        output: ファイル名、バイナリ / テキストのファイルオブジェクト、または socket
+        width, height: 迷路の大きさ（奇数）
+        seed: 乱数の種
+        buffer_rows (int): まとめて書き出す行数
+
+    Returns:
+        int: 書き出したバイト数
+    """
+    if isinstance(output, str):
+        with open(output, 'wb') as f:
+            return write_maze(f, width, height, seed, buffer_rows)
+
+    if isinstance(output, socket.socket):
+        send = output.sendall
+    elif isinstance(output, io.TextIOBase):
+        send = lambda data: output.write(data.decode('ascii'))
+    else:
+        send = output.write
+
+    height = width if height is None else height
+    (start_row, start_col), (goal_row, goal_col) = maze_endpoints(width, height)
+    buffer = bytearray()
+    written = 0
+    for y, row in enumerate(iter_maze_rows(width, height, seed)):
+        line = row.translate(_TEXT)
+        if y == start_row:
+            line[start_col] = ord('S')
+        if y == goal_row:
+            line[goal_col] = ord('G')
+        buffer += line
+        buffer += b'\n'
+        if (y + 1) % buffer_rows == 0:
+            send(bytes(buffer))
+            written += len(buffer)
+            buffer.clear()
+    if buffer:
+        send(bytes(buffer))
+        written += len(buffer)
+    return written
+
+
+def generate_maze(size=21, seed=None, algorithm='backtracker'):
+    """
+    perfect maze を生成する（文字のリストのリスト）。
     - '#' : 壁
     - ' ' : 通路
     - 'S' : スタート
     - 'G' : ゴール
+    大きな迷路では generate_maze_grid の bytearray をそのまま使う方がメモリ効率がよい。
     """
     if size % 2 == 0:
         raise ValueError("迷路サイズは奇数にしてください (例: 21)")
+    grid = generate_maze_grid(size, seed=seed, algorithm=algorithm)
+    return [list(line) for line in format_maze(grid, size)]
 
-    # 最初は全部壁
-    maze = [['#'] * size for _ in range(size)]
-
-    # 再帰的に通路を掘る
-    def carve(y, x):
-        maze[y][x] = ' '  # 現在位置を通路に
-        # 2マス先へ進む候補（上下左右）をランダム順に試す
-        directions = [(0, 2), (0, -2), (2, 0), (-2, 0)]
-        random.shuffle(directions)
 
-        for dy, dx in directions:
-            ny, nx = y + dy, x + dx
-            # 2マス先が迷路の内側かつまだ壁なら掘り進める
-            if 1 <= ny < size - 1 and 1 <= nx < size - 1 and maze[ny][nx] == '#':
-                # 間の1マスも通路にする
-                maze[y + dy // 2][x + dx // 2] = ' '
-                carve(ny, nx)  # 再帰
+def print_maze(maze):
+    for row in maze:
+        print(''.join(row))
 
-    # (1,1) から掘り始める
-    carve(1, 1)
 
-    # スタートとゴールを外周に開ける
-    maze[1][0] = 'S'                # 左側にスタート
-    maze[1][1] = ' '                # すぐ右は必ず通路
-    maze[size - 2][size - 1] = 'G'  # 右側にゴール
-    maze[size - 2][size - 2] = ' '  # すぐ左は必ず通路
+def benchmark(sizes=(101, 501, 1001), algorithms=ALGORITHMS, seed=0):
+    """
+    各アルゴリズムの生成速度（マス/秒、マスは通路になる格子点の数）を計測する
 
-    return maze
+    Returns:
+        list: [(アルゴリズム, 大きさ, 秒, マス/秒), ...]
+    """
+    results = []
+    for size in sizes:
+        cells = ((size - 1) // 2) ** 2
+        for algorithm in algorithms:
+            start_time = time.perf_counter()
+            generate_maze_grid(size, seed=seed, algorithm=algorithm)
+            elapsed = time.perf_counter() - start_time
+            results.append((algorithm, size, elapsed, cells / elapsed))
+    return results
 
-def print_maze(maze):
-    for row in maze:
-        print(''.join(row))
 
 if __name__ == "__main__":
     print("=== 21x21 迷路 ===")
-    m = generate_maze(21)
+    m = generate_maze(21, seed=1)
     print_maze(m)
+
+    print("\n=== 同じ seed なら同じ迷路（Kruskal, 21x11） ===")
+    grid = generate_maze_grid(21, 11, seed=7, algorithm='kruskal')
+    for line in format_maze(grid, 21, 11):
+        print(line)
+    print(f"再現性: {grid == generate_maze_grid(21, 11, seed=7, algorithm='kruskal')}")
+
+    print("\n=== 1行ずつのストリーミング生成（Eller, 31x7） ===")
+    write_maze(sys.stdout, 31, 7, seed=3)
+
+    # 幅 1001 x 高さ 10001 の迷路をメモリに持たずに書き出す
+    start_time = time.perf_counter()
+    size = write_maze(os.devnull, 1001, 10001, seed=0)
+    elapsed = time.perf_counter() - start_time
+    print(f"\n1001x10001 を書き出し: {size / 1e6:.1f} MB, {elapsed:.2f} 秒")
+    # 最大メモリは高さによらず一定（幅に比例）
+    for height in (201, 1001):
+        tracemalloc.start()
+        write_maze(os.devnull, 1001, height, seed=0)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  1001x{height}: 最大メモリ {peak / 1e3:.0f} KB")
+
+    # ソケット経由で送る（受信側は行単位で読める）
+    sender, receiver = socket.socketpair()
+    with sender, receiver:
+        write_maze(sender, 21, 5, seed=1)
+        sender.shutdown(socket.SHUT_WR)
+        received = receiver.makefile('rb').read().decode('ascii')
+    print("\nソケットで受信した迷路:")
+    print(received, end='')
+
+    # python 11_maze_generation.py 10001 のように大きさを指定できる
+    sizes = [int(arg) for arg in sys.argv[1:]] or [101, 501, 1001]
+    print("\n=== 生成速度 ===")
+    for algorithm, size, elapsed, rate in benchmark(sizes):
+        print(f"{algorithm:<12} {size:>6}x{size:<6} {elapsed:8.3f} 秒 {rate:>12,.0f} マス/秒")
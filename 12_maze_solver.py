@@ -1,80 +1,259 @@
+"""
+迷路の最短経路探索
+
+このプログラムは、11_maze_generation.py の迷路を再帰を使わずに解きます。
+- 迷路は1マス1バイトの bytearray（WALL=1 / PASSAGE=0、行優先）のまま扱う
+- 幅優先探索（BFS）: ループのある迷路でも最短経路を保証
+- A*（マンハッタン距離）: 目標方向を優先して訪問マスを減らす
+- 双方向 BFS: スタートとゴールの両側から探索し、出会った点で経路をつなぐ
+- 直前のマスは「どの方向から来たか」を1マス1バイトで記録（整数配列より省メモリ）
+- 入力の迷路は変更せず、経路は行・列の座標配列として返す
+
+再帰 DFS 版は大きな迷路でスタックを使い果たし、
+ループのある迷路では最短経路を見つけられないことがありました。
+"""
+
+import heapq
+import importlib
 import random
+import time
+from array import array
+from collections import deque
+
+WALL = 1
+PASSAGE = 0
+METHODS = ('bfs', 'astar', 'bidirectional')
+
+# 方向の記録: 1〜4 がそれぞれ左・右・上・下へ進んで来たこと、5 が始点
+_START = 5
+
 
 # =========================
-# 迷路生成（再帰的バックトラック）
+# 迷路生成（11_maze_generation.py の反復版を利用）
 # =========================
-def generate_maze(size=21):
+def generate_maze(size=21, seed=None, algorithm='backtracker'):
     """
-    再帰的バックトラック（DFS）で perfect maze を生成する。
+    perfect maze を生成する（11_maze_generation.generate_maze と同じ）。
     - '#' : 壁
     - ' ' : 通路
     - 'S' : スタート
     - 'G' : ゴール
     """
-    if size % 2 == 0:
-        raise ValueError("迷路サイズは奇数にしてください (例: 21)")
-
-    # 最初は全部壁
-    maze = [['#'] * size for _ in range(size)]
-
-    # 再帰的に通路を掘る
-    def carve(y, x):
-        maze[y][x] = ' '  # 現在位置を通路に
-        # 2マス先へ進む候補（上下左右）をランダム順に試す
-        directions = [(0, 2), (0, -2), (2, 0), (-2, 0)]
-        random.shuffle(directions)
-
-        for dy, dx in directions:
-            ny, nx = y + dy, x + dx
-            # 2マス先が迷路の内側かつまだ壁なら掘り進める
-            if 1 <= ny < size - 1 and 1 <= nx < size - 1 and maze[ny][nx] == '#':
-                # 間の1マスも通路にする
-                maze[y + dy // 2][x + dx // 2] = ' '
-                carve(ny, nx)  # 再帰
-
-    # (1,1) から掘り始める
-    carve(1, 1)
-
-    # スタートとゴールを外周に開ける
-    maze[1][0] = 'S'                # 左側にスタート
-    maze[1][1] = ' '                # すぐ右は通路
-    maze[size - 2][size - 1] = 'G'  # 右側にゴール
-    maze[size - 2][size - 2] = ' '  # すぐ左は通路
-
-    return maze
+    return importlib.import_module('11_maze_generation').generate_maze(size, seed, algorithm)
+
+
+def maze_to_grid(maze):
+    """
+    文字の迷路（リストのリスト、または文字列のリスト）を bytearray に変換
+
+    Returns:
+        tuple: (迷路, 幅, 高さ, スタートの (行, 列), ゴールの (行, 列))
+    """
+    height, width = len(maze), len(maze[0])
+    grid = bytearray(width * height)
+    start = goal = None
+    for r, row in enumerate(maze):
+        for c, cell in enumerate(row):
+            if cell == '#':
+                grid[r * width + c] = WALL
+            elif cell == 'S':
+                start = (r, c)
+            elif cell == 'G':
+                goal = (r, c)
+    return grid, width, height, start, goal
+
+
+def _offsets(width):
+    """隣のマスへの移動量（左・右・上・下、添字は記録する方向 - 1）"""
+    return (-1, 1, -width, width)
+
+
+def _neighbors(grid, width, size, cell):
+    """通路の隣接マスと方向（1〜4）"""
+    x = cell % width
+    if x > 0 and grid[cell - 1] == PASSAGE:
+        yield cell - 1, 1
+    if x < width - 1 and grid[cell + 1] == PASSAGE:
+        yield cell + 1, 2
+    if cell >= width and grid[cell - width] == PASSAGE:
+        yield cell - width, 3
+    if cell + width < size and grid[cell + width] == PASSAGE:
+        yield cell + width, 4
+
+
+def _trace_back(came_from, width, cell):
+    """方向の記録をたどり、始点から cell までのマスの列を返す"""
+    offsets = _offsets(width)
+    cells = [cell]
+    while came_from[cell] != _START:
+        cell -= offsets[came_from[cell] - 1]
+        cells.append(cell)
+    cells.reverse()
+    return cells
+
+
+def _coordinates(cells, width):
+    """マスの列を行・列の座標配列に変換"""
+    rows, cols = array('i'), array('i')
+    for cell in cells:
+        r, c = divmod(cell, width)
+        rows.append(r)
+        cols.append(c)
+    return rows, cols
+
+
+def bfs(grid, width, height, start, goal):
+    """
+    幅優先探索（最短経路を保証）
+
+    Returns:
+        tuple: (経路のマスのリスト または None, 訪問マス数)
+    """
+    size = width * height
+    source, target = start[0] * width + start[1], goal[0] * width + goal[1]
+    came_from = bytearray(size)
+    came_from[source] = _START
+    queue = deque([source])
+    visited = 0
+
+    while queue:
+        cell = queue.popleft()
+        visited += 1
+        if cell == target:
+            return _trace_back(came_from, width, target), visited
+        for neighbor, direction in _neighbors(grid, width, size, cell):
+            if not came_from[neighbor]:
+                came_from[neighbor] = direction
+                queue.append(neighbor)
+    return None, visited
+
+
+def a_star(grid, width, height, start, goal):
+    """
+    A*（マンハッタン距離のヒューリスティック、最短経路を保証）
+
+    g 値は訪問したマスの分だけ辞書に持つ。
+
+    Returns:
+        tuple: (経路のマスのリスト または None, 訪問マス数)
+    """
+    size = width * height
+    source, target = start[0] * width + start[1], goal[0] * width + goal[1]
+    goal_row, goal_col = goal
+    came_from = bytearray(size)
+    came_from[source] = _START
+    g_score = {source: 0}
+    queue = [(abs(start[0] - goal_row) + abs(start[1] - goal_col), 0, source)]
+    visited = 0
+
+    while queue:
+        _, g, cell = heapq.heappop(queue)
+        if g > g_score[cell]:
+            continue  # g 値が更新された後の古いエントリ
+        visited += 1
+        if cell == target:
+            return _trace_back(came_from, width, target), visited
+        for neighbor, direction in _neighbors(grid, width, size, cell):
+            if g + 1 < g_score.get(neighbor, size):
+                g_score[neighbor] = g + 1
+                came_from[neighbor] = direction
+                r, c = divmod(neighbor, width)
+                heapq.heappush(queue, (g + 1 + abs(r - goal_row) + abs(c - goal_col), g + 1, neighbor))
+    return None, visited
+
+
+def bidirectional_bfs(grid, width, height, start, goal):
+    """
+    双方向幅優先探索（小さい方の探索前線を1段ずつ広げる、最短経路を保証）
+
+    一方の探索が他方の訪問済みマスを見つけた時点で、その合計の長さが最短になる
+    （他方の訪問済みマスのうち前線より内側のものは、隣接マスをすべて訪問済みのため）。
+
+    Returns:
+        tuple: (経路のマスのリスト または None, 訪問マス数)
+    """
+    size = width * height
+    source, target = start[0] * width + start[1], goal[0] * width + goal[1]
+    if source == target:
+        return [source], 1
+    forward, backward = bytearray(size), bytearray(size)
+    forward[source] = backward[target] = _START
+    frontiers = {True: [source], False: [target]}
+    visited = 0
+
+    while frontiers[True] and frontiers[False]:
+        is_forward = len(frontiers[True]) <= len(frontiers[False])
+        came_from, other = (forward, backward) if is_forward else (backward, forward)
+        next_frontier = []
+        for cell in frontiers[is_forward]:
+            visited += 1
+            for neighbor, direction in _neighbors(grid, width, size, cell):
+                if came_from[neighbor]:
+                    continue
+                came_from[neighbor] = direction
+                if other[neighbor]:
+                    # スタート側の経路と、ゴール側の経路を逆向きにしたものをつなぐ
+                    head = _trace_back(forward, width, neighbor)
+                    tail = _trace_back(backward, width, neighbor)
+                    return head + tail[-2::-1], visited
+                next_frontier.append(neighbor)
+        frontiers[is_forward] = next_frontier
+    return None, visited
+
+
+def solve(grid, width, height=None, start=None, goal=None, method='bfs'):
+    """
+    迷路を解く（入力の迷路は変更しない）
+
+    Args:
+        grid (bytearray): 行優先の迷路（WALL=1 / PASSAGE=0）
+        width, height (int): 迷路の大きさ（height の省略時は width）
+        start, goal (tuple): (行, 列)（省略時は 11番の迷路の入口と出口）
+        method (str): 'bfs' / 'astar' / 'bidirectional'
+
+    Returns:
+        tuple: (行の座標配列, 列の座標配列, 訪問マス数, 所要秒数)。
+            到達できない場合、座標配列は None
+    """
+    if method not in METHODS:
+        raise ValueError(f"method は {METHODS} のいずれかです: {method}")
+    height = width if height is None else height
+    if start is None or goal is None:
+        endpoints = importlib.import_module('11_maze_generation').maze_endpoints(width, height)
+        start = start or endpoints[0]
+        goal = goal or endpoints[1]
+    search = {'bfs': bfs, 'astar': a_star, 'bidirectional': bidirectional_bfs}[method]
+
+    start_time = time.perf_counter()
+    cells, visited = search(grid, width, height, start, goal)
+    elapsed = time.perf_counter() - start_time
+    if cells is None:
+        return None, None, visited, elapsed
+    rows, cols = _coordinates(cells, width)
+    return rows, cols, visited, elapsed
+
 
 # =========================
-# 迷路解法（再帰 DFS）
+# 迷路解法（文字の迷路に '.' で経路を書き込む）
 # =========================
 def solve_maze(maze):
-    def dfs(r, c):
-        # 境界チェックと訪問済み・壁チェック
-        if (r < 0 or r >= len(maze) or c < 0 or c >= len(maze[0]) or
-            maze[r][c] in ['#', '.']):
-            return False
-        # ゴール到達判定
-        if maze[r][c] == 'G':
-            return True
-        # 現在位置を訪問済みとしてマーク
-        # （スタートも一時的に '.' になるが、後で復元する）
-        maze[r][c] = '.'
-        # 四方向への再帰的探索 - 1 つでも成功すれば True
-        if any(dfs(r+dr, c+dc) for dr, dc in [(0,1), (1,0), (0,-1), (-1,0)]):
-            return True
-        # バックトラック：探索失敗時は元に戻す
-        maze[r][c] = ' '
+    """
+    文字の迷路を最短経路で解き、経路の通路マスを '.' にする（BFS、再帰なし）
+
+    Returns:
+        bool: ゴールに到達できたかどうか
+    """
+    grid, width, height, start, goal = maze_to_grid(maze)
+    if start is None or goal is None:
+        return False
+    rows, cols, _, _ = solve(grid, width, height, start, goal)
+    if rows is None:
         return False
+    for r, c in zip(rows, cols):
+        if maze[r][c] == ' ':
+            maze[r][c] = '.'
+    return True
 
-    # スタート地点を見つけて DFS 開始
-    for i in range(len(maze)):
-        for j in range(len(maze[0])):
-            if maze[i][j] == 'S':
-                if dfs(i, j):
-                    maze[i][j] = 'S'  # スタート位置を復元
-                    return True
-                else:
-                    return False
-    return False
 
 # =========================
 # ユーティリティ
@@ -83,6 +262,19 @@ def print_maze(maze):
     for row in maze:
         print(''.join(row))
 
+
+def add_loops(grid, width, height, count, seed=None):
+    """迷路の内側の壁をランダムに count 枚壊してループを作る（新しい bytearray を返す）"""
+    # seed が None なら random モジュール自体を使い、random.seed() で再現できるようにする（11番と同じ）
+    rng = random if seed is None else random.Random(seed)
+    grid = bytearray(grid)
+    walls = [y * width + x for y in range(1, height - 1) for x in range(1, width - 1)
+             if (x + y) % 2 and grid[y * width + x] == WALL]
+    for cell in rng.sample(walls, min(count, len(walls))):
+        grid[cell] = PASSAGE
+    return grid
+
+
 # =========================
 # 実行例
 # =========================
@@ -90,7 +282,7 @@ if __name__ == "__main__":
     size = 21
 
     print("=== 生成された迷路 ===")
-    maze = generate_maze(size)
+    maze = generate_maze(size, seed=0)
     print_maze(maze)
 
     # 解く用にコピー（生成した迷路を残したい場合）
@@ -102,3 +294,13 @@ if __name__ == "__main__":
     else:
         print("\n解経路が見つかりませんでした。")
 
+    # 大きな迷路（ループあり）を3つの方法で解く
+    generation = importlib.import_module('11_maze_generation')
+    size = 1001
+    grid = add_loops(generation.generate_maze_grid(size, seed=0), size, size, 5000, seed=0)
+    snapshot = bytes(grid)
+    print(f"\n=== {size}x{size} 迷路（壁を 5000 枚壊してループを追加） ===")
+    for method in METHODS:
+        rows, cols, visited, elapsed = solve(grid, size, method=method)
+        print(f"{method:<14} 経路長 {len(rows) - 1:6}  訪問 {visited:8} マス  {elapsed * 1000:8.1f} ms")
+    print(f"入力の迷路は変更されていない: {bytes(grid) == snapshot}")
@@ -1,27 +1,236 @@
+"""
+島ラベリング（連結成分ラベリング）
+
+このプログラムは、陸地（1）と海（0）の地図で、つながった陸地ごとに番号を付けます。
+- 2パスの Union-Find 法: 1回目の走査で仮ラベルと等価関係を記録し、2回目で最終ラベルに置き換える
+  （Union-Find は経路の圧縮つき、再帰なし）
+- 4連結（上下左右）と8連結（斜めを含む）に対応
+- NumPy があれば、行ごとの走査を「連（横に続く陸地の区間）」単位の配列演算で行い、
+  連どうしの関係だけを Union-Find で結ぶ（数百万画素の地図も数秒で処理）
+- 各ラベルの画素数と外接矩形（上, 左, 下, 右）を返す
+- 任意の大きさ（H x W）の地図を扱える
+
+再帰 DFS 版は 8x8 に固定され、大きな島では再帰の上限に達していました。
+"""
+
 import random
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _find(parent, i):
+    """Union-Find の根（経路を半分に縮める）"""
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _union(parent, a, b):
+    """小さい番号の方を根にしてつなぐ（最終ラベルが走査順になる）"""
+    a, b = _find(parent, a), _find(parent, b)
+    if a < b:
+        parent[b] = a
+    elif b < a:
+        parent[a] = b
+
+
+def _label_python(grid, connectivity):
+    """画素ごとに走査する2パス法（リストのリストを入力とする）"""
+    height = len(grid)
+    width = len(grid[0]) if height else 0
+    labels = [[0] * width for _ in range(height)]
+    parent = array('i', [0])  # 仮ラベル 0 は背景
+
+    # 1回目: 走査済みの近傍（左・上、8連結では左上・右上も）から仮ラベルを決める
+    for r in range(height):
+        row, current = grid[r], labels[r]
+        above = labels[r - 1] if r else None
+        for c in range(width):
+            if not row[c]:
+                continue
+            neighbors = []
+            if c and current[c - 1]:
+                neighbors.append(current[c - 1])
+            if above is not None:
+                if above[c]:
+                    neighbors.append(above[c])
+                if connectivity == 8:
+                    if c and above[c - 1]:
+                        neighbors.append(above[c - 1])
+                    if c + 1 < width and above[c + 1]:
+                        neighbors.append(above[c + 1])
+            if not neighbors:
+                current[c] = len(parent)
+                parent.append(len(parent))
+            else:
+                label = min(neighbors)
+                current[c] = label
+                for other in neighbors:
+                    if other != label:
+                        _union(parent, label, other)
+
+    # 根を走査順の連番に置き換える表
+    final = array('i', bytes(4 * len(parent)))
+    count = 0
+    for i in range(1, len(parent)):
+        root = _find(parent, i)
+        if root == i:
+            count += 1
+            final[i] = count
+        else:
+            final[i] = final[root]
+
+    # 2回目: 最終ラベルに置き換えながら画素数と外接矩形を集計
+    components = {}
+    for r in range(height):
+        current = labels[r]
+        for c in range(width):
+            if current[c]:
+                label = final[current[c]]
+                current[c] = label
+                component = components.get(label)
+                if component is None:
+                    components[label] = {'size': 1, 'bbox': [r, c, r, c]}
+                else:
+                    component['size'] += 1
+                    bbox = component['bbox']
+                    if c < bbox[1]:
+                        bbox[1] = c
+                    elif c > bbox[3]:
+                        bbox[3] = c
+                    bbox[2] = r
+    for component in components.values():
+        component['bbox'] = tuple(component['bbox'])
+    return labels, count, components
+
+
+def _label_numpy(grid, connectivity):
+    """連（横に続く陸地の区間）単位の配列演算による2パス法"""
+    land = np.asarray(grid) != 0
+    if land.ndim == 1 and not land.size:
+        land = land.reshape(0, 0)  # 空の地図 []
+    height, width = land.shape
+    if not land.any():
+        return np.zeros((height, width), dtype=np.int32), 0, {}
+
+    # 1回目: 連ごとに仮ラベルを付ける（各行の先頭と、左が海の陸地が連の始まり）
+    starts = land.copy()
+    starts[:, 1:] &= ~land[:, :-1]
+    run_of = np.cumsum(starts.ravel()).reshape(height, width) - 1
+    run_count = int(starts.sum())
+
+    # 上下の行で接する連の組（8連結では斜めも）
+    pairs = [(run_of[1:][land[1:] & land[:-1]], run_of[:-1][land[1:] & land[:-1]])]
+    if connectivity == 8:
+        diagonal = land[1:, 1:] & land[:-1, :-1]
+        pairs.append((run_of[1:, 1:][diagonal], run_of[:-1, :-1][diagonal]))
+        diagonal = land[1:, :-1] & land[:-1, 1:]
+        pairs.append((run_of[1:, :-1][diagonal], run_of[:-1, 1:][diagonal]))
+    lower = np.concatenate([a for a, _ in pairs]).astype(np.int64)
+    upper = np.concatenate([b for _, b in pairs]).astype(np.int64)
+    keys = np.unique(lower * run_count + upper)
+
+    # 連どうしの等価関係だけを Union-Find で結ぶ
+    parent = array('i', range(run_count))
+    for lower_run, upper_run in zip((keys // run_count).tolist(), (keys % run_count).tolist()):
+        _union(parent, lower_run, upper_run)
+
+    # 経路を配列演算でたどりきり（ポインタジャンプ）、根を走査順の連番に置き換える
+    roots = np.frombuffer(parent, dtype=np.int32).copy()
+    while True:
+        jumped = roots[roots]
+        if np.array_equal(jumped, roots):
+            break
+        roots = jumped
+    unique_roots, final = np.unique(roots, return_inverse=True)
+    final = (final + 1).astype(np.int32)
+    count = len(unique_roots)
+
+    # 2回目: 画素ごとの最終ラベル
+    labels = np.where(land, final[run_of.clip(0)], 0).astype(np.int32)
+
+    # 画素数と外接矩形は連の単位で集計する
+    run_rows, run_left = np.nonzero(starts)
+    ends = land.copy()
+    ends[:, :-1] &= ~land[:, 1:]
+    _, run_right = np.nonzero(ends)
+    run_label = final - 1
+    sizes = np.bincount(run_label, weights=run_right - run_left + 1, minlength=count).astype(np.int64)
+    top = np.full(count, height, dtype=np.int64)
+    left = np.full(count, width, dtype=np.int64)
+    bottom = np.full(count, -1, dtype=np.int64)
+    right = np.full(count, -1, dtype=np.int64)
+    np.minimum.at(top, run_label, run_rows)
+    np.minimum.at(left, run_label, run_left)
+    np.maximum.at(bottom, run_label, run_rows)
+    np.maximum.at(right, run_label, run_right)
+
+    components = {
+        label + 1: {'size': size, 'bbox': bbox}
+        for label, (size, bbox) in enumerate(zip(
+            sizes.tolist(), zip(top.tolist(), left.tolist(), bottom.tolist(), right.tolist())))
+    }
+    return labels, count, components
+
+
+def label_components(grid, connectivity=4, use_numpy=None):
+    """
+    2パスの Union-Find 法による連結成分ラベリング
+
+    Args:
+        grid: 0（海）/ 0 以外（陸地）の2次元の地図（リストのリスト、または NumPy 配列）
+        connectivity (int): 4（上下左右）または 8（斜めを含む）
+        use_numpy (bool): 連単位の配列演算を使うか（省略時は NumPy があれば使う）
+
+    Returns:
+        tuple: (ラベル, 島の数, 各島の情報)
+            - ラベル: 0 が海、1 からの連番が島（走査順に最初の画素が現れた順）。
+              配列演算を使った場合は NumPy 配列、それ以外はリストのリスト
+            - 各島の情報: {ラベル: {'size': 画素数, 'bbox': (上, 左, 下, 右)}}
+    """
+    if connectivity not in (4, 8):
+        raise ValueError(f"connectivity は 4 または 8 です: {connectivity}")
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise ImportError("配列演算によるラベリングには NumPy が必要です（pip install numpy）")
+        return _label_numpy(grid, connectivity)
+    if np is not None and isinstance(grid, np.ndarray):
+        grid = grid.tolist()
+    return _label_python(grid, connectivity)
+
 
 # 島ラベリングアルゴリズム：連結された陸地を同じ番号でラベル付け
-def label_islands(grid):
-    def dfs(r, c, label):
-        # 境界チェックと陸地判定
-        if r < 0 or r >= 8 or c < 0 or c >= 8 or grid[r][c] != 1:
-            return
-        grid[r][c] = label
-        # 四方向への再帰的探索
-        for dr, dc in [(0,1), (1,0), (0,-1), (-1,0)]:
-            dfs(r+dr, c+dc, label)
-
-    label = 2  # ラベル開始番号（0=海、1=未処理陸地）
-    for i in range(8):
-        for j in range(8):
-            if grid[i][j] == 1:  # 未処理の陸地発見
-                dfs(i, j, label)
-                label += 1
-    return label - 2  # 島の総数
+def label_islands(grid, connectivity=4):
+    """
+    地図の陸地（1）をその場で島の番号（2 から）に書き換え、島の総数を返す
+
+    任意の大きさの地図を扱える（label_components を利用）。
+    1 以外の値のマス（番号付け済みの島など）は陸地として扱わず、そのまま残す。
+    """
+    land = [[cell == 1 for cell in row] for row in grid]
+    labels, count, _ = label_components(land, connectivity, use_numpy=False)
+    for row, labeled in zip(grid, labels):
+        for c, label in enumerate(labeled):
+            if label:
+                row[c] = label + 1  # ラベル開始番号（0=海、1=未処理陸地）
+    return count  # 島の総数
+
 
 # ランダムな海域マップを生成（陸地の出現確率25%）
-def create_sea_map():
-    return [[random.choice([0,0,0,1]) for _ in range(8)] for _ in range(8)]
+def create_sea_map(height=8, width=None, land=0.25, seed=None):
+    width = height if width is None else width
+    # seed が None なら random モジュール自体を使い、random.seed() で再現できるようにする（11番と同じ）
+    rng = random if seed is None else random.Random(seed)
+    return [[1 if rng.random() < land else 0 for _ in range(width)] for _ in range(height)]
+
 
 if __name__ == "__main__":
     print("=== 島ラベリング ===")
@@ -45,3 +254,32 @@ if __name__ == "__main__":
     print(f"\n島ラベリング結果 (島数: {islands2}):")
     for row in sea2:
         print(''.join([str(x) if x else '～' for x in row]))
+
+    # 4連結と8連結の違い、各島の画素数と外接矩形
+    sea3 = create_sea_map(10, 30, land=0.4, seed=3)
+    for connectivity in (4, 8):
+        labels, count, components = label_components(sea3, connectivity, use_numpy=False)
+        largest = max(components.items(), key=lambda item: item[1]['size'])
+        print(f"\n10x30 の海域, {connectivity}連結: 島数 {count}, 最大の島 {largest[0]} "
+              f"({largest[1]['size']} 画素, 外接矩形 {largest[1]['bbox']})")
+
+    # 大きな地図（陸地 55%、8連結では1つの島が地図の大部分を占める）
+    size = 2000
+    if np is not None:
+        rng = np.random.default_rng(0)
+        mask = rng.random((size, size)) < 0.55
+        print(f"\n=== {size}x{size} の地図（{size * size / 1e6:.0f} メガ画素） ===")
+        for connectivity in (4, 8):
+            start_time = time.perf_counter()
+            labels, count, components = label_components(mask, connectivity)
+            elapsed = time.perf_counter() - start_time
+            largest = max(component['size'] for component in components.values())
+            print(f"  {connectivity}連結 (NumPy): 島数 {count}, 最大の島 {largest} 画素, {elapsed:.2f} 秒")
+        small = mask[:500, :500]
+        start_time = time.perf_counter()
+        _, count_python, _ = label_components(small, 4, use_numpy=False)
+        elapsed = time.perf_counter() - start_time
+        print(f"  参考: 500x500 を画素ごとの走査で: 島数 {count_python}, {elapsed:.2f} 秒"
+              f"（配列演算と同じ島数: {count_python == label_components(small, 4)[1]}）")
+    else:
+        print("\nNumPy がインストールされていないため、大きな地図の例は省略します（pip install numpy）")
@@ -5,9 +5,53 @@
 - 全ノードを毎回チェックして最小距離のノードを探索
 - 計算量: O(V²) （Vはノード数）
 - 直感的でわかりやすい実装
+- 探索の様子はトレース関数で表示・記録（trace=None で表示なしの高速実行）
 """
 
-def dijkstra_basic(graph, start, goal):
+
+class SearchTrace:
+    """
+    探索イベントを記録する構造化トレース（可視化・教材用）
+
+    探索関数の trace 引数に渡すと、(イベント名, 値の辞書) を events に順に記録する。
+    echo に print_trace などを指定すると、記録と同時に画面にも表示する。
+    22〜24番の探索関数で共通に使える（画面表示の print_trace はイベントの内容が
+    探索関数ごとに違うため、各ファイルにある）。
+    """
+
+    def __init__(self, echo=None):
+        self.events = []
+        self.echo = echo
+
+    def __call__(self, event, **fields):
+        self.events.append((event, fields))
+        if self.echo is not None:
+            self.echo(event, **fields)
+
+    def count(self, event):
+        """指定したイベントの発生回数"""
+        return sum(1 for name, _ in self.events if name == event)
+
+    def nodes(self, event):
+        """指定したイベントのノードを発生順に列挙"""
+        return [fields['node'] for name, fields in self.events if name == event]
+
+
+def print_trace(event, **fields):
+    """dijkstra_basic の探索イベントを画面に表示するトレース関数"""
+    if event == 'init':
+        print(f"距離の初期化: {fields['distances']}\n")
+    elif event == 'select':
+        print(f"ステップ {fields['step']}: 選択ノード: {fields['node']} (距離: {fields['distance']})")
+    elif event == 'goal':
+        print(f"目標ノード {fields['node']} に到達！")
+    elif event == 'relax':
+        print(f"  → {fields['node']} への距離を更新: {fields['distance']}")
+    elif event == 'step_end':
+        print()  # 空行を追加
+
+
+def dijkstra_basic(graph, start, goal, trace=print_trace):
     """
     基本的なダイクストラ法による最短経路探索
 
@@ -15,6 +59,8 @@ def dijkstra_basic(graph, start, goal):
         graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}
         start (str): 始点ノード
         goal (str): 目標ノード
+        trace (function): 探索イベントを受け取る関数 trace(イベント名, **値)。
+            None の場合は何も表示せず、文字列の整形も行わない
 
     Returns:
         tuple: (最短経路のリスト, 総コスト)
@@ -26,7 +72,8 @@ def dijkstra_basic(graph, start, goal):
     visited = set()  # 訪問済みノードの集合
     previous = {}  # 経路復元用の親ノード記録
 
-    print(f"距離の初期化: {distances}\n")
+    if trace is not None:
+        trace('init', distances=dict(distances))
 
     # Step2: 全ノードを訪問するまで繰り返し
     for step in range(len(graph)):
@@ -46,11 +93,13 @@ def dijkstra_basic(graph, start, goal):
 
         # 選択したノードを訪問済みに追加
         visited.add(min_node)
-        print(f"ステップ {step+1}: 選択ノード: {min_node} (距離: {distances[min_node]})")
+        if trace is not None:
+            trace('select', step=step + 1, node=min_node, distance=distances[min_node])
 
         # 目標に到達したら探索を終了
         if min_node == goal:
-            print(f"目標ノード {goal} に到達！")
+            if trace is not None:
+                trace('goal', node=goal)
             break
 
         # Step3: 隣接ノードの距離を更新
@@ -62,9 +111,11 @@ def dijkstra_basic(graph, start, goal):
             if new_distance < distances[neighbor]:
                 distances[neighbor] = new_distance
                 previous[neighbor] = min_node  # 親ノードを記録
-                print(f"  → {neighbor} への距離を更新: {distances[neighbor]}")
+                if trace is not None:
+                    trace('relax', node=neighbor, distance=new_distance)
 
-        print()  # 空行を追加
+        if trace is not None:
+            trace('step_end')
 
     # Step4: 経路を復元
     path = []
@@ -160,8 +211,9 @@ def main():
     print(f"探索開始: {start_city} → {goal_city}")
     print("=" * 60 + "\n")
 
-    # ダイクストラ法を実行
-    path, cost = dijkstra_basic(graph, start_city, goal_city)
+    # ダイクストラ法を実行（探索の様子を表示しながら記録）
+    trace = SearchTrace(echo=print_trace)
+    path, cost = dijkstra_basic(graph, start_city, goal_city, trace=trace)
 
     # 結果を表示
     print("\n" + "=" * 60)
@@ -170,6 +222,7 @@ def main():
     print(f"最短経路: {' → '.join(path)}")
     print(f"総距離: {cost * 10} km （コスト値: {cost}）")
     print(f"経由都市数: {len(path)} 都市")
+    print(f"選択したノード数: {trace.count('select')} ノード")
 
     # 経路の詳細を表示
     print("\n経路の詳細:")
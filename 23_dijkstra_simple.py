@@ -5,12 +5,32 @@
 - ヒープを使用して最小距離のノードを高速に取得
 - 計算量: O((V+E)log V) （Vはノード数、Eはエッジ数）
 - 大規模グラフでも高速に動作
+- 双方向探索モード（始点と目標の両側から探索して中間で出会う）
+- 探索の様子はトレース関数で表示（trace=None で表示なしの高速実行）
 """
 
 import heapq
 
 
-def dijkstra_simple(graph, start, goal):
+def print_trace(event, **fields):
+    """dijkstra_simple の探索イベントを画面に表示するトレース関数"""
+    side = fields.get('side')
+    prefix = f"[{side}] " if side else ""
+    if event == 'start':
+        label = "双方向探索開始" if fields.get('bidirectional') else "探索開始"
+        print(f"{label}: {fields['start']} → {fields['goal']}")
+        print("-" * 40)
+    elif event == 'pop':
+        print(f"{prefix}現在のノード: {fields['node']} (距離: {fields['distance']})")
+    elif event == 'relax':
+        print(f"  → {fields['node']}への距離を更新: {fields['distance']}")
+    elif event == 'goal':
+        print(f"\n目標に到達！")
+    elif event == 'meet':
+        print(f"\n探索終了！出会いノード: {fields['node']}")
+
+
+def dijkstra_simple(graph, start, goal, bidirectional=False, trace=print_trace, queue=None, reverse=None):
     """
     優先度キューを使用したダイクストラ法による最短経路探索
 
@@ -18,38 +38,59 @@ def dijkstra_simple(graph, start, goal):
         graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}
         start (str): 始点ノード
         goal (str): 目標ノード
+        bidirectional (bool): True の場合は双方向ダイクストラ法で探索
+        trace (function): 探索イベントを受け取る関数 trace(イベント名, **値)。
+            None の場合は何も表示せず、文字列の整形も行わない
+        queue (class): キー減少つき優先度キューのクラス（63_priority_queues.py の
+            IndexedDaryHeap / RadixHeap など）。None の場合は heapq で遅延削除
+            （双方向探索とは併用できない）
+        reverse (dict): 双方向探索で使う反転グラフ（bidirectional_dijkstra_simple を参照。
+            無向グラフなら graph 自身を渡せば毎回の作成を省ける）
 
     Returns:
         tuple: (最短経路のリスト, 総コスト)
     """
+    if bidirectional:
+        if queue is not None:
+            raise ValueError("queue は双方向探索（bidirectional=True）では使用できません")
+        return bidirectional_dijkstra_simple(graph, start, goal, reverse=reverse, trace=trace)
+
     # ステップ1: 初期化
     distances = {start: 0}  # 始点からの距離（それ以外は辞書に存在しない=無限大扱い）
     previous = {}  # 経路復元用の親ノード
-    unvisited = []  # 優先度キュー（ヒープ）
+    unvisited = [] if queue is None else queue()  # 優先度キュー（ヒープ）
 
     # 始点を優先度キューに追加 (距離, ノード) のタプル形式
-    heapq.heappush(unvisited, (0, start))
+    if queue is None:
+        heapq.heappush(unvisited, (0, start))
+    else:
+        unvisited.push(start, 0)
 
-    print(f"探索開始: {start} → {goal}")
-    print("-" * 40)
+    if trace is not None:
+        trace('start', start=start, goal=goal)
 
     # ステップ2: 探索ループ
     while unvisited:
         # 最小距離のノードを取り出す（O(log V)の操作）
-        current_distance, current_node = heapq.heappop(unvisited)
+        if queue is None:
+            current_distance, current_node = heapq.heappop(unvisited)
+        else:
+            current_distance, current_node = unvisited.pop()
+
+        # すでに処理済みの場合はスキップ
+        # （同じノードが複数回キューに入ることがあるため。'pop' は確定したノードだけ通知する）
+        if current_distance > distances.get(current_node, float('inf')):
+            continue
 
-        print(f"現在のノード: {current_node} (距離: {current_distance})")
+        if trace is not None:
+            trace('pop', node=current_node, distance=current_distance)
 
         # 目標に到達したら終了
         if current_node == goal:
-            print(f"\n目標に到達！")
+            if trace is not None:
+                trace('goal', node=goal)
             break
 
-        # すでに処理済みの場合はスキップ
-        # （同じノードが複数回キューに入ることがあるため）
-        if current_distance > distances.get(current_node, float('inf')):
-            continue
-
         # ステップ3: 隣接ノードの距離を更新
         for neighbor, weight in graph.get(current_node, []):
             # 現在のノードを経由した場合の距離を計算
@@ -59,9 +100,13 @@ def dijkstra_simple(graph, start, goal):
             if distance < distances.get(neighbor, float('inf')):
                 distances[neighbor] = distance
                 previous[neighbor] = current_node
-                # 新しい距離でヒープに追加
-                heapq.heappush(unvisited, (distance, neighbor))
-                print(f"  → {neighbor}への距離を更新: {distance}")
+                # 新しい距離でヒープに追加（キー減少つきのキューでは位置を更新）
+                if queue is None:
+                    heapq.heappush(unvisited, (distance, neighbor))
+                else:
+                    unvisited.push(neighbor, distance)
+                if trace is not None:
+                    trace('relax', node=neighbor, distance=distance)
 
     # ステップ4: 経路を復元
     path = []
@@ -77,6 +122,158 @@ def dijkstra_simple(graph, start, goal):
     return path, distances.get(goal, float('inf'))
 
 
+def reverse_graph(graph):
+    """
+    すべての辺の向きを反転したグラフを作成
+
+    Args:
+        graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}
+
+    Returns:
+        dict: 反転グラフ {ノード: [(元のグラフで自分へ辺を張るノード, 重み), ...]}
+    """
+    reverse = {node: [] for node in graph}
+    for node, edges in graph.items():
+        for neighbor, weight in edges:
+            reverse.setdefault(neighbor, []).append((node, weight))
+    return reverse
+
+
+def dijkstra_distances(graph, source, targets=None):
+    """
+    source から各ノードへの最短距離を求める（表示なしの単一始点ダイクストラ法）
+
+    距離行列・ランドマーク・全点対・K 最短経路の前計算で共通に使う。
+    targets を渡すと、そのすべての距離が確定した時点で探索を打ち切る。
+    各ノードから source までの距離は reverse_graph(graph) を渡して求める。
+
+    Args:
+        graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}
+        source: 始点ノード
+        targets (iterable): 距離が必要なノード（省略時は到達できる全ノード）
+
+    Returns:
+        tuple: (距離の辞書 {ノード: 最短距離}, 直前ノードの辞書 {ノード: 直前ノード（始点は None）})。
+            到達できないノードは含まない（打ち切った場合、targets 以外の距離は暫定値）
+    """
+    distances = {source: 0}
+    previous_nodes = {source: None}
+    remaining = None if targets is None else set(targets)
+    queue = [(0, source)]
+
+    while queue:
+        current_distance, current_node = heapq.heappop(queue)
+        if current_distance > distances[current_node]:
+            continue  # 距離が更新された後の古いエントリ
+
+        # 取り出した時点で距離が確定する
+        if remaining is not None:
+            remaining.discard(current_node)
+            if not remaining:
+                break
+
+        for neighbor, weight in graph.get(current_node, []):
+            distance = current_distance + weight
+            if distance < distances.get(neighbor, float('inf')):
+                distances[neighbor] = distance
+                previous_nodes[neighbor] = current_node
+                heapq.heappush(queue, (distance, neighbor))
+
+    return distances, previous_nodes
+
+
+def bidirectional_dijkstra_simple(graph, start, goal, reverse=None, trace=print_trace):
+    """
+    双方向ダイクストラ法による最短経路探索
+
+    始点から順方向に、目標から反転グラフ上で逆方向に、交互に探索を進める。
+    両側のキュー先頭の距離の和が、これまでに見つかった最短の出会い経路の
+    コスト以上になった時点で停止する（それより短い経路は存在しない）。
+    片側だけの探索に比べて、確定するノード数がおおよそ半分になる。
+
+    Args:
+        graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}
+        start (str): 始点ノード
+        goal (str): 目標ノード
+        reverse (dict): 反転グラフ（省略時は reverse_graph(graph) で作成。
+            同じグラフに何度も問い合わせる場合は事前に作成して渡す）
+        trace (function): 探索イベントを受け取る関数（dijkstra_simple と同じ）
+
+    Returns:
+        tuple: (最短経路のリスト, 総コスト)
+    """
+    if reverse is None:
+        reverse = reverse_graph(graph)
+
+    # 順方向（始点から）と逆方向（目標から）の探索状態
+    distances = [{start: 0}, {goal: 0}]
+    previous = [{}, {}]
+    queues = [[(0, start)], [(0, goal)]]
+    adjacency = [graph, reverse]
+    labels = ['順方向', '逆方向']
+
+    best_cost = 0 if start == goal else float('inf')  # 見つかった最短の出会い経路
+    meeting_node = start if start == goal else None
+
+    if trace is not None:
+        trace('start', start=start, goal=goal, bidirectional=True)
+
+    while queues[0] and queues[1]:
+        # 停止条件: 両側の最小距離の和が最短候補以上なら確定
+        if queues[0][0][0] + queues[1][0][0] >= best_cost:
+            if trace is not None:
+                trace('meet', node=meeting_node)
+            break
+
+        # キュー先頭の距離が小さい側を1ステップ進める
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        other = 1 - side
+        current_distance, current_node = heapq.heappop(queues[side])
+
+        # すでに処理済みの場合はスキップ
+        if current_distance > distances[side].get(current_node, float('inf')):
+            continue
+
+        if trace is not None:
+            trace('pop', node=current_node, distance=current_distance, side=labels[side])
+
+        for neighbor, weight in adjacency[side].get(current_node, []):
+            distance = current_distance + weight
+
+            if distance < distances[side].get(neighbor, float('inf')):
+                distances[side][neighbor] = distance
+                previous[side][neighbor] = current_node
+                heapq.heappush(queues[side], (distance, neighbor))
+                if trace is not None:
+                    trace('relax', node=neighbor, distance=distance, side=labels[side])
+
+            # 反対側の探索がすでに到達していれば、出会い経路の候補になる
+            if neighbor in distances[other]:
+                total = distances[side][neighbor] + distances[other][neighbor]
+                if total < best_cost:
+                    best_cost = total
+                    meeting_node = neighbor
+
+    if meeting_node is None:
+        return [start], float('inf')
+
+    # 経路を復元: 始点 → 出会いノード（順方向）と 出会いノード → 目標（逆方向）
+    path = []
+    node = meeting_node
+    while node in previous[0]:
+        path.append(node)
+        node = previous[0][node]
+    path.append(start)
+    path.reverse()
+
+    node = meeting_node
+    while node in previous[1]:
+        node = previous[1][node]
+        path.append(node)
+
+    return path, best_cost
+
+
 def create_europe_network():
     """
     ヨーロッパ主要都市間の鉄道網を模した複雑なグラフを作成
@@ -171,6 +368,16 @@ def main():
         weight = next(w for n, w in graph[from_node] if n == to_node)
         print(f"  {from_node} → {to_node}: {weight:.1f} 時間")
 
+    # 双方向ダイクストラ法でも同じ経路が得られることを確認
+    print("\n" + "=" * 60)
+    print("双方向ダイクストラ法")
+    print("=" * 60 + "\n")
+    # 都市間の道路は無向なので、反転グラフとして graph 自身を渡す
+    bi_path, bi_cost = dijkstra_simple(graph, start_city, goal_city, bidirectional=True, reverse=graph)
+    print(f"\n最短経路: {' → '.join(bi_path)}")
+    print(f"総移動時間: {bi_cost:.1f} 時間")
+    print(f"片方向の結果と一致: {bi_cost == total_cost}")
+
     print("\n" + "=" * 60 + "\n")
 
 
@@ -8,13 +8,31 @@ A*アルゴリズム - ヒューリスティック探索
   - h(n): 目標までの推定コスト（ヒューリスティック）
 - ダイクストラ法より効率的に特定の目標への経路を発見
 - ユークリッド距離を使った地理的ヒューリスティック
+- 探索の様子はトレース関数で表示（trace=None で表示なしの高速実行）
 """
 
 import heapq
 import math
 
 
-def astar_simple(graph, start, goal, heuristic):
+def print_trace(event, **fields):
+    """astar_simple の探索イベントを画面に表示するトレース関数"""
+    if event == 'start':
+        print(f"探索開始: {fields['start']} → {fields['goal']}")
+        print("-" * 40)
+    elif event == 'pop':
+        print(f"現在のノード: {fields['node']}")
+        print(f"  g値(実コスト): {fields['g']}")
+        print(f"  h値(推定コスト): {fields['h']}")
+        print(f"  f値(総推定): {fields['f']}")
+    elif event == 'goal':
+        print(f"\n目標に到達！")
+    elif event == 'relax':
+        print(f"  → {fields['node']}への距離を更新:")
+        print(f"     g={fields['g']}, h={fields['h']}, f={fields['f']}")
+
+
+def astar_simple(graph, start, goal, heuristic, trace=print_trace, queue=None):
     """
     A*アルゴリズムによる最短経路探索
 
@@ -23,6 +41,10 @@ def astar_simple(graph, start, goal, heuristic):
         start (str): 始点ノード
         goal (str): 目標ノード
         heuristic (function): ヒューリスティック関数 h(node, goal)
+        trace (function): 探索イベントを受け取る関数 trace(イベント名, **値)。
+            None の場合は何も表示せず、表示用のh値の再計算や文字列の整形も行わない
+        queue (class): キー減少つき優先度キューのクラス（63_priority_queues.py の
+            IndexedDaryHeap など）。None の場合は heapq で遅延削除
 
     Returns:
         tuple: (最短経路のリスト, 総コスト)
@@ -30,38 +52,43 @@ def astar_simple(graph, start, goal, heuristic):
     # ステップ1: 初期化
     distances = {start: 0}  # 始点からの実際の距離（g値）
     previous = {}  # 経路復元用の親ノード
-    unvisited = []  # 優先度キュー
+    unvisited = [] if queue is None else queue()  # 優先度キュー
 
     # 【ダイクストラとの違い】始点を優先度キューに追加 (f値, ノード)
     # f値 = g値 + h値
+    # heapq では積んだ時点の g 値も持ち、g 値が更新された後の古いエントリを見分ける
     f_value = 0 + heuristic(start, goal)
-    heapq.heappush(unvisited, (f_value, start))
+    if queue is None:
+        heapq.heappush(unvisited, (f_value, 0, start))
+    else:
+        unvisited.push(start, f_value)
 
-    print(f"探索開始: {start} → {goal}")
-    print("-" * 40)
+    if trace is not None:
+        trace('start', start=start, goal=goal)
 
     # ステップ2: 探索ループ
     while unvisited:
         # 【ダイクストラとの違い】最小f値のノードを取り出す
-        current_f, current_node = heapq.heappop(unvisited)
+        if queue is None:
+            current_f, pushed_distance, current_node = heapq.heappop(unvisited)
+            # すでに処理済みの場合はスキップ（より小さい g 値で積み直された古いエントリ）
+            if pushed_distance > distances[current_node]:
+                continue
+        else:
+            current_f, current_node = unvisited.pop()
         current_distance = distances[current_node]  # g値を取得
 
-        # 探索状況を表示
-        h_value = heuristic(current_node, goal)
-        print(f"現在のノード: {current_node}")
-        print(f"  g値(実コスト): {current_distance}")
-        print(f"  h値(推定コスト): {h_value}")
-        print(f"  f値(総推定): {current_f}")
+        # 探索状況を通知（h値は表示のためだけに再計算するので、トレース時のみ）
+        if trace is not None:
+            trace('pop', node=current_node, g=current_distance,
+                  h=heuristic(current_node, goal), f=current_f)
 
         # 目標に到達したら終了
         if current_node == goal:
-            print(f"\n目標に到達！")
+            if trace is not None:
+                trace('goal', node=goal)
             break
 
-        # すでに処理済みの場合はスキップ
-        if current_distance > distances.get(current_node, float('inf')):
-            continue
-
         # ステップ3: 隣接ノードの距離を更新
         for neighbor, weight in graph.get(current_node, []):
             # g値（始点からの実コスト）を計算
@@ -76,10 +103,13 @@ def astar_simple(graph, start, goal, heuristic):
                 # f値 = g値 + h値（ヒューリスティック）
                 h_value = heuristic(neighbor, goal)
                 f_value = distance + h_value
-                heapq.heappush(unvisited, (f_value, neighbor))
+                if queue is None:
+                    heapq.heappush(unvisited, (f_value, distance, neighbor))
+                else:
+                    unvisited.push(neighbor, f_value)
 
-                print(f"  → {neighbor}への距離を更新:")
-                print(f"     g={distance}, h={h_value}, f={f_value}")
+                if trace is not None:
+                    trace('relax', node=neighbor, g=distance, h=h_value, f=f_value)
 
     # ステップ4: 経路を復元
     path = []
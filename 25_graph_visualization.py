@@ -6,13 +6,35 @@
 - アルゴリズム比較の可視化
 - グリッド迷路での経路探索の可視化
 - 画像ファイルとして結果を出力
+- 大規模グラフ向けの配列ベース（CSR形式）グラフ表現
+- 大きなグリッドを1枚の画像として描くラスター描画（展開順のヒートマップつき）
 """
 
 import heapq
+import inspect
 import math
-from typing import Dict, List, Tuple, Optional
+import random
+import time
+from array import array
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
+from matplotlib.colors import Normalize
+from matplotlib.patches import Patch
+
+# ラスター描画の色（RGB、0〜1）
+GRID_COLORS = {
+    'free': (1.0, 1.0, 1.0),
+    'obstacle': (0.3, 0.3, 0.3),
+    'explored': (0.68, 0.85, 0.9),
+    'path': (0.9, 0.1, 0.1),
+    'start': (0.0, 0.6, 0.0),
+    'goal': (1.0, 0.55, 0.0),
+}
+# visualize_grid_search がセルごとの描画からラスター描画に切り替えるセル数
+RASTER_MIN_CELLS = 2500
 
 
 class Graph:
@@ -21,11 +43,14 @@ class Graph:
     def __init__(self):
         self.edges: Dict[str, List[Tuple[str, float]]] = {}
         self.positions: Dict[str, Tuple[float, float]] = {}
+        # 変更のたびに増える版番号（探索結果のキャッシュの無効化に使う）
+        self.version = 0
 
     def add_node(self, node: str):
         """ノードを追加"""
         if node not in self.edges:
             self.edges[node] = []
+            self.version += 1
 
     def add_edge(self, node1: str, node2: str, weight: float):
         """双方向エッジを追加（無向グラフ）"""
@@ -33,10 +58,25 @@ class Graph:
         self.add_node(node2)
         self.edges[node1].append((node2, weight))
         self.edges[node2].append((node1, weight))
+        self.version += 1
+
+    def update_edge_weight(self, node1: str, node2: str, weight: float):
+        """既存の双方向エッジの重みを変更（交通状況の変化など。多重辺はすべて変更）"""
+        updated = False
+        for source, target in ((node1, node2), (node2, node1)):
+            edges = self.edges.get(source, [])
+            for i, (neighbor, _) in enumerate(edges):
+                if neighbor == target:
+                    edges[i] = (neighbor, weight)
+                    updated = True
+        if not updated:
+            raise KeyError(f"エッジがありません: {node1} - {node2}")
+        self.version += 1
 
     def set_position(self, node: str, x: float, y: float):
-        """ノードの位置を設定（可視化用）"""
+        """ノードの位置を設定（可視化用。A* のヒューリスティックも変わるため版番号を進める）"""
         self.positions[node] = (x, y)
+        self.version += 1
 
     def get_neighbors(self, node: str) -> List[Tuple[str, float]]:
         """隣接ノードのリストを取得"""
@@ -50,21 +90,432 @@ class Graph:
         x2, y2 = self.positions[node2]
         return math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
 
+    def freeze(self) -> 'CSRGraph':
+        """変更不可の配列ベース（CSR形式）グラフに変換"""
+        return CSRGraph.from_graph(self)
 
-def dijkstra(graph: Graph, start: str, goal: str) -> Tuple[Optional[List[str]], float, int]:
+
+class _CSREdgeView(Mapping):
+    """CSRGraphの隣接リストを Graph.edges と同じ辞書風に見せる読み取り専用ビュー"""
+
+    def __init__(self, graph: 'CSRGraph'):
+        self._graph = graph
+
+    def __getitem__(self, node: str) -> List[Tuple[str, float]]:
+        if node not in self._graph.index:
+            raise KeyError(node)
+        return self._graph.get_neighbors(node)
+
+    def __contains__(self, node) -> bool:
+        return node in self._graph.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._graph.names)
+
+    def __len__(self) -> int:
+        return len(self._graph.names)
+
+
+class _CSRPositionView(Mapping):
+    """座標配列を Graph.positions と同じ辞書風に見せる読み取り専用ビュー"""
+
+    def __init__(self, graph: 'CSRGraph'):
+        self._graph = graph
+
+    def __getitem__(self, node: str) -> Tuple[float, float]:
+        i = self._graph.index.get(node)
+        if i is None or not self._graph.has_position[i]:
+            raise KeyError(node)
+        return self._graph.xs[i], self._graph.ys[i]
+
+    def __iter__(self) -> Iterator[str]:
+        graph = self._graph
+        return (name for i, name in enumerate(graph.names) if graph.has_position[i])
+
+    def __len__(self) -> int:
+        return sum(self._graph.has_position)
+
+
+class CSRGraph:
+    """
+    配列ベースの凍結グラフ（CSR: Compressed Sparse Row 形式）
+
+    ノード名を整数IDに変換（インターン）し、隣接情報を3本の配列で保持する。
+    - offsets: ノード i の辺は targets[offsets[i]:offsets[i+1]] に並ぶ
+    - targets: 隣接ノードのID（32bit整数）
+    - weights: 辺の重み（64bit浮動小数点数）
+
+    タプルやリストをノードごとに持たないため、大規模な道路網でもメモリ使用量を
+    大幅に削減できる。edges / positions / get_neighbors / heuristic は
+    Graph と同じ形で参照できるので、dijkstra や a_star をそのまま実行可能。
+    """
+
+    version = 0  # 凍結済みのため版番号は変わらない
+    mapped = None  # 64番の load_graph で読み込んだ場合の写像したファイル
+
+    def __init__(self, names: List[str], offsets: array, targets: array,
+                 weights: array, xs: array, ys: array, has_position: bytearray):
+        self.names = names
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.xs = xs
+        self.ys = ys
+        self.has_position = has_position
+        self.edges = _CSREdgeView(self)
+        self.positions = _CSRPositionView(self)
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> 'CSRGraph':
+        """Graph から CSRGraph を構築"""
+        names = list(graph.edges)
+        index = {name: i for i, name in enumerate(names)}
+
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('d')
+        for name in names:
+            for neighbor, weight in graph.edges[name]:
+                targets.append(index[neighbor])
+                weights.append(weight)
+            offsets.append(len(targets))
+
+        xs = array('d', bytes(8 * len(names)))
+        ys = array('d', bytes(8 * len(names)))
+        has_position = bytearray(len(names))
+        for name, (x, y) in graph.positions.items():
+            i = index.get(name)
+            if i is not None:
+                xs[i], ys[i] = x, y
+                has_position[i] = 1
+
+        return cls(names, offsets, targets, weights, xs, ys, has_position)
+
+    @property
+    def num_nodes(self) -> int:
+        """ノード数"""
+        return len(self.names)
+
+    @property
+    def num_edges(self) -> int:
+        """有向辺の数（無向エッジは2本として数える）"""
+        return len(self.targets)
+
+    def node_id(self, node: str) -> int:
+        """ノード名を整数IDに変換"""
+        return self.index[node]
+
+    def node_name(self, node_id: int) -> str:
+        """整数IDをノード名に変換"""
+        return self.names[node_id]
+
+    def neighbor_ids(self, node_id: int) -> Tuple[array, array]:
+        """整数IDで隣接ノードIDの配列と重みの配列を取得"""
+        lo, hi = self.offsets[node_id], self.offsets[node_id + 1]
+        return self.targets[lo:hi], self.weights[lo:hi]
+
+    def neighbor_items(self, node_id: int) -> Iterator[Tuple[int, float]]:
+        """整数IDで (隣接ノードID, 重み) を順に取得"""
+        lo, hi = self.offsets[node_id], self.offsets[node_id + 1]
+        return zip(self.targets[lo:hi], self.weights[lo:hi])
+
+    def close(self):
+        """写像したファイル（64番 load_graph）を解放する。それ以外のグラフでは何もしない"""
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+
+    def __enter__(self) -> 'CSRGraph':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_node(self, node: str):
+        """凍結済みのため変更不可"""
+        raise TypeError("CSRGraph は凍結されているため変更できません")
+
+    def add_edge(self, node1: str, node2: str, weight: float):
+        """凍結済みのため変更不可"""
+        raise TypeError("CSRGraph は凍結されているため変更できません")
+
+    def get_neighbors(self, node: str) -> List[Tuple[str, float]]:
+        """隣接ノードのリストを取得"""
+        i = self.index.get(node)
+        if i is None:
+            return []
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        names = self.names
+        return [(names[t], w) for t, w in zip(self.targets[lo:hi], self.weights[lo:hi])]
+
+    def heuristic(self, node1: str, node2: str) -> float:
+        """ユークリッド距離に基づくヒューリスティック関数"""
+        i = self.index.get(node1)
+        j = self.index.get(node2)
+        if i is None or j is None:
+            return 0.0
+        return self.id_heuristic(i, j)
+
+    def id_heuristic(self, i: int, j: int) -> float:
+        """整数IDで heuristic と同じ値を計算"""
+        if not (self.has_position[i] and self.has_position[j]):
+            return 0.0
+        return math.sqrt((self.xs[i] - self.xs[j])**2 + (self.ys[i] - self.ys[j])**2)
+
+
+class _GridEdgeView(Mapping):
+    """GridGraphの隣接関係を Graph.edges と同じ辞書風に見せる読み取り専用ビュー"""
+
+    def __init__(self, graph: 'GridGraph'):
+        self._graph = graph
+
+    def __getitem__(self, cell: int) -> List[Tuple[int, float]]:
+        if cell not in self:
+            raise KeyError(cell)
+        return self._graph.get_neighbors(cell)
+
+    def __contains__(self, cell) -> bool:
+        graph = self._graph
+        return isinstance(cell, int) and 0 <= cell < len(graph.blocked) and not graph.blocked[cell]
+
+    def __iter__(self) -> Iterator[int]:
+        blocked = self._graph.blocked
+        return (cell for cell in range(len(blocked)) if not blocked[cell])
+
+    def __len__(self) -> int:
+        return self._graph.free_count
+
+
+class _GridPositionView(_GridEdgeView):
+    """GridGraphのセル座標を Graph.positions と同じ辞書風に見せる読み取り専用ビュー"""
+
+    def __getitem__(self, cell: int) -> Tuple[float, float]:
+        if cell not in self:
+            raise KeyError(cell)
+        return self._graph.cell_xy(cell)
+
+
+class GridGraph:
+    """
+    暗黙的なグリッドグラフ（迷路探索用）
+
+    セルを整数ID（y * width + x）で表し、障害物を1セル1バイトのビットマップ
+    （bytearray）で保持する。辺のリストは作らず、get_neighbors が呼ばれたときに
+    上下左右（diagonal=True なら斜めも）の隣接セルをその場で生成する。
+    edges / positions / get_neighbors / heuristic を Graph と同じ形で参照できるので、
+    dijkstra や a_star をそのまま実行可能（ノードはセルID）。
+    """
+
+    version = 0  # 生成後に形状は変わらないため版番号は一定
+
+    def __init__(self, width: int, height: int, obstacles=None, diagonal: bool = False):
+        """
+        Args:
+            width, height: グリッドの大きさ
+            obstacles: 障害物セル (x, y) の集合・リスト、または
+                形状 (height, width) の NumPy 真偽値配列（True が障害物）
+            diagonal: True の場合は斜め移動（重み √2）も許可する。
+                角をすり抜ける移動（隣接する縦横のどちらかが障害物）は許可しない
+        """
+        self.width = width
+        self.height = height
+        self.diagonal = diagonal
+
+        if hasattr(obstacles, 'shape'):
+            if tuple(obstacles.shape) != (height, width):
+                raise ValueError(f"障害物配列の形状は {(height, width)} である必要があります")
+            self.blocked = bytearray(obstacles.astype(bool).tobytes())
+        else:
+            self.blocked = bytearray(width * height)
+            for x, y in obstacles or ():
+                if 0 <= x < width and 0 <= y < height:
+                    self.blocked[y * width + x] = 1
+
+        self.free_count = len(self.blocked) - sum(self.blocked)
+        self.edges = _GridEdgeView(self)
+        self.positions = _GridPositionView(self)
+
+    @property
+    def num_nodes(self) -> int:
+        """セルの総数（セルIDの範囲）"""
+        return self.width * self.height
+
+    def cell_id(self, x: int, y: int) -> int:
+        """座標をセルIDに変換"""
+        return y * self.width + x
+
+    def cell_xy(self, cell: int) -> Tuple[int, int]:
+        """セルIDを座標に変換"""
+        y, x = divmod(cell, self.width)
+        return x, y
+
+    def node_id(self, cell: int) -> int:
+        """ノードの整数ID（セルIDそのもの）"""
+        return cell
+
+    def node_name(self, node_id: int) -> int:
+        """整数IDに対応するノード（セルIDそのもの）"""
+        return node_id
+
+    def is_free(self, x: int, y: int) -> bool:
+        """グリッド内の通行可能なセルかどうか"""
+        return 0 <= x < self.width and 0 <= y < self.height and not self.blocked[y * self.width + x]
+
+    def add_node(self, node):
+        """暗黙的なグラフのため変更不可"""
+        raise TypeError("GridGraph にはノードや辺を追加できません（障害物で形状を指定してください）")
+
+    add_edge = add_node
+
+    def get_neighbors(self, cell: int) -> List[Tuple[int, float]]:
+        """隣接セルのリストをその場で生成"""
+        width, blocked = self.width, self.blocked
+        y, x = divmod(cell, width)
+        up = y > 0 and not blocked[cell - width]
+        down = y + 1 < self.height and not blocked[cell + width]
+        left = x > 0 and not blocked[cell - 1]
+        right = x + 1 < width and not blocked[cell + 1]
+
+        neighbors = []
+        if right:
+            neighbors.append((cell + 1, 1.0))
+        if down:
+            neighbors.append((cell + width, 1.0))
+        if left:
+            neighbors.append((cell - 1, 1.0))
+        if up:
+            neighbors.append((cell - width, 1.0))
+
+        if self.diagonal:
+            diagonal_weight = math.sqrt(2)
+            if down and right and not blocked[cell + width + 1]:
+                neighbors.append((cell + width + 1, diagonal_weight))
+            if down and left and not blocked[cell + width - 1]:
+                neighbors.append((cell + width - 1, diagonal_weight))
+            if up and left and not blocked[cell - width - 1]:
+                neighbors.append((cell - width - 1, diagonal_weight))
+            if up and right and not blocked[cell - width + 1]:
+                neighbors.append((cell - width + 1, diagonal_weight))
+        return neighbors
+
+    # セルIDがそのまま整数IDなので、整数IDでの隣接取得も同じ
+    neighbor_items = get_neighbors
+
+    def heuristic(self, cell1: int, cell2: int) -> float:
+        """マンハッタン距離（斜め移動ありの場合はオクタイル距離）"""
+        y1, x1 = divmod(cell1, self.width)
+        y2, x2 = divmod(cell2, self.width)
+        dx, dy = abs(x1 - x2), abs(y1 - y2)
+        if self.diagonal:
+            return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
+        return dx + dy
+
+
+class SearchWorkspace:
+    """
+    探索用の作業領域（世代番号つき配列）
+
+    ノードの整数ID（node_id）を添字とする距離・直前ノードの配列と、
+    各要素がどの問い合わせで書き込まれたかを表す世代番号 stamp を持つ。
+    reset は世代番号を1つ進めるだけの O(1) 操作で、配列の中身は消さない。
+    stamp が現在の世代と異なる要素は未訪問（距離 inf）として扱うため、
+    同じグラフに繰り返し問い合わせても、1回あたりのコストは
+    グラフ全体ではなく探索した範囲の大きさに比例する。
+
+    CSRGraph / GridGraph のように node_id / node_name / num_nodes を持つグラフで使用でき、
+    dijkstra や a_star の workspace 引数に渡すと問い合わせごとに再利用される。
+    """
+
+    def __init__(self, num_nodes: int):
+        self.num_nodes = num_nodes
+        self.distance = array('d', bytes(8 * num_nodes))
+        self.previous = array('q', bytes(8 * num_nodes))
+        self.stamp = array('q', bytes(8 * num_nodes))  # 0 はどの世代でもない
+        self.generation = 0
+
+    @classmethod
+    def for_graph(cls, graph) -> 'SearchWorkspace':
+        """グラフのノード数に合わせた作業領域を作成"""
+        return cls(graph.num_nodes)
+
+    def reset(self):
+        """すべてのノードを未訪問に戻す（世代番号を進めるだけ）"""
+        self.generation += 1
+
+    def get(self, node_id: int) -> float:
+        """現在の問い合わせでの距離（未訪問なら inf）"""
+        if self.stamp[node_id] != self.generation:
+            return float('infinity')
+        return self.distance[node_id]
+
+    def set(self, node_id: int, distance: float, previous: int):
+        """距離と直前ノードを記録"""
+        self.stamp[node_id] = self.generation
+        self.distance[node_id] = distance
+        self.previous[node_id] = previous
+
+    def path_to(self, node_id: int) -> List[int]:
+        """直前ノードをたどって始点からの経路（整数IDのリスト）を復元"""
+        path = [node_id]
+        while self.previous[path[-1]] >= 0:
+            path.append(self.previous[path[-1]])
+        path.reverse()
+        return path
+
+    def _check(self, graph):
+        if not hasattr(graph, 'node_id'):
+            raise TypeError("workspace は整数IDを持つグラフ（CSRGraph / GridGraph）でのみ使用できます")
+        if graph.num_nodes > self.num_nodes:
+            raise ValueError(f"作業領域のノード数 {self.num_nodes} がグラフのノード数 "
+                             f"{graph.num_nodes} より小さいです")
+
+
+def _search_keys(graph, start, goal):
+    """
+    辞書で探索するときのキーと隣接ノードの取得関数を返す
+
+    CSRGraph は整数IDのまま neighbor_items で探索し、隣接ノードごとに
+    (ノード名, 重み) のリストを作らない。ノード名へは結果を返すときに戻す。
+
+    Returns:
+        tuple: (隣接関数, 始点のキー, 目標のキー, ID→名前のリスト（名前で探索する場合は None）)
+    """
+    if isinstance(graph, CSRGraph) and start in graph.index:
+        # グラフにない目標は -1（どのIDとも一致しないので到達しない）
+        return graph.neighbor_items, graph.index[start], graph.index.get(goal, -1), graph.names
+    return graph.get_neighbors, start, goal, None
+
+
+def dijkstra(graph: Graph, start: str, goal: str,
+             bidirectional: bool = False,
+             workspace: Optional[SearchWorkspace] = None,
+             expanded: Optional[list] = None) -> Tuple[Optional[List[str]], float, int]:
     """
     ダイクストラ法による最短経路探索
 
+    bidirectional=True の場合は双方向ダイクストラ法で探索する。
+    workspace に SearchWorkspace を渡すと、辞書の代わりに再利用可能な
+    整数ID配列で探索する（CSRGraph / GridGraph のみ）。
+    距離や直前ノードは訪問したノードの分だけ記録するため、
+    近い目標への問い合わせはグラフ全体の大きさに依存しない。
+    expanded にリストを渡すと、確定したノードを展開順に追加する（片方向のみ、
+    visualize_grid_search のヒートマップ用）。
+    workspace と expanded は双方向探索とは併用できない（ValueError）。
+
     Returns:
         tuple: (経路, コスト, 探索ノード数)
     """
+    if bidirectional:
+        if workspace is not None or expanded is not None:
+            raise ValueError("workspace / expanded は双方向探索（bidirectional=True）では使用できません")
+        return bidirectional_dijkstra(graph, start, goal)
+    if workspace is not None:
+        return _dijkstra_workspace(graph, start, goal, workspace, expanded)
+
+    get_neighbors, start, goal, names = _search_keys(graph, start, goal)
     distances = {start: 0}
-    # すべてのノードの距離を初期化
-    for node in graph.edges:
-        if node != start:
-            distances[node] = float('infinity')
-
-    previous_nodes: Dict[str, Optional[str]] = {node: None for node in graph.edges}
+    previous_nodes: Dict[str, Optional[str]] = {start: None}
     priority_queue = [(0, start)]
     explored_count = 0
 
@@ -74,13 +525,15 @@ def dijkstra(graph: Graph, start: str, goal: str) -> Tuple[Optional[List[str]],
 
         if current_distance > distances[current_node]:
             continue
+        if expanded is not None:
+            expanded.append(current_node if names is None else names[current_node])
 
         if current_node == goal:
             break
 
-        for neighbor, weight in graph.get_neighbors(current_node):
+        for neighbor, weight in get_neighbors(current_node):
             distance = current_distance + weight
-            if distance < distances[neighbor]:
+            if distance < distances.get(neighbor, float('infinity')):
                 distances[neighbor] = distance
                 previous_nodes[neighbor] = current_node
                 heapq.heappush(priority_queue, (distance, neighbor))
@@ -88,36 +541,181 @@ def dijkstra(graph: Graph, start: str, goal: str) -> Tuple[Optional[List[str]],
     # 経路を復元
     path: List[str] = []
     current = goal
-    if distances[goal] == float('infinity'):
+    if goal not in distances:
         return None, float('infinity'), explored_count
 
     while current is not None:
         path.insert(0, current)
         current = previous_nodes[current]
+    if names is not None:
+        path = [names[i] for i in path]
 
     return path, distances[goal], explored_count
 
 
-def a_star(graph: Graph, start: str, goal: str) -> Tuple[Optional[List[str]], float, int]:
+def _dijkstra_workspace(graph, start, goal, workspace: SearchWorkspace,
+                        expanded: Optional[list] = None) -> Tuple[Optional[list], float, int]:
+    """SearchWorkspace の配列を使うダイクストラ法（整数IDで探索）"""
+    workspace._check(graph)
+    workspace.reset()
+    generation = workspace.generation
+    stamp, distance_of, previous = workspace.stamp, workspace.distance, workspace.previous
+    neighbor_items = graph.neighbor_items
+
+    source, target = graph.node_id(start), graph.node_id(goal)
+    workspace.set(source, 0, -1)
+    priority_queue = [(0, source)]
+    explored_count = 0
+    found = False
+
+    while priority_queue:
+        current_distance, current = heapq.heappop(priority_queue)
+        explored_count += 1
+
+        if current_distance > distance_of[current]:
+            continue
+        if expanded is not None:
+            expanded.append(graph.node_name(current))
+
+        if current == target:
+            found = True
+            break
+
+        for neighbor, weight in neighbor_items(current):
+            distance = current_distance + weight
+            if stamp[neighbor] != generation or distance < distance_of[neighbor]:
+                stamp[neighbor] = generation
+                distance_of[neighbor] = distance
+                previous[neighbor] = current
+                heapq.heappush(priority_queue, (distance, neighbor))
+
+    if not found:
+        return None, float('infinity'), explored_count
+
+    node_name = graph.node_name
+    path = [node_name(i) for i in workspace.path_to(target)]
+    return path, distance_of[target], explored_count
+
+
+def bidirectional_dijkstra(graph: Graph, start: str, goal: str) -> Tuple[Optional[List[str]], float, int]:
     """
-    A*アルゴリズムによる最短経路探索
+    双方向ダイクストラ法による最短経路探索
+
+    始点からの順方向探索と目標からの逆方向探索を、キュー先頭の距離が
+    小さい側から交互に進める。両側の先頭距離の和が、見つかっている
+    最短の出会い経路のコスト以上になったら停止する。
+    Graph は無向グラフなので、逆方向探索にも get_neighbors をそのまま使う。
 
     Returns:
         tuple: (経路, コスト, 探索ノード数)
     """
-    g_score = {node: float('infinity') for node in graph.edges}
-    g_score[start] = 0
+    get_neighbors, start, goal, names = _search_keys(graph, start, goal)
+    distances: List[Dict[str, float]] = [{start: 0}, {goal: 0}]
+    previous_nodes: List[Dict[str, str]] = [{}, {}]
+    queues = [[(0, start)], [(0, goal)]]
+    explored_count = 0
+
+    best_cost = 0 if start == goal else float('infinity')
+    meeting_node = start if start == goal else None
+
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best_cost:
+            break
+
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        other = 1 - side
+        current_distance, current_node = heapq.heappop(queues[side])
+        explored_count += 1
+
+        if current_distance > distances[side][current_node]:
+            continue
+
+        for neighbor, weight in get_neighbors(current_node):
+            distance = current_distance + weight
+            if distance < distances[side].get(neighbor, float('infinity')):
+                distances[side][neighbor] = distance
+                previous_nodes[side][neighbor] = current_node
+                heapq.heappush(queues[side], (distance, neighbor))
+
+            if neighbor in distances[other]:
+                total = distances[side][neighbor] + distances[other][neighbor]
+                if total < best_cost:
+                    best_cost = total
+                    meeting_node = neighbor
+
+    if meeting_node is None:
+        return None, float('infinity'), explored_count
+
+    # 経路を復元（始点 → 出会いノード → 目標）
+    path: List[str] = []
+    current = meeting_node
+    while current is not None:
+        path.insert(0, current)
+        current = previous_nodes[0].get(current)
+
+    current = previous_nodes[1].get(meeting_node)
+    while current is not None:
+        path.append(current)
+        current = previous_nodes[1].get(current)
+    if names is not None:
+        path = [names[i] for i in path]
+
+    return path, best_cost, explored_count
+
+
+def a_star(graph: Graph, start: str, goal: str,
+           heuristic: Optional[Callable[[str, str], float]] = None,
+           queue: Optional[Callable] = None,
+           workspace: Optional[SearchWorkspace] = None,
+           expanded: Optional[list] = None) -> Tuple[Optional[List[str]], float, int]:
+    """
+    A*アルゴリズムによる最短経路探索
 
-    f_score = {node: float('infinity') for node in graph.edges}
-    f_score[start] = graph.heuristic(start, goal)
+    heuristic を省略した場合は graph.heuristic（ユークリッド距離）を使う。
+    ALT（61_alt_landmarks.py）などのヒューリスティックも h(node, goal) の形で渡せる。
+    queue にキー減少つき優先度キューのクラス（63_priority_queues.py）を渡すと、
+    heapq の遅延削除の代わりにそれを使う。
+    workspace に SearchWorkspace を渡すと、g値と直前ノードを再利用可能な
+    整数ID配列に記録する（CSRGraph / GridGraph のみ）。
+    expanded にリストを渡すと、取り出したノードを展開順に追加する。
 
-    previous_nodes: Dict[str, Optional[str]] = {node: None for node in graph.edges}
-    priority_queue = [(f_score[start], start)]
+    Returns:
+        tuple: (経路, コスト, 探索ノード数)
+    """
+    heuristic = heuristic or graph.heuristic
+    if workspace is not None:
+        return _a_star_workspace(graph, start, goal, heuristic, queue, workspace, expanded)
+
+    goal_name = goal
+    get_neighbors, start, goal, names = _search_keys(graph, start, goal)
+    if names is None:
+        def estimate(node):
+            return heuristic(node, goal)
+    elif heuristic == graph.heuristic:
+        def estimate(node):
+            return graph.id_heuristic(node, goal)
+    else:
+        # 渡されたヒューリスティックにはノード名を渡す
+        def estimate(node):
+            return heuristic(names[node], goal_name)
+
+    g_score = {start: 0}
+    previous_nodes: Dict[str, Optional[str]] = {start: None}
+    if queue is None:
+        priority_queue = [(estimate(start), start)]
+    else:
+        priority_queue = queue()
+        priority_queue.push(start, estimate(start))
     explored_count = 0
 
     while priority_queue:
-        current_f_score, current_node = heapq.heappop(priority_queue)
+        if queue is None:
+            current_f_score, current_node = heapq.heappop(priority_queue)
+        else:
+            current_f_score, current_node = priority_queue.pop()
         explored_count += 1
+        if expanded is not None:
+            expanded.append(current_node if names is None else names[current_node])
 
         if current_node == goal:
             path: List[str] = []
@@ -125,15 +723,201 @@ def a_star(graph: Graph, start: str, goal: str) -> Tuple[Optional[List[str]], fl
             while current is not None:
                 path.insert(0, current)
                 current = previous_nodes[current]
+            if names is not None:
+                path = [names[i] for i in path]
             return path, g_score[goal], explored_count
 
-        for neighbor, weight in graph.get_neighbors(current_node):
+        for neighbor, weight in get_neighbors(current_node):
             tentative_g_score = g_score[current_node] + weight
-            if tentative_g_score < g_score[neighbor]:
+            if tentative_g_score < g_score.get(neighbor, float('infinity')):
                 previous_nodes[neighbor] = current_node
                 g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + graph.heuristic(neighbor, goal)
-                heapq.heappush(priority_queue, (f_score[neighbor], neighbor))
+                f_score = tentative_g_score + estimate(neighbor)
+                if queue is None:
+                    heapq.heappush(priority_queue, (f_score, neighbor))
+                else:
+                    priority_queue.push(neighbor, f_score)
+
+    return None, float('infinity'), explored_count
+
+
+def _a_star_workspace(graph, start, goal, heuristic, queue, workspace: SearchWorkspace,
+                      expanded: Optional[list] = None) -> Tuple[Optional[list], float, int]:
+    """SearchWorkspace の配列を使う A*（整数IDで探索し、ヒューリスティックにはノード名を渡す）"""
+    workspace._check(graph)
+    workspace.reset()
+    generation = workspace.generation
+    stamp, g_score, previous = workspace.stamp, workspace.distance, workspace.previous
+    neighbor_items, node_name = graph.neighbor_items, graph.node_name
+
+    source, target = graph.node_id(start), graph.node_id(goal)
+    workspace.set(source, 0, -1)
+    if queue is None:
+        priority_queue = [(heuristic(start, goal), source)]
+    else:
+        priority_queue = queue()
+        priority_queue.push(source, heuristic(start, goal))
+    explored_count = 0
+
+    while priority_queue:
+        if queue is None:
+            _, current = heapq.heappop(priority_queue)
+        else:
+            _, current = priority_queue.pop()
+        explored_count += 1
+        if expanded is not None:
+            expanded.append(node_name(current))
+
+        if current == target:
+            path = [node_name(i) for i in workspace.path_to(target)]
+            return path, g_score[target], explored_count
+
+        current_g_score = g_score[current]
+        for neighbor, weight in neighbor_items(current):
+            tentative_g_score = current_g_score + weight
+            if stamp[neighbor] != generation or tentative_g_score < g_score[neighbor]:
+                stamp[neighbor] = generation
+                g_score[neighbor] = tentative_g_score
+                previous[neighbor] = current
+                f_score = tentative_g_score + heuristic(node_name(neighbor), goal)
+                if queue is None:
+                    heapq.heappush(priority_queue, (f_score, neighbor))
+                else:
+                    priority_queue.push(neighbor, f_score)
+
+    return None, float('infinity'), explored_count
+
+
+def jump_point_search(graph: GridGraph, start: int, goal: int) -> Tuple[Optional[List[int]], float, int]:
+    """
+    Jump Point Search（JPS）による一様コストグリッドの最短経路探索
+
+    同じコストの経路が何通りもある（対称な）グリッドでは、A* は同じ長さの
+    経路上のセルを大量に展開してしまう。JPS は直進できる間は展開せずに
+    「ジャンプ」し、障害物の角などで進路が分岐するセル（ジャンプポイント）だけを
+    キューに入れるため、展開ノード数が大幅に減る。
+    graph.diagonal が False なら4近傍、True なら8近傍（角のすり抜けなし）で探索する。
+    ジャンプは再帰ではなくループで行うので、大きなグリッドでもスタックを消費しない。
+
+    Returns:
+        tuple: (経路（セルIDのリスト、隣接セルごと）, コスト, 探索ノード数)
+    """
+    width = graph.width
+    free = graph.is_free
+    diagonal = graph.diagonal
+    diagonal_weight = math.sqrt(2)
+    goal_x, goal_y = graph.cell_xy(goal)
+    if not free(*graph.cell_xy(start)) or not free(goal_x, goal_y):
+        return None, float('infinity'), 0
+
+    def jump_straight(x: int, y: int, dx: int, dy: int) -> Optional[Tuple[int, int]]:
+        """(x, y) から (dx, dy) 方向に直進し、最初のジャンプポイントを返す"""
+        while True:
+            x += dx
+            y += dy
+            if not free(x, y):
+                return None
+            if x == goal_x and y == goal_y:
+                return x, y
+            if dx != 0:
+                # 横移動: 後ろ側が壁で、上下に抜けられるセルは強制隣接を持つ
+                if (free(x, y - 1) and not free(x - dx, y - 1)) or \
+                   (free(x, y + 1) and not free(x - dx, y + 1)):
+                    return x, y
+            else:
+                if (free(x - 1, y) and not free(x - 1, y - dy)) or \
+                   (free(x + 1, y) and not free(x + 1, y - dy)):
+                    return x, y
+                # 4近傍では縦移動中に左右へのジャンプポイントがあれば止まる
+                if not diagonal and (jump_straight(x, y, 1, 0) or jump_straight(x, y, -1, 0)):
+                    return x, y
+
+    def jump_diagonal(x: int, y: int, dx: int, dy: int) -> Optional[Tuple[int, int]]:
+        """(x, y) から斜め方向に進み、最初のジャンプポイントを返す"""
+        while True:
+            # 角のすり抜けは禁止: 縦横の両方が通行可能なときだけ斜めに進める
+            if not (free(x + dx, y) and free(x, y + dy)):
+                return None
+            x += dx
+            y += dy
+            if not free(x, y):
+                return None
+            if x == goal_x and y == goal_y:
+                return x, y
+            if jump_straight(x, y, dx, 0) or jump_straight(x, y, 0, dy):
+                return x, y
+
+    def successor_directions(x: int, y: int, dx: int, dy: int) -> List[Tuple[int, int]]:
+        """進入方向 (dx, dy) から、探索が必要な方向だけに枝刈りする"""
+        if dx == 0 and dy == 0:
+            directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+            if diagonal:
+                directions += [(1, 1), (-1, 1), (1, -1), (-1, -1)]
+            return directions
+        if dx != 0 and dy != 0:
+            return [(dx, 0), (0, dy), (dx, dy)]
+        if dx != 0:
+            directions = [(dx, 0), (0, 1), (0, -1)]
+            if diagonal:
+                directions += [(dx, 1), (dx, -1)]
+            return directions
+        directions = [(0, dy), (1, 0), (-1, 0)]
+        if diagonal:
+            directions += [(1, dy), (-1, dy)]
+        return directions
+
+    g_score: Dict[int, float] = {start: 0}
+    previous_nodes: Dict[int, int] = {}
+    priority_queue = [(graph.heuristic(start, goal), start)]
+    explored_count = 0
+
+    while priority_queue:
+        current_f_score, current = heapq.heappop(priority_queue)
+        explored_count += 1
+
+        if current == goal:
+            # ジャンプポイント間を1セルずつ補間して経路を復元
+            jump_points = [goal]
+            while jump_points[-1] in previous_nodes:
+                jump_points.append(previous_nodes[jump_points[-1]])
+            jump_points.reverse()
+            path = [start]
+            for a, b in zip(jump_points, jump_points[1:]):
+                (ax, ay), (bx, by) = graph.cell_xy(a), graph.cell_xy(b)
+                step_x = (bx > ax) - (bx < ax)
+                step_y = (by > ay) - (by < ay)
+                for _ in range(max(abs(bx - ax), abs(by - ay))):
+                    ax += step_x
+                    ay += step_y
+                    path.append(ay * width + ax)
+            return path, g_score[goal], explored_count
+
+        x, y = graph.cell_xy(current)
+        parent = previous_nodes.get(current)
+        if parent is None:
+            dx = dy = 0
+        else:
+            px, py = graph.cell_xy(parent)
+            dx, dy = (x > px) - (x < px), (y > py) - (y < py)
+
+        for ndx, ndy in successor_directions(x, y, dx, dy):
+            if ndx != 0 and ndy != 0:
+                jump_point = jump_diagonal(x, y, ndx, ndy)
+            else:
+                jump_point = jump_straight(x, y, ndx, ndy)
+            if jump_point is None:
+                continue
+
+            jx, jy = jump_point
+            steps = max(abs(jx - x), abs(jy - y))
+            weight = steps * (diagonal_weight if ndx != 0 and ndy != 0 else 1.0)
+            neighbor = jy * width + jx
+            tentative_g_score = g_score[current] + weight
+            if tentative_g_score < g_score.get(neighbor, float('infinity')):
+                g_score[neighbor] = tentative_g_score
+                previous_nodes[neighbor] = current
+                heapq.heappush(priority_queue,
+                               (tentative_g_score + graph.heuristic(neighbor, goal), neighbor))
 
     return None, float('infinity'), explored_count
 
@@ -183,14 +967,47 @@ def create_sample_graph() -> Graph:
     return graph
 
 
-def compare_search_visualization(graph: Graph, start: str, goal: str):
-    """ダイクストラ法とA*アルゴリズムの比較可視化"""
-    # 両方のアルゴリズムを実行
-    path_dijkstra, cost_d, explored_d = dijkstra(graph, start, goal)
-    path_astar, cost_a, explored_a = a_star(graph, start, goal)
+def compare_search_visualization(graph: Graph, start: str, goal: str,
+                                 algorithms: Optional[List[Tuple[str, Callable, str]]] = None):
+    """
+    探索アルゴリズムの比較可視化
 
-    # 2つのサブプロットを作成
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 8))
+    algorithms に (タイトル, 探索関数, 経路の色) のリストを渡すと横に並べて比較する。
+    探索関数は dijkstra / a_star / jump_point_search と同じく
+    (経路, コスト, 探索ノード数) を返すもの。省略時はダイクストラ法とA*を比較する。
+    GridGraph の場合はノードや辺を1つずつ描かず、render_grid_image の画像で描く
+    （expanded 引数を受け付ける探索関数は探索済みセルも塗る）。
+    """
+    if algorithms is None:
+        algorithms = [('Dijkstra\'s algorithm', dijkstra, 'blue'),
+                      ('A* Algorithm', a_star, 'red')]
+    grid = hasattr(graph, 'cell_xy')
+
+    # すべてのアルゴリズムを実行
+    results = []
+    explored_nodes = []
+    for _, search, _ in algorithms:
+        expanded = [] if grid and 'expanded' in inspect.signature(search).parameters else None
+        results.append(search(graph, start, goal, expanded=expanded) if expanded is not None
+                       else search(graph, start, goal))
+        explored_nodes.append(expanded)
+
+    # アルゴリズムの数だけサブプロットを作成
+    fig, axes = plt.subplots(1, len(algorithms), figsize=(10 * len(algorithms), 8))
+    if len(algorithms) == 1:
+        axes = [axes]
+
+    if grid:
+        for ax, (title, _, _), (path, cost, explored), expanded in zip(axes, algorithms, results,
+                                                                       explored_nodes):
+            image = render_grid_image(graph, graph.width, graph.height, path=path, explored=expanded)
+            ax.imshow(image, extent=(0, graph.width, graph.height, 0), interpolation='nearest')
+            ax.set_title(f'{title}\nNumber of search nodes: {explored}, Cost: {cost:.2f}',
+                         fontsize=14, fontweight='bold', pad=20)
+            ax.axis('off')
+        _suptitle_improvements(fig, start, goal, algorithms, results)
+        plt.tight_layout()
+        return plt
 
     # NetworkXグラフに変換
     G = nx.Graph()
@@ -204,6 +1021,10 @@ def compare_search_visualization(graph: Graph, start: str, goal: str):
 
     pos = graph.positions
 
+    # ノード数が多い場合（グリッドなど）はノードを小さくし、ラベルを省略する
+    large = G.number_of_nodes() > 50
+    node_size = max(30, 30000 // G.number_of_nodes()) if large else 1000
+
     # エッジラベルを作成
     edge_labels = {}
     for node, neighbors in graph.edges.items():
@@ -211,67 +1032,56 @@ def compare_search_visualization(graph: Graph, start: str, goal: str):
             if (node, neighbor) not in edge_labels and (neighbor, node) not in edge_labels:
                 edge_labels[(node, neighbor)] = f"{weight:.1f}"
 
-    # ダイクストラの結果を描画
-    plt.sca(ax1)
-    nx.draw_networkx_nodes(G, pos, node_color='lightblue',
-                          node_size=1000, alpha=0.9, ax=ax1)
-    nx.draw_networkx_edges(G, pos, width=2, alpha=0.5,
-                          edge_color='gray', ax=ax1)
-
-    if path_dijkstra:
-        path_edges = [(path_dijkstra[i], path_dijkstra[i+1])
-                     for i in range(len(path_dijkstra)-1)]
-        nx.draw_networkx_edges(G, pos, edgelist=path_edges,
-                              width=4, edge_color='blue', alpha=0.8, ax=ax1)
-        nx.draw_networkx_nodes(G, pos, nodelist=[path_dijkstra[0]],
-                              node_color='green', node_size=1200, alpha=0.9, ax=ax1)
-        nx.draw_networkx_nodes(G, pos, nodelist=[path_dijkstra[-1]],
-                              node_color='orange', node_size=1200, alpha=0.9, ax=ax1)
-
-    nx.draw_networkx_labels(G, pos, font_size=14, font_weight='bold', ax=ax1)
-    nx.draw_networkx_edge_labels(G, pos, edge_labels, font_size=9, ax=ax1)
-    ax1.set_title(f'Dijkstra\'s algorithm\nNumber of search nodes: {explored_d}, Cost: {cost_d:.2f}',
-                 fontsize=14, fontweight='bold', pad=20)
-    ax1.axis('off')
-
-    # A*の結果を描画
-    plt.sca(ax2)
-    nx.draw_networkx_nodes(G, pos, node_color='lightblue',
-                          node_size=1000, alpha=0.9, ax=ax2)
-    nx.draw_networkx_edges(G, pos, width=2, alpha=0.5,
-                          edge_color='gray', ax=ax2)
-
-    if path_astar:
-        path_edges = [(path_astar[i], path_astar[i+1])
-                     for i in range(len(path_astar)-1)]
-        nx.draw_networkx_edges(G, pos, edgelist=path_edges,
-                              width=4, edge_color='red', alpha=0.8, ax=ax2)
-        nx.draw_networkx_nodes(G, pos, nodelist=[path_astar[0]],
-                              node_color='green', node_size=1200, alpha=0.9, ax=ax2)
-        nx.draw_networkx_nodes(G, pos, nodelist=[path_astar[-1]],
-                              node_color='orange', node_size=1200, alpha=0.9, ax=ax2)
-
-    nx.draw_networkx_labels(G, pos, font_size=14, font_weight='bold', ax=ax2)
-    nx.draw_networkx_edge_labels(G, pos, edge_labels, font_size=9, ax=ax2)
-    ax2.set_title(f'A* Algorithm\nNumber of search nodes: {explored_a}, Cost: {cost_a:.2f}',
-                 fontsize=14, fontweight='bold', pad=20)
-    ax2.axis('off')
-
-    # 効率改善を表示
-    if path_dijkstra and path_astar:
-        efficiency = (1 - explored_a / explored_d) * 100 if explored_d > 0 else 0
-        fig.suptitle(f'Comparison of Search Algorithms: {start} → {goal}\n' +
-                    f'A* improvement: {efficiency:.1f}% reduction',
-                    fontsize=16, fontweight='bold')
-
+    # 各アルゴリズムの結果を描画
+    for ax, (title, _, color), (path, cost, explored) in zip(axes, algorithms, results):
+        plt.sca(ax)
+        nx.draw_networkx_nodes(G, pos, node_color='lightblue',
+                              node_size=node_size, alpha=0.9, ax=ax)
+        nx.draw_networkx_edges(G, pos, width=2, alpha=0.5,
+                              edge_color='gray', ax=ax)
+
+        if path:
+            path_edges = [(path[i], path[i+1]) for i in range(len(path)-1)]
+            nx.draw_networkx_edges(G, pos, edgelist=path_edges,
+                                  width=4, edge_color=color, alpha=0.8, ax=ax)
+            nx.draw_networkx_nodes(G, pos, nodelist=[path[0]],
+                                  node_color='green', node_size=node_size * 1.2, alpha=0.9, ax=ax)
+            nx.draw_networkx_nodes(G, pos, nodelist=[path[-1]],
+                                  node_color='orange', node_size=node_size * 1.2, alpha=0.9, ax=ax)
+
+        if not large:
+            nx.draw_networkx_labels(G, pos, font_size=14, font_weight='bold', ax=ax)
+            nx.draw_networkx_edge_labels(G, pos, edge_labels, font_size=9, ax=ax)
+        ax.set_title(f'{title}\nNumber of search nodes: {explored}, Cost: {cost:.2f}',
+                     fontsize=14, fontweight='bold', pad=20)
+        ax.axis('off')
+
+    _suptitle_improvements(fig, start, goal, algorithms, results)
     plt.tight_layout()
     return plt
 
 
+def _suptitle_improvements(fig, start, goal, algorithms, results):
+    """先頭のアルゴリズムに対する効率改善を図のタイトルに表示"""
+    base_path, _, base_explored = results[0]
+    if len(results) > 1 and base_path and all(path for path, _, _ in results[1:]):
+        improvements = []
+        for (title, _, _), (_, _, explored) in zip(algorithms[1:], results[1:]):
+            efficiency = (1 - explored / base_explored) * 100 if base_explored > 0 else 0
+            improvements.append(f'{title} improvement: {efficiency:.1f}% reduction')
+        fig.suptitle(f'Comparison of Search Algorithms: {start} → {goal}\n' +
+                    '\n'.join(improvements),
+                    fontsize=16, fontweight='bold')
+
+
 def create_grid_graph(width: int, height: int, obstacles: List[Tuple[int, int]] = None) -> Graph:
-    """グリッドグラフを作成（迷路探索用）"""
+    """
+    グリッドグラフを作成（迷路探索用）
+
+    ノード名は "x,y" の文字列。大きなグリッドでは辺を作らない GridGraph を使う。
+    """
     graph = Graph()
-    obstacles = obstacles or []
+    obstacles = set(obstacles or [])  # 集合にして判定を O(1) にする
 
     # すべてのノードの位置を設定
     for y in range(height):
@@ -301,12 +1111,118 @@ def create_grid_graph(width: int, height: int, obstacles: List[Tuple[int, int]]
     return graph
 
 
+def _grid_cell_indices(graph, nodes, width: int) -> np.ndarray:
+    """ノード（GridGraph のセルID、または "x,y" の文字列）の列を y * width + x の配列に変換"""
+    nodes = list(nodes)
+    if not nodes:
+        return np.zeros(0, dtype=np.intp)
+    if isinstance(nodes[0], (int, np.integer)) and getattr(graph, 'width', width) == width:
+        return np.asarray(nodes, dtype=np.intp)
+    coords = np.array([graph.cell_xy(node) if isinstance(node, (int, np.integer))
+                       else tuple(map(int, node.split(','))) for node in nodes], dtype=np.intp)
+    return coords[:, 1] * width + coords[:, 0]
+
+
+def render_grid_image(graph, width: int, height: int, obstacles=None,
+                      path: Optional[list] = None, explored: Optional[list] = None,
+                      heatmap: bool = False, cmap: str = 'viridis') -> np.ndarray:
+    """
+    グリッドの探索結果を (height, width, 3) の RGB 画像配列に塗る
+
+    障害物・探索済みセル・経路をセル単位の配列演算で塗るため、
+    処理時間は Python の描画呼び出し数ではなく画素数に比例する。
+
+    Args:
+        graph: GridGraph、または create_grid_graph のグラフ（ノード名 "x,y"）
+        width, height: グリッドの大きさ
+        obstacles: 障害物の座標 [(x, y), ...]（省略時は GridGraph.blocked を使う）
+        path: 経路のノード列
+        explored: 展開したノードの列（a_star / dijkstra の expanded 引数で取得）
+        heatmap: True なら探索済みセルを展開順で色分けする（最初に展開した順位を使う）
+        cmap: ヒートマップのカラーマップ名
+
+    Returns:
+        numpy.ndarray: RGB 画像（値は 0〜1）
+    """
+    size = width * height
+    image = np.empty((size, 3))
+    image[:] = GRID_COLORS['free']
+
+    if obstacles is None and hasattr(graph, 'blocked') and graph.width == width:
+        blocked = np.frombuffer(bytes(graph.blocked), dtype=np.uint8)[:size].astype(bool)
+    else:
+        blocked = np.zeros(size, dtype=bool)
+        cells = np.array(list(obstacles or []), dtype=np.intp).reshape(-1, 2)
+        inside = (cells[:, 0] >= 0) & (cells[:, 0] < width) & (cells[:, 1] >= 0) & (cells[:, 1] < height)
+        cells = cells[inside]
+        blocked[cells[:, 1] * width + cells[:, 0]] = True
+    image[blocked] = GRID_COLORS['obstacle']
+
+    if explored:
+        cells = _grid_cell_indices(graph, explored, width)
+        if heatmap:
+            # 逆順に書き込み、同じセルが何度も現れる場合は最初の順位を残す
+            order = np.full(size, -1.0)
+            order[cells[::-1]] = np.arange(len(cells), dtype=float)[::-1]
+            seen = order >= 0
+            image[seen] = plt.get_cmap(cmap)(order[seen] / max(1, len(cells) - 1))[:, :3]
+        else:
+            image[cells] = GRID_COLORS['explored']
+
+    if path:
+        cells = _grid_cell_indices(graph, path, width)
+        # 隣り合わないノード（Jump Point Search の跳躍点など）の間のセルも塗る
+        xs, ys = cells % width, cells // width
+        dx, dy = np.diff(xs), np.diff(ys)
+        steps = np.maximum(np.maximum(np.abs(dx), np.abs(dy)), 1)
+        segment = np.repeat(np.arange(len(steps)), steps)
+        offset = np.arange(len(segment)) - np.repeat(np.cumsum(steps) - steps, steps)
+        line_x = xs[segment] + np.rint(dx[segment] * offset / steps[segment]).astype(np.intp)
+        line_y = ys[segment] + np.rint(dy[segment] * offset / steps[segment]).astype(np.intp)
+        image[line_y * width + line_x] = GRID_COLORS['path']
+        image[cells[0]] = GRID_COLORS['start']
+        image[cells[-1]] = GRID_COLORS['goal']
+
+    return image.reshape(height, width, 3)
+
+
 def visualize_grid_search(graph: Graph, width: int, height: int,
                          obstacles: List[Tuple[int, int]],
-                         path: List[str], title: str):
-    """グリッド迷路の探索結果を可視化"""
+                         path: List[str], title: str,
+                         explored: Optional[list] = None, heatmap: bool = False,
+                         raster: Optional[bool] = None):
+    """
+    グリッド迷路の探索結果を可視化
+
+    path のノードは "x,y" の文字列、または GridGraph のセルID。
+    raster を省略すると、RASTER_MIN_CELLS 以上のグリッドや explored を渡した場合は
+    render_grid_image の画像を imshow 1回で描き、小さなグリッドはセルごとに描く。
+    explored と heatmap=True を渡すと、探索済みセルを展開順で色分けする。
+    """
+    if raster is None:
+        raster = width * height >= RASTER_MIN_CELLS or explored is not None
     plt.figure(figsize=(10, 10))
 
+    if raster:
+        image = render_grid_image(graph, width, height, obstacles, path, explored, heatmap)
+        plt.imshow(image, extent=(0, width, height, 0), interpolation='nearest')
+        handles = [Patch(color=GRID_COLORS['obstacle'], label='Obstacle')]
+        if explored and heatmap:
+            mappable = plt.cm.ScalarMappable(norm=Normalize(0, len(explored)), cmap='viridis')
+            plt.colorbar(mappable, ax=plt.gca(), fraction=0.046, pad=0.04, label='Expansion order')
+        elif explored:
+            handles.append(Patch(color=GRID_COLORS['explored'], label='Explored'))
+        if path:
+            handles += [Patch(color=GRID_COLORS['path'], label='Route'),
+                        Patch(color=GRID_COLORS['start'], label='Start'),
+                        Patch(color=GRID_COLORS['goal'], label='Goal')]
+        plt.title(title, fontsize=16, fontweight='bold', pad=20)
+        plt.legend(handles=handles, loc='upper right', fontsize=12)
+        return plt
+
+    obstacles = set(obstacles if obstacles is not None else
+                    (graph.cell_xy(cell) for cell in range(graph.num_nodes) if graph.blocked[cell]))
+
     # グリッドを描画
     for y in range(height):
         for x in range(width):
@@ -320,7 +1236,10 @@ def visualize_grid_search(graph: Graph, width: int, height: int,
     if path:
         path_coords = []
         for node in path:
-            x, y = map(int, node.split(','))
+            if isinstance(node, int):
+                x, y = graph.cell_xy(node)
+            else:
+                x, y = map(int, node.split(','))
             path_coords.append((x + 0.5, y + 0.5))
 
         xs, ys = zip(*path_coords)
@@ -386,12 +1305,90 @@ def main():
     print("[OK] maze_solution.png を保存しました")
     plt.close()
 
+    # 3. CSR形式（配列ベース）のグラフでも同じ探索が可能
+    print("\n[3] CSR形式のグラフで探索を実行中...")
+    frozen = grid_graph.freeze()
+    path_csr, cost_csr, explored_csr = a_star(frozen, '0,0', '14,14')
+    print(f"    - ノード数: {frozen.num_nodes}, 有向辺数: {frozen.num_edges}")
+    print(f"    - コスト: {cost_csr:.1f}, 探索ノード数: {explored_csr}")
+    print(f"    - 通常のグラフと同じ経路: {path_csr == path_grid}")
+
+    # 4. 双方向ダイクストラ法との探索ノード数の比較
+    print("\n[4] 双方向ダイクストラ法との比較...")
+    _, cost_uni, explored_uni = dijkstra(grid_graph, '0,0', '14,14')
+    _, cost_bi, explored_bi = dijkstra(grid_graph, '0,0', '14,14', bidirectional=True)
+    print(f"    - 片方向: コスト {cost_uni:.1f}, 探索ノード数 {explored_uni}")
+    print(f"    - 双方向: コスト {cost_bi:.1f}, 探索ノード数 {explored_bi}")
+
+    # 5. 辺を作らない GridGraph での探索
+    print("\n[5] GridGraph（整数セルID・障害物ビットマップ）で探索中...")
+    grid = GridGraph(15, 15, obstacles)
+    path_cells, cost_cells, explored_cells = a_star(grid, grid.cell_id(0, 0), grid.cell_id(14, 14))
+    print(f"    - コスト: {cost_cells:.1f}, 探索ノード数: {explored_cells}")
+    print(f"    - 文字列ノードのグラフと同じコスト: {cost_cells == cost_csr}")
+    grid8 = GridGraph(15, 15, obstacles, diagonal=True)
+    _, cost_diag, explored_diag = a_star(grid8, grid8.cell_id(0, 0), grid8.cell_id(14, 14))
+    print(f"    - 斜め移動あり: コスト {cost_diag:.2f}, 探索ノード数 {explored_diag}")
+
+    # 6. Jump Point Search と A* の比較
+    print("\n[6] Jump Point Search と A* の比較を生成中...")
+    for label, g in (('4近傍', grid), ('8近傍', grid8)):
+        _, cost_jps, explored_jps = jump_point_search(g, g.cell_id(0, 0), g.cell_id(14, 14))
+        _, cost_ref, explored_ref = a_star(g, g.cell_id(0, 0), g.cell_id(14, 14))
+        print(f"    - {label}: A* 探索ノード数 {explored_ref}, JPS 探索ノード数 {explored_jps}"
+              f"（コスト {cost_ref:.2f} / {cost_jps:.2f}）")
+    plt3 = compare_search_visualization(grid8, grid8.cell_id(0, 0), grid8.cell_id(14, 14),
+                                        [('A* Algorithm', a_star, 'red'),
+                                         ('Jump Point Search', jump_point_search, 'purple')])
+    plt3.savefig('jps_comparison.png', dpi=150, bbox_inches='tight')
+    print("[OK] jps_comparison.png を保存しました")
+    plt.close()
+
+    # 7. 作業領域を再利用した繰り返し問い合わせ
+    print("\n[7] SearchWorkspace を再利用して短い問い合わせを繰り返し中...")
+    big = GridGraph(1000, 1000)
+    workspace = SearchWorkspace.for_graph(big)
+    rng = random.Random(0)
+    queries = []
+    for _ in range(1000):
+        x, y = rng.randrange(990), rng.randrange(990)
+        queries.append((big.cell_id(x, y), big.cell_id(x + rng.randrange(10), y + rng.randrange(10))))
+    start_time = time.perf_counter()
+    costs = [a_star(big, s, t, workspace=workspace)[1] for s, t in queries]
+    elapsed = time.perf_counter() - start_time
+    print(f"    - 1000x1000 グリッドで {len(queries)} 回: {elapsed * 1000:.1f} ms"
+          f"（1回あたり {elapsed / len(queries) * 1e6:.0f} µs、配列の確保は1回のみ）")
+    print(f"    - 辞書版と同じコスト: {costs == [a_star(big, s, t)[1] for s, t in queries]}")
+
+    # 8. 大きなグリッドのラスター描画（展開順のヒートマップ）
+    print("\n[8] 500x500 グリッドの探索をラスター描画中...")
+    size = 500
+    rng = random.Random(1)
+    large_obstacles = [(x, y) for y in range(size) for x in range(size)
+                       if rng.random() < 0.25 and (x, y) not in ((0, 0), (size - 1, size - 1))]
+    large = GridGraph(size, size, large_obstacles, diagonal=True)
+    order = []
+    path_large, cost_large, explored_large = a_star(large, large.cell_id(0, 0),
+                                                    large.cell_id(size - 1, size - 1), expanded=order)
+    start_time = time.perf_counter()
+    plt4 = visualize_grid_search(large, size, size, None, path_large,
+                                 f'A* search on {size}x{size} (Explored: {explored_large} nodes)',
+                                 explored=order, heatmap=True)
+    plt4.savefig('large_grid_heatmap.png', dpi=150, bbox_inches='tight')
+    elapsed = time.perf_counter() - start_time
+    plt.close()
+    print(f"    - コスト: {cost_large:.2f}, 探索ノード数: {explored_large}")
+    print(f"    - 描画と保存: {elapsed:.2f} 秒（imshow 1回、{size * size} セル）")
+    print("[OK] large_grid_heatmap.png を保存しました")
+
     print("\n" + "=" * 60)
     print("全ての視覚化が完了しました!")
     print("=" * 60)
     print("\n生成されたファイル:")
     print("  - algorithm_comparison.png (20ノードの複雑なネットワーク比較)")
     print("  - maze_solution.png (15x15グリッド迷路の解)")
+    print("  - jps_comparison.png (A*とJump Point Searchの比較)")
+    print("  - large_grid_heatmap.png (500x500グリッドの展開順ヒートマップ)")
     print("\n各アルゴリズムの特性:")
     print("  - ダイクストラ法: 全方位探索、最適解保証")
     print("  - A*アルゴリズム: ヒューリスティック使用、効率的探索")
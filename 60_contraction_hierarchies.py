@@ -0,0 +1,330 @@
+"""
+縮約階層（Contraction Hierarchies）による最短経路探索の高速化
+
+このプログラムは、静的な道路網に対する前処理と高速な問い合わせを実装します。
+- 前処理: ノードを重要度の低い順に縮約し、迂回できなくなる経路にショートカット辺を追加
+- 問い合わせ: 順位が「上がる」方向の辺だけを使う双方向ダイクストラ法
+- 経路復元: ショートカット辺を元の辺の列に展開（アンパック）
+- 前処理結果は JSON ファイルに保存・読み込み可能
+
+同じグラフに何千回も問い合わせる場合、毎回ゼロから探索する
+22〜24番の実装に比べて、1回あたりの探索ノード数が桁違いに少なくなります。
+"""
+
+import heapq
+import importlib
+import json
+import time
+
+
+class ContractionHierarchy:
+    """
+    縮約階層の前処理結果と問い合わせ機能を管理するクラス
+
+    - rank: 各ノードの縮約順位（大きいほど重要なノード）
+    - upward: 順位が上がる辺 {ノード: [(上位ノード, 重み), ...]}（順方向探索用）
+    - downward: 順位が下がる辺を反転したもの {ノード: [(上位ノード, 重み), ...]}（逆方向探索用）
+    - shortcuts: ショートカット辺の中継ノード {(始点, 終点): 中継ノード}
+    """
+
+    def __init__(self, rank, edges):
+        """
+        Args:
+            rank (dict): {ノード: 縮約順位}
+            edges (dict): {(始点, 終点): (重み, 中継ノード or None)}
+        """
+        self.rank = rank
+        self.upward = {node: [] for node in rank}
+        self.downward = {node: [] for node in rank}
+        self.shortcuts = {}
+
+        for (u, v), (weight, middle) in edges.items():
+            if rank[u] < rank[v]:
+                self.upward[u].append((v, weight))
+            else:
+                self.downward[v].append((u, weight))
+            if middle is not None:
+                self.shortcuts[(u, v)] = middle
+        self._edges = edges
+
+    @classmethod
+    def build(cls, graph, witness_limit=500):
+        """
+        グラフを前処理して縮約階層を構築
+
+        Args:
+            graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}
+            witness_limit (int): 迂回路（witness）探索で確定するノード数の上限。
+                上限に達した場合は安全側に倒してショートカットを追加する
+
+        Returns:
+            ContractionHierarchy: 前処理結果
+        """
+        # 縮約中のグラフ（残っているノード間の辺のみ、多重辺は最小重みにまとめる）
+        out_edges = {node: {} for node in graph}
+        in_edges = {node: {} for node in graph}
+        # 最終的な全辺（元の辺 + ショートカット）: {(u, v): (重み, 中継ノード)}
+        edges = {}
+
+        for u, neighbors in graph.items():
+            for v, weight in neighbors:
+                out_edges.setdefault(v, {})
+                in_edges.setdefault(v, {})
+                if u == v:
+                    continue
+                if weight < out_edges[u].get(v, float('inf')):
+                    out_edges[u][v] = weight
+                    in_edges[v][u] = weight
+                    edges[(u, v)] = (weight, None)
+
+        contracted_neighbors = {node: 0 for node in out_edges}
+
+        def witness_distances(source, excluded, max_distance):
+            """excluded を通らない source からの距離を max_distance まで求める"""
+            distances = {source: 0}
+            queue = [(0, source)]
+            settled = 0
+            while queue:
+                distance, node = heapq.heappop(queue)
+                if distance > distances[node]:
+                    continue
+                if distance > max_distance or settled >= witness_limit:
+                    break
+                settled += 1
+                for neighbor, weight in out_edges[node].items():
+                    if neighbor == excluded:
+                        continue
+                    new_distance = distance + weight
+                    if new_distance < distances.get(neighbor, float('inf')):
+                        distances[neighbor] = new_distance
+                        heapq.heappush(queue, (new_distance, neighbor))
+            return distances
+
+        def needed_shortcuts(node):
+            """node を縮約したときに必要になるショートカットを列挙"""
+            shortcuts = []
+            outgoing = out_edges[node]
+            if not outgoing:
+                return shortcuts
+            max_out = max(outgoing.values())
+            for u, weight_in in in_edges[node].items():
+                witness = witness_distances(u, node, weight_in + max_out)
+                for w, weight_out in outgoing.items():
+                    if w == u:
+                        continue
+                    via = weight_in + weight_out
+                    if witness.get(w, float('inf')) > via:
+                        shortcuts.append((u, w, via))
+            return shortcuts
+
+        def priority(node):
+            """縮約の優先度（エッジ差分 + 縮約済み隣接数）。小さいほど先に縮約"""
+            removed = len(in_edges[node]) + len(out_edges[node])
+            return len(needed_shortcuts(node)) - removed + contracted_neighbors[node]
+
+        queue = [(priority(node), node) for node in out_edges]
+        heapq.heapify(queue)
+        rank = {}
+
+        while queue:
+            _, node = heapq.heappop(queue)
+            # 遅延更新: 優先度を再計算し、次の候補より悪くなっていれば後回し
+            current = priority(node)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, node))
+                continue
+
+            for u, w, via in needed_shortcuts(node):
+                if via < out_edges[u].get(w, float('inf')):
+                    out_edges[u][w] = via
+                    in_edges[w][u] = via
+                    edges[(u, w)] = (via, node)
+
+            # node をグラフから取り除く
+            for u in in_edges[node]:
+                del out_edges[u][node]
+                contracted_neighbors[u] += 1
+            for w in out_edges[node]:
+                del in_edges[w][node]
+                contracted_neighbors[w] += 1
+            out_edges[node] = {}
+            in_edges[node] = {}
+            rank[node] = len(rank)
+
+        return cls(rank, edges)
+
+    @property
+    def shortcut_count(self):
+        """追加されたショートカット辺の数"""
+        return len(self.shortcuts)
+
+    def query(self, start, goal):
+        """
+        縮約階層上の双方向ダイクストラ法で最短経路を求める
+
+        Args:
+            start (str): 始点ノード
+            goal (str): 目標ノード
+
+        Returns:
+            tuple: (最短経路のリスト, 総コスト)。到達不可能な場合は ([], inf)
+        """
+        if start not in self.rank or goal not in self.rank:
+            return [], float('inf')
+
+        distances = [{start: 0}, {goal: 0}]
+        previous = [{}, {}]
+        queues = [[(0, start)], [(0, goal)]]
+        adjacency = [self.upward, self.downward]
+        best_cost = float('inf')
+        meeting_node = None
+
+        # 上向きの探索同士なので、両側とも先頭距離が最短候補以上になるまで進める
+        while queues[0] or queues[1]:
+            for side in (0, 1):
+                queue = queues[side]
+                if not queue:
+                    continue
+                distance, node = heapq.heappop(queue)
+                if distance >= best_cost:
+                    queue.clear()
+                    continue
+                if distance > distances[side][node]:
+                    continue
+
+                other_distance = distances[1 - side].get(node)
+                if other_distance is not None and distance + other_distance < best_cost:
+                    best_cost = distance + other_distance
+                    meeting_node = node
+
+                for neighbor, weight in adjacency[side][node]:
+                    new_distance = distance + weight
+                    if new_distance < distances[side].get(neighbor, float('inf')):
+                        distances[side][neighbor] = new_distance
+                        previous[side][neighbor] = node
+                        heapq.heappush(queue, (new_distance, neighbor))
+
+        if meeting_node is None:
+            return [], float('inf')
+
+        # 縮約階層上の経路（ショートカットを含む）を組み立てる
+        up_path = [meeting_node]
+        while up_path[-1] in previous[0]:
+            up_path.append(previous[0][up_path[-1]])
+        up_path.reverse()
+        down_path = [meeting_node]
+        while down_path[-1] in previous[1]:
+            down_path.append(previous[1][down_path[-1]])
+        hierarchy_path = up_path + down_path[1:]
+
+        return self._unpack(hierarchy_path), best_cost
+
+    def _unpack(self, hierarchy_path):
+        """ショートカットを中継ノードで再帰的に展開して元のグラフの経路にする"""
+        path = [hierarchy_path[0]]
+        for u, v in zip(hierarchy_path, hierarchy_path[1:]):
+            # スタックで展開（再帰呼び出しを使わない）
+            stack = [(u, v)]
+            while stack:
+                a, b = stack.pop()
+                middle = self.shortcuts.get((a, b))
+                if middle is None:
+                    path.append(b)
+                else:
+                    stack.append((middle, b))
+                    stack.append((a, middle))
+        return path
+
+    def save(self, filename):
+        """
+        前処理結果を JSON ファイルに保存
+
+        JSON のオブジェクトのキーは文字列になってしまうため、ノードの一覧を
+        1度だけ書き、順位と辺はその一覧での位置（インデックス）で書く。
+        ノードIDは JSON で型が変わらない str / int のみ保存できる（それ以外は TypeError）。
+        """
+        nodes = list(self.rank)
+        for node in nodes:
+            if type(node) not in (str, int):
+                raise TypeError(f"JSON に保存できるノードIDは str / int のみです: {node!r}")
+        index = {node: i for i, node in enumerate(nodes)}
+        data = {
+            'nodes': nodes,
+            'rank': [self.rank[node] for node in nodes],
+            'edges': [[index[u], index[v], weight, None if middle is None else index[middle]]
+                      for (u, v), (weight, middle) in self._edges.items()],
+        }
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, filename):
+        """JSON ファイルから前処理結果を読み込み"""
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        nodes = data['nodes']
+        rank = dict(zip(nodes, data['rank']))
+        edges = {(nodes[u], nodes[v]): (weight, None if middle is None else nodes[middle])
+                 for u, v, weight, middle in data['edges']}
+        return cls(rank, edges)
+
+
+def main():
+    """
+    メイン実行関数：3つの道路網で縮約階層を構築し、全都市ペアで問い合わせる
+    """
+    dijkstra_simple = importlib.import_module('23_dijkstra_simple').dijkstra_simple
+    networks = [
+        ('日本主要都市道路網', importlib.import_module('22_dijkstra_basic').create_japan_road_network()),
+        ('ヨーロッパ主要都市鉄道網', importlib.import_module('23_dijkstra_simple').create_europe_network()),
+        ('アメリカ主要都市道路網', importlib.import_module('24_astar_simple').create_usa_network_with_coordinates()[0]),
+    ]
+
+    for title, graph in networks:
+        print("\n" + "=" * 60)
+        print(f"グラフ構造: {title}")
+        print("=" * 60)
+
+        # 前処理
+        start_time = time.perf_counter()
+        ch = ContractionHierarchy.build(graph)
+        build_time = time.perf_counter() - start_time
+        edge_count = sum(len(edges) for edges in graph.values())
+        print(f"ノード数: {len(ch.rank)}, 有向辺数: {edge_count}")
+        print(f"ショートカット数: {ch.shortcut_count}")
+        print(f"前処理時間: {build_time * 1000:.1f} ms")
+
+        # 保存と読み込み
+        filename = 'contraction_hierarchy.json'
+        ch.save(filename)
+        ch = ContractionHierarchy.load(filename)
+        print(f"{filename} に保存し、読み込み直しました")
+
+        # 全都市ペアで通常のダイクストラ法と比較
+        pairs = [(s, g) for s in graph for g in graph if s != g]
+        start_time = time.perf_counter()
+        expected = [dijkstra_simple(graph, s, g, trace=None)[1] for s, g in pairs]
+        dijkstra_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        results = [ch.query(s, g) for s, g in pairs]
+        ch_time = time.perf_counter() - start_time
+
+        mismatches = sum(1 for (_, cost), exp in zip(results, expected)
+                         if abs(cost - exp) > 1e-9)
+        print(f"\n全 {len(pairs)} ペアの問い合わせ:")
+        print(f"  ダイクストラ法: {dijkstra_time * 1000:.1f} ms")
+        print(f"  縮約階層:       {ch_time * 1000:.1f} ms")
+        print(f"  コストの不一致: {mismatches} 件")
+
+        start_city, goal_city = pairs[0][0], pairs[-1][0]
+        path, cost = ch.query(start_city, goal_city)
+        print(f"\n例: {start_city} → {goal_city}")
+        print(f"  最短経路: {' → '.join(path)}")
+        print(f"  コスト: {cost}")
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
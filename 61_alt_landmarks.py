@@ -0,0 +1,158 @@
+"""
+ALT（A*, Landmarks, Triangle inequality）ヒューリスティック
+
+このプログラムは、ランドマークを使った A* 用のヒューリスティックを実装します。
+- 前処理: K個のランドマークを選び、全ノードとの距離表を配列に保存
+- 三角不等式: d(v, t) ≥ d(L, t) - d(L, v) および d(v, t) ≥ d(v, L) - d(t, L)
+- 座標がなくても、辺の重みが地理的な距離でなくても許容的（過大評価しない）
+- 24_astar_simple.py の astar_simple(graph, start, goal, heuristic) にそのまま渡せる
+
+ユークリッド距離のヒューリスティックは座標がないと 0 になり、
+A* がダイクストラ法と同じ探索に戻ってしまいますが、ALT はグラフ構造だけから
+目標までの下界を求めるため、座標なしでも探索ノード数を大きく削減できます。
+"""
+
+import importlib
+import random
+from array import array
+
+
+class LandmarkHeuristic:
+    """
+    ランドマーク距離表による許容的ヒューリスティック
+
+    ノード名を整数インデックスに変換し、各ランドマークについて
+    - from_tables[k][i]: ランドマーク k からノード i への距離
+    - to_tables[k][i]:   ノード i からランドマーク k への距離
+    を array('d') に保持する（到達不可能は inf）。
+    """
+
+    def __init__(self, graph, num_landmarks=4, seed=None):
+        """
+        Args:
+            graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}
+                （25番の Graph / CSRGraph の場合は edges を使用）
+            num_landmarks (int): ランドマーク数 K
+            seed (int): ランドマーク選択の乱数シード
+        """
+        graph = getattr(graph, 'edges', graph)
+        self.nodes = list(graph)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+
+        # 逆方向の距離（ノード → ランドマーク）用に反転グラフを作る
+        reverse = importlib.import_module('23_dijkstra_simple').reverse_graph(graph)
+
+        self.landmarks = []
+        self.from_tables = []
+        self.to_tables = []
+        self._goal = None
+        self._goal_from = []
+        self._goal_to = []
+
+        if not self.nodes:
+            return
+
+        # 最遠点選択: 既存のランドマークから最も遠いノードを次のランドマークにする
+        rng = random.Random(seed)
+        candidate = rng.choice(self.nodes)
+        nearest = [float('inf')] * len(self.nodes)
+        for _ in range(min(num_landmarks, len(self.nodes))):
+            self._add_landmark(candidate, graph, reverse)
+            table = self.from_tables[-1]
+            best = -1.0
+            for i, distance in enumerate(table):
+                if distance < nearest[i]:
+                    nearest[i] = distance
+                # 到達不可能なノードは別の連結成分なので、優先的に選ぶ
+                score = float('inf') if nearest[i] == float('inf') else nearest[i]
+                if score > best and self.nodes[i] not in self.landmarks:
+                    best = score
+                    candidate = self.nodes[i]
+            if best < 0:
+                break
+
+    def _add_landmark(self, landmark, graph, reverse):
+        """ランドマークを追加して距離表を計算"""
+        inf = float('inf')
+        dijkstra_distances = importlib.import_module('23_dijkstra_simple').dijkstra_distances
+        from_distances, _ = dijkstra_distances(graph, landmark)
+        to_distances, _ = dijkstra_distances(reverse, landmark)
+        self.landmarks.append(landmark)
+        self.from_tables.append(array('d', (from_distances.get(node, inf) for node in self.nodes)))
+        self.to_tables.append(array('d', (to_distances.get(node, inf) for node in self.nodes)))
+
+    def heuristic(self, node, goal):
+        """
+        三角不等式による下界 h(node, goal)
+
+        Args:
+            node (str): 現在のノード
+            goal (str): 目標ノード
+
+        Returns:
+            float: 推定コスト（実際の最短距離以下）
+        """
+        i = self.index.get(node)
+        if i is None or goal not in self.index:
+            return 0.0
+
+        # 目標ノードの列は問い合わせ中に変わらないので1度だけ取り出す
+        if goal != self._goal:
+            j = self.index[goal]
+            self._goal = goal
+            self._goal_from = [table[j] for table in self.from_tables]
+            self._goal_to = [table[j] for table in self.to_tables]
+
+        inf = float('inf')
+        best = 0.0
+        for k in range(len(self.landmarks)):
+            landmark_to_goal = self._goal_from[k]
+            landmark_to_node = self.from_tables[k][i]
+            if landmark_to_goal != inf and landmark_to_node != inf:
+                best = max(best, landmark_to_goal - landmark_to_node)
+            node_to_landmark = self.to_tables[k][i]
+            goal_to_landmark = self._goal_to[k]
+            if node_to_landmark != inf and goal_to_landmark != inf:
+                best = max(best, node_to_landmark - goal_to_landmark)
+        return best
+
+    __call__ = heuristic
+
+
+def main():
+    """
+    メイン実行関数：アメリカ道路網でヒューリスティックごとの展開ノード数を比較
+    """
+    astar_module = importlib.import_module('24_astar_simple')
+    SearchTrace = importlib.import_module('22_dijkstra_basic').SearchTrace
+    graph, coordinates = astar_module.create_usa_network_with_coordinates()
+
+    print("\n" + "=" * 60)
+    print("ALT ヒューリスティック（ランドマーク + 三角不等式）")
+    print("=" * 60)
+
+    landmarks = LandmarkHeuristic(graph, num_landmarks=4, seed=0)
+    print(f"ランドマーク: {', '.join(landmarks.landmarks)}")
+
+    heuristics = [
+        ('なし（ダイクストラ法相当）', lambda node, goal: 0.0),
+        ('ユークリッド距離（座標あり）',
+         lambda node, goal: astar_module.euclidean_heuristic(node, goal, coordinates)),
+        ('ユークリッド距離（座標なし）',
+         lambda node, goal: astar_module.euclidean_heuristic(node, goal, {})),
+        ('ALT（座標不要）', landmarks.heuristic),
+    ]
+
+    pairs = [('ニューヨーク', 'ロサンゼルス'), ('シアトル', 'マイアミ'), ('ボストン', 'サンディエゴ')]
+    for start_city, goal_city in pairs:
+        print(f"\n探索: {start_city} → {goal_city}")
+        for label, heuristic in heuristics:
+            trace = SearchTrace()
+            path, cost = astar_module.astar_simple(graph, start_city, goal_city, heuristic, trace=trace)
+            print(f"  {label:<20} 展開ノード数: {trace.count('pop'):>3}, コスト: {cost:.1f}")
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
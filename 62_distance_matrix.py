@@ -0,0 +1,143 @@
+"""
+距離行列（One-to-Many / Many-to-Many）の計算
+
+このプログラムは、複数の出発地と目的地の間の最短距離表を計算します。
+- 1つの出発地につきダイクストラ法を1回だけ実行（ペアごとに探索しない）
+- すべての目的地が確定した時点で探索を打ち切る（早期終了）
+- プロセスプールで出発地を分割し、複数コアで並列に計算（結果は NumPy 配列）
+
+配車計画などで「数百の出発地 × 数千の目的地」の表が必要な場合、
+23_dijkstra_simple.py の dijkstra_simple をペアごとに呼ぶと
+出発地×目的地 回の探索が必要ですが、この方法なら出発地の数だけで済みます。
+"""
+
+import importlib
+import time
+
+from process_pool import map_chunks
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def dijkstra_one_to_many(graph, source, targets):
+    """
+    1つの出発地から複数の目的地への最短距離を求める
+
+    Args:
+        graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}
+        source (str): 出発地ノード
+        targets (list): 目的地ノードのリスト
+
+    Returns:
+        list: targets と同じ順序の最短距離（到達不可能は inf）
+    """
+    # すべての目的地が確定した時点で打ち切る（23番の dijkstra_distances）
+    distances, _ = importlib.import_module('23_dijkstra_simple').dijkstra_distances(graph, source, targets)
+    return [distances.get(target, float('inf')) for target in targets]
+
+
+def distance_matrix(graph, sources, targets):
+    """
+    出発地 × 目的地 の距離行列を計算
+
+    Args:
+        graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}
+        sources (list): 出発地ノードのリスト
+        targets (list): 目的地ノードのリスト
+
+    Returns:
+        list: matrix[i][j] = sources[i] から targets[j] への最短距離
+    """
+    graph = getattr(graph, 'edges', graph)
+    targets = list(targets)
+    return [dijkstra_one_to_many(graph, source, targets) for source in sources]
+
+
+def _distance_row(state, source):
+    """map_chunks 用: 1つの出発地の行"""
+    graph, targets = state
+    return dijkstra_one_to_many(graph, source, targets)
+
+
+def parallel_distance_matrix(graph, sources, targets, processes=None, chunk_size=None):
+    """
+    出発地をプロセスプールに分割して距離行列を並列計算
+
+    Args:
+        graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}
+        sources (list): 出発地ノードのリスト
+        targets (list): 目的地ノードのリスト
+        processes (int): ワーカープロセス数（省略時は CPU コア数）
+        chunk_size (int): 1タスクあたりの出発地数（省略時はワーカー数から自動決定）
+
+    Returns:
+        numpy.ndarray: 形状 (len(sources), len(targets)) の距離行列
+    """
+    if np is None:
+        raise ImportError("parallel_distance_matrix には NumPy が必要です（pip install numpy）")
+
+    graph = dict(getattr(graph, 'edges', graph))
+    sources = list(sources)
+    targets = list(targets)
+    matrix = np.full((len(sources), len(targets)), np.inf)
+    rows = map_chunks(_distance_row, sources, (graph, targets), processes, chunk_size)
+    if rows:
+        matrix[:] = rows
+    return matrix
+
+
+def main():
+    """
+    メイン実行関数：日本の道路網で全都市間の距離行列を計算
+    """
+    graph = importlib.import_module('22_dijkstra_basic').create_japan_road_network()
+    dijkstra_simple = importlib.import_module('23_dijkstra_simple').dijkstra_simple
+
+    cities = list(graph)
+    sources = cities[:10]
+    targets = cities
+
+    print("\n" + "=" * 60)
+    print("距離行列の計算: 日本主要都市道路網")
+    print("=" * 60)
+    print(f"出発地: {len(sources)} 都市, 目的地: {len(targets)} 都市")
+
+    # ペアごとに dijkstra_simple を呼ぶ方法
+    start_time = time.perf_counter()
+    pairwise = [[dijkstra_simple(graph, s, t, trace=None)[1] for t in targets] for s in sources]
+    pairwise_time = time.perf_counter() - start_time
+
+    # 出発地ごとに1回だけ探索する方法
+    start_time = time.perf_counter()
+    matrix = distance_matrix(graph, sources, targets)
+    matrix_time = time.perf_counter() - start_time
+
+    print(f"\nペアごとの探索:     {pairwise_time * 1000:.1f} ms")
+    print(f"出発地ごとの探索:   {matrix_time * 1000:.1f} ms")
+    print(f"結果の一致: {matrix == pairwise}")
+
+    # 並列版
+    if np is not None:
+        start_time = time.perf_counter()
+        parallel = parallel_distance_matrix(graph, sources, targets)
+        parallel_time = time.perf_counter() - start_time
+        print(f"プロセスプール版:   {parallel_time * 1000:.1f} ms（プロセス起動時間を含む）")
+        print(f"結果の一致: {bool((parallel == np.array(matrix)).all())}")
+    else:
+        print("NumPy がインストールされていないため、並列版はスキップしました")
+
+    # 距離行列の一部を表示
+    print("\n距離行列（一部、×10km）:")
+    shown = targets[:6]
+    print("        " + "".join(f"{city:>6}" for city in shown))
+    for source, row in zip(sources[:6], matrix):
+        print(f"{source:<6}" + "".join(f"{cost:>8}" for cost in row[:6]))
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+ダイクストラ法・A*用の優先度キュー
+
+このプログラムは、キー減少操作（decrease-key）を持つ優先度キューを実装します。
+- IndexedDaryHeap: 各要素の位置を記録した d 分ヒープ（キー減少が O(log_d n)）
+- RadixHeap: 整数キー専用の基数ヒープ（取り出すキーが単調増加する探索向け）
+- heapq の遅延削除方式との性能比較（グリッドグラフ上のベンチマーク）
+
+heapq による実装では、距離が更新されるたびに同じノードを重複してヒープに入れ、
+古いエントリを取り出したときに読み飛ばします。密なグラフではヒープが膨らみ、
+無駄な取り出しが増えます。キー減少を持つキューでは各ノードが高々1回しか入りません。
+
+どちらのキューも次の共通インターフェースを持ち、
+dijkstra_simple / astar_simple / a_star の queue 引数にクラスを渡して使います。
+- push(item, priority): 追加、またはより小さい優先度へのキー減少
+- pop(): 最小優先度の (priority, item) を取り出す
+- len(queue), bool(queue)
+
+なお CPython の heapq は C で実装されているため、純粋な Python で書いたキューは
+1操作あたりの定数倍で不利になります。ベンチマークで取り出し回数と実行時間の
+両方を比べ、グラフの密度に応じて使い分けてください。
+"""
+
+import importlib
+import random
+import time
+
+
+class IndexedDaryHeap:
+    """
+    キー減少操作を持つインデックス付き d 分ヒープ
+
+    heap に要素を並べ、position に各要素の現在位置を記録することで、
+    任意の要素の優先度を O(log_d n) で更新できる。
+    d を 4 程度にすると木が浅くなり、2分ヒープより比較回数が減る。
+    """
+
+    def __init__(self, d=4):
+        if d < 2:
+            raise ValueError("d は2以上にしてください")
+        self.d = d
+        self.heap = []       # 要素の配列（ヒープ順）
+        self.priority = {}   # 要素 → 優先度
+        self.position = {}   # 要素 → heap 内の位置
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __bool__(self):
+        return bool(self.heap)
+
+    def __contains__(self, item):
+        return item in self.position
+
+    def push(self, item, priority):
+        """
+        要素を追加する。すでに含まれていれば優先度が小さくなる場合のみ更新
+
+        Returns:
+            bool: 追加または更新した場合は True
+        """
+        index = self.position.get(item)
+        if index is None:
+            self.heap.append(item)
+            self.priority[item] = priority
+            self.position[item] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+            return True
+        if priority < self.priority[item]:
+            self.priority[item] = priority
+            self._sift_up(index)
+            return True
+        return False
+
+    def pop(self):
+        """最小優先度の (priority, item) を取り出す"""
+        if not self.heap:
+            raise IndexError("pop from empty heap")
+        heap = self.heap
+        root = heap[0]
+        last = heap.pop()
+        del self.position[root]
+        if heap:
+            heap[0] = last
+            self.position[last] = 0
+            self._sift_down(0)
+        return self.priority.pop(root), root
+
+    def _sift_up(self, index):
+        heap, priority, position, d = self.heap, self.priority, self.position, self.d
+        item = heap[index]
+        key = priority[item]
+        while index > 0:
+            parent = (index - 1) // d
+            parent_item = heap[parent]
+            if priority[parent_item] <= key:
+                break
+            heap[index] = parent_item
+            position[parent_item] = index
+            index = parent
+        heap[index] = item
+        position[item] = index
+
+    def _sift_down(self, index):
+        heap, priority, position, d = self.heap, self.priority, self.position, self.d
+        size = len(heap)
+        item = heap[index]
+        key = priority[item]
+        while True:
+            first = index * d + 1
+            if first >= size:
+                break
+            # d 個の子のうち最小のものを探す
+            best = first
+            best_key = priority[heap[first]]
+            for child in range(first + 1, min(first + d, size)):
+                child_key = priority[heap[child]]
+                if child_key < best_key:
+                    best, best_key = child, child_key
+            if best_key >= key:
+                break
+            heap[index] = heap[best]
+            position[heap[index]] = index
+            index = best
+        heap[index] = item
+        position[item] = index
+
+
+class RadixHeap:
+    """
+    整数キー専用の基数ヒープ（キー減少操作つき）
+
+    最後に取り出したキー last との排他的論理和の最上位ビットでバケットを決める。
+    取り出すキーが単調に増加する（ダイクストラ法など）ことが前提で、
+    last より小さいキーは追加できない。各要素はバケットを高々キーのビット数回しか
+    移動しないため、1操作あたり償却 O(log C)（C は最大キー）で動作する。
+    重みが整数（整数値の float を含む）のグラフで使用できる。
+    """
+
+    def __init__(self):
+        self.last = 0
+        self.buckets = [[]]   # buckets[i]: last とのXORのビット長が i の要素
+        self.priority = {}    # 要素 → 優先度
+        self.position = {}    # 要素 → (バケット番号, バケット内の位置)
+
+    def __len__(self):
+        return len(self.priority)
+
+    def __bool__(self):
+        return bool(self.priority)
+
+    def __contains__(self, item):
+        return item in self.priority
+
+    def _bucket_index(self, priority):
+        return (int(priority) ^ self.last).bit_length()
+
+    def _insert(self, item, priority):
+        index = self._bucket_index(priority)
+        while len(self.buckets) <= index:
+            self.buckets.append([])
+        bucket = self.buckets[index]
+        self.position[item] = (index, len(bucket))
+        bucket.append(item)
+
+    def _remove(self, item):
+        index, offset = self.position.pop(item)
+        bucket = self.buckets[index]
+        last_item = bucket.pop()
+        if last_item != item:
+            bucket[offset] = last_item
+            self.position[last_item] = (index, offset)
+
+    def push(self, item, priority):
+        """
+        要素を追加する。すでに含まれていれば優先度が小さくなる場合のみ更新
+
+        Returns:
+            bool: 追加または更新した場合は True
+        """
+        if priority != int(priority):
+            raise ValueError(f"RadixHeap のキーは整数である必要があります: {priority}")
+        if priority < self.last:
+            raise ValueError(f"RadixHeap のキーは最後に取り出したキー {self.last} 以上である必要があります")
+        current = self.priority.get(item)
+        if current is not None:
+            if priority >= current:
+                return False
+            self._remove(item)
+        self.priority[item] = priority
+        self._insert(item, priority)
+        return True
+
+    def pop(self):
+        """最小優先度の (priority, item) を取り出す"""
+        if not self.priority:
+            raise IndexError("pop from empty heap")
+        if not self.buckets[0]:
+            # 最初の空でないバケットの最小キーを新しい last にして、要素を振り分け直す
+            index = next(i for i, bucket in enumerate(self.buckets) if bucket)
+            bucket = self.buckets[index]
+            self.buckets[index] = []
+            self.last = int(min(self.priority[item] for item in bucket))
+            for item in bucket:
+                self._insert(item, self.priority[item])
+        item = self.buckets[0].pop()
+        del self.position[item]
+        return self.priority.pop(item), item
+
+
+def main():
+    """
+    メイン実行関数：グリッドグラフで heapq（遅延削除）と各キューを比較
+    """
+    dijkstra_simple = importlib.import_module('23_dijkstra_simple').dijkstra_simple
+    visualization = importlib.import_module('25_graph_visualization')
+
+    print("\n" + "=" * 60)
+    print("優先度キューのベンチマーク（グリッドグラフ）")
+    print("=" * 60)
+
+    queues = [
+        ('heapq（遅延削除）', None),
+        ('インデックス付き4分ヒープ', IndexedDaryHeap),
+        ('基数ヒープ', RadixHeap),
+    ]
+
+    rng = random.Random(0)
+    for size in (50, 100, 200):
+        start, goal = '0,0', f"{size - 1},{size - 1}"
+        # 始点から目標へ到達できる障害物配置になるまで作り直す
+        while True:
+            obstacles = [(x, y) for y in range(size) for x in range(size)
+                         if rng.random() < 0.15 and (x, y) not in ((0, 0), (size - 1, size - 1))]
+            graph = visualization.create_grid_graph(size, size, obstacles)
+            if dijkstra_simple(graph.edges, start, goal, trace=None)[1] != float('inf'):
+                break
+        print(f"\n{size}x{size} グリッド（障害物 {len(obstacles)} マス）")
+
+        print("  dijkstra_simple:")
+        for label, queue in queues:
+            start_time = time.perf_counter()
+            _, cost = dijkstra_simple(graph.edges, start, goal, trace=None, queue=queue)
+            elapsed = time.perf_counter() - start_time
+            print(f"    {label:<16} {elapsed * 1000:8.1f} ms  コスト: {cost}")
+
+        # A*（ユークリッド距離）はキーが整数にならないため基数ヒープは使えない
+        print("  a_star:")
+        for label, queue in queues[:2]:
+            start_time = time.perf_counter()
+            _, cost, explored = visualization.a_star(graph, start, goal, queue=queue)
+            elapsed = time.perf_counter() - start_time
+            print(f"    {label:<16} {elapsed * 1000:8.1f} ms  コスト: {cost}, 取り出し回数: {explored}")
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
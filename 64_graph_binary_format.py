@@ -0,0 +1,321 @@
+"""
+グラフのバイナリファイル形式とメモリマップによる読み込み
+
+このプログラムは、CSR形式のグラフをそのままディスクに書き出す形式を実装します。
+- ヘッダー: マジックナンバー・バージョン・フラグ・ノード数・辺数・名前表の大きさ
+- ノード名表: UTF-8 で連結した名前と、各名前の開始位置（uint64）
+- CSR配列: offsets（int64）, weights（float64）, targets（int32）
+- 座標（任意）: xs, ys（float64）, has_position（uint8）
+- 読み込み: mmap でファイルを写像し、memoryview.cast で配列をコピーせずに参照
+
+道路網を create_*_network() や add_edge で毎回組み立てる代わりに、
+1度書き出したファイルを読み込むだけで 25番の CSRGraph として探索できます。
+読み取り専用の mmap はページキャッシュを共有するため、複数のワーカープロセスが
+同じファイルを読み込んでもグラフのメモリは1つ分で済み、起動も数ミリ秒で終わります。
+
+ファイル内の数値はすべてリトルエンディアンで、各配列の先頭は8バイト境界に揃えます。
+"""
+
+import importlib
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+MAGIC = b'CSRG'
+VERSION = 1
+FLAG_POSITIONS = 1
+
+# マジックナンバー, バージョン, フラグ, ノード数, 辺数, 名前表のバイト数（末尾4バイトは予約）
+HEADER = struct.Struct('<4sIIQQQ4x')
+
+
+def _align(size):
+    """8バイト境界に切り上げ"""
+    return (size + 7) & ~7
+
+
+def _csr_from(graph, positions=None):
+    """Graph / CSRGraph / GridGraph / 辞書のグラフを CSRGraph に変換"""
+    visualization = importlib.import_module('25_graph_visualization')
+    if isinstance(graph, visualization.CSRGraph):
+        return graph
+    if hasattr(graph, 'freeze'):
+        return graph.freeze()
+    if isinstance(graph, visualization.GridGraph):
+        # 通行可能なセルだけを書き出す（セルIDは他の形式と同じく文字列として保存される）
+        graph, positions = graph.edges, graph.positions
+    if not isinstance(graph, Mapping):
+        raise TypeError(f"書き出せないグラフの型です: {type(graph).__name__}"
+                        "（Graph / CSRGraph / GridGraph / 辞書に対応）")
+
+    # 辞書 {ノード: [(隣接ノード, 重み), ...]}（隣接先にしか現れないノードも含める）
+    names = list(graph)
+    index = {name: i for i, name in enumerate(names)}
+    for edges in list(graph.values()):
+        for neighbor, _ in edges:
+            if neighbor not in index:
+                index[neighbor] = len(names)
+                names.append(neighbor)
+
+    offsets = array('q', [0])
+    targets = array('i')
+    weights = array('d')
+    for name in names:
+        for neighbor, weight in graph.get(name, []):
+            targets.append(index[neighbor])
+            weights.append(weight)
+        offsets.append(len(targets))
+
+    xs = array('d', bytes(8 * len(names)))
+    ys = array('d', bytes(8 * len(names)))
+    has_position = bytearray(len(names))
+    for name, (x, y) in (positions or {}).items():
+        i = index.get(name)
+        if i is not None:
+            xs[i], ys[i] = x, y
+            has_position[i] = 1
+    return visualization.CSRGraph(names, offsets, targets, weights, xs, ys, has_position)
+
+
+def _little_endian_bytes(values):
+    """array をリトルエンディアンのバイト列に変換"""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_graph(graph, filename, positions=None):
+    """
+    グラフをバイナリ形式で書き出す
+
+    Args:
+        graph: 25番の Graph / CSRGraph / GridGraph、または辞書 {ノード: [(隣接ノード, 重み), ...]}
+        filename (str): 出力ファイル名
+        positions (dict): 辞書のグラフに付ける座標 {ノード: (x, y)}（省略可）
+
+    Returns:
+        int: 書き出したバイト数
+    """
+    csr = _csr_from(graph, positions)
+    n, m = csr.num_nodes, csr.num_edges
+
+    encoded = [str(name).encode('utf-8') for name in csr.names]
+    name_offsets = array('Q', [0])
+    for name in encoded:
+        name_offsets.append(name_offsets[-1] + len(name))
+    name_blob = b''.join(encoded)
+    with_positions = any(csr.has_position)
+
+    sections = [
+        _little_endian_bytes(name_offsets),
+        name_blob,
+        _little_endian_bytes(array('q', csr.offsets)),
+        _little_endian_bytes(array('d', csr.weights)),
+        _little_endian_bytes(array('i', csr.targets)),
+    ]
+    if with_positions:
+        sections += [
+            _little_endian_bytes(array('d', csr.xs)),
+            _little_endian_bytes(array('d', csr.ys)),
+            bytes(csr.has_position),
+        ]
+
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, FLAG_POSITIONS if with_positions else 0,
+                            n, m, len(name_blob)))
+        for section in sections:
+            f.write(section)
+            f.write(bytes(_align(len(section)) - len(section)))
+        return f.tell()
+
+
+def read_header(buffer):
+    """
+    ヘッダーを読み取って検証する
+
+    Returns:
+        dict: version, flags, num_nodes, num_edges, names_size
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError("グラフファイルが短すぎます")
+    magic, version, flags, num_nodes, num_edges, names_size = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"グラフファイルではありません（マジックナンバー {magic!r}）")
+    if version != VERSION:
+        raise ValueError(f"未対応のバージョンです: {version}")
+    return {'version': version, 'flags': flags, 'num_nodes': num_nodes,
+            'num_edges': num_edges, 'names_size': names_size}
+
+
+def _section(view, position, typecode, count, exported):
+    """
+    position から count 個の配列を切り出し、次の位置とともに返す
+
+    作った memoryview は、閉じるときに解放できるよう exported に追加する。
+    """
+    size = array(typecode).itemsize * count
+    if position + size > len(view):
+        raise ValueError("グラフファイルが途中で切れています")
+    part = view[position:position + size]
+    exported.append(part)
+    if typecode == 'B':
+        values = part
+    elif sys.byteorder == 'little':
+        values = part.cast(typecode)  # コピーせずに型付きの配列として参照
+        exported.append(values)
+    else:
+        values = array(typecode, part.tobytes())
+        values.byteswap()
+    return values, position + _align(size)
+
+
+class _MappedFile:
+    """写像したファイルと、それを参照する memoryview をまとめて解放する"""
+
+    def __init__(self, mapped):
+        self.mapped = mapped
+        self.exported = []
+
+    def close(self):
+        """memoryview を解放してから mmap を閉じる（2回目以降は何もしない）"""
+        while self.exported:
+            self.exported.pop().release()
+        self.mapped.close()
+
+
+def load_graph(filename):
+    """
+    バイナリ形式のグラフをメモリマップで読み込む
+
+    CSR配列と座標はファイルを写像した memoryview のまま参照するためコピーしない。
+    ノード名のみ、名前から整数IDを引く辞書のために文字列へ復元する。
+    返す CSRGraph は mmap を参照し続ける。close() を呼ぶか with 文で使うと
+    写像をすぐに解放する（以後そのグラフは探索できない）。
+
+    Args:
+        filename (str): グラフファイル名
+
+    Returns:
+        CSRGraph: 読み込んだグラフ
+    """
+    CSRGraph = importlib.import_module('25_graph_visualization').CSRGraph
+
+    with open(filename, 'rb') as f:
+        mapped = _MappedFile(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    try:
+        view = memoryview(mapped.mapped)
+        mapped.exported.append(view)
+        header = read_header(view)
+        n, m = header['num_nodes'], header['num_edges']
+
+        position = HEADER.size
+        exported = mapped.exported
+        name_offsets, position = _section(view, position, 'Q', n + 1, exported)
+        name_blob, position = _section(view, position, 'B', header['names_size'], exported)
+        names = [str(name_blob[name_offsets[i]:name_offsets[i + 1]], 'utf-8') for i in range(n)]
+
+        offsets, position = _section(view, position, 'q', n + 1, exported)
+        weights, position = _section(view, position, 'd', m, exported)
+        targets, position = _section(view, position, 'i', m, exported)
+
+        if header['flags'] & FLAG_POSITIONS:
+            xs, position = _section(view, position, 'd', n, exported)
+            ys, position = _section(view, position, 'd', n, exported)
+            has_position, position = _section(view, position, 'B', n, exported)
+        else:
+            xs = ys = array('d')
+            has_position = bytes(n)
+    except BaseException:
+        mapped.close()
+        raise
+
+    graph = CSRGraph(names, offsets, targets, weights, xs, ys, has_position)
+    graph.mapped = mapped  # memoryview が参照している間は mmap を保持し、close() で解放する
+    return graph
+
+
+# ワーカープロセスごとに1度だけ読み込むグラフ
+_worker_graph = None
+
+
+def _init_worker(filename):
+    """ワーカー起動時にグラフファイルを写像する（グラフ本体を送らない）"""
+    global _worker_graph
+    _worker_graph = load_graph(filename)
+
+
+def _worker_query(pair):
+    """ワーカー内で1件の問い合わせを実行"""
+    a_star = importlib.import_module('25_graph_visualization').a_star
+    start, goal = pair
+    return a_star(_worker_graph, start, goal)[1]
+
+
+def main():
+    """
+    メイン実行関数：道路網とグリッドを書き出し、読み込み時間と探索結果を比較
+    """
+    visualization = importlib.import_module('25_graph_visualization')
+    astar_module = importlib.import_module('24_astar_simple')
+    dijkstra_simple = importlib.import_module('23_dijkstra_simple').dijkstra_simple
+
+    print("\n" + "=" * 60)
+    print("グラフのバイナリ形式（CSR配列 + メモリマップ）")
+    print("=" * 60)
+
+    # 1. 座標つきの道路網
+    graph, coordinates = astar_module.create_usa_network_with_coordinates()
+    filename = 'usa_network.csrg'
+    size = write_graph(graph, filename, positions=coordinates)
+    loaded = load_graph(filename)
+    print(f"\nアメリカ主要都市道路網: {loaded.num_nodes} ノード, {loaded.num_edges} 辺, {size} バイト")
+    pairs = [(s, g) for s in graph for g in graph if s != g]
+    mismatches = sum(1 for s, g in pairs
+                     if abs(visualization.dijkstra(loaded, s, g)[1]
+                            - dijkstra_simple(graph, s, g, trace=None)[1]) > 1e-9)
+    print(f"  全 {len(pairs)} ペアでのコストの不一致: {mismatches} 件")
+    loaded.close()
+    os.remove(filename)
+
+    # 2. 大きなグリッドグラフ: 組み立て直す場合と読み込む場合の比較
+    size = 300
+    start_time = time.perf_counter()
+    grid = visualization.create_grid_graph(size, size)
+    build_time = time.perf_counter() - start_time
+    filename = 'grid_graph.csrg'
+    file_size = write_graph(grid, filename)
+
+    start_time = time.perf_counter()
+    loaded = load_graph(filename)
+    load_time = time.perf_counter() - start_time
+    print(f"\n{size}x{size} グリッド: {loaded.num_nodes} ノード, {loaded.num_edges} 辺, "
+          f"{file_size / 1e6:.1f} MB")
+    print(f"  add_edge で組み立て: {build_time * 1000:8.1f} ms")
+    print(f"  mmap で読み込み:     {load_time * 1000:8.1f} ms")
+
+    start, goal = '0,0', f"{size - 1},{size - 1}"
+    print(f"  コストの一致: {visualization.a_star(loaded, start, goal)[1] == visualization.a_star(grid, start, goal)[1]}")
+
+    # 3. ワーカープロセスで同じファイルを共有
+    queries = [(f"{i},0", f"{size - 1 - i},{size - 1}") for i in range(0, size, size // 4)]
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=4, initializer=_init_worker,
+                             initargs=(filename,)) as executor:
+        costs = list(executor.map(_worker_query, queries))
+    elapsed = time.perf_counter() - start_time
+    print(f"  4プロセスで {len(queries)} 件の問い合わせ: {elapsed * 1000:.1f} ms（起動時間を含む）")
+    print(f"  コスト: {costs}")
+
+    loaded.close()
+    os.remove(filename)
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
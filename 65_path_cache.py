@@ -0,0 +1,228 @@
+"""
+最短経路の問い合わせ結果キャッシュ（LRU + グラフの版番号による無効化）
+
+このプログラムは、探索関数の手前に置くキャッシュ層を実装します。
+- キーは (始点, 目標, アルゴリズム名)
+- エントリ数または推定メモリ量の上限を超えたら、最も長く使われていない結果から削除（LRU）
+- 25番の Graph は add_node / add_edge / set_position のたびに version が増えるため、
+  問い合わせ時に版番号が変わっていればキャッシュ全体を自動で破棄
+- ヒット・ミス・削除・無効化の回数を統計として取得可能
+
+同じ都市ペアへの問い合わせが集中する場合、dijkstra_simple や astar_simple を
+毎回実行する代わりに、2回目以降は辞書を1回引くだけで結果を返せます。
+version を持たない辞書のグラフを変更したときは clear() を呼んでください。
+"""
+
+import importlib
+import random
+import sys
+import time
+from collections import OrderedDict
+
+
+def _result_size(result):
+    """探索結果（タプル・経路リスト・ノード名など）のおおよそのバイト数"""
+    size = sys.getsizeof(result)
+    if isinstance(result, (tuple, list)):
+        for item in result:
+            if isinstance(item, (tuple, list)):
+                size += _result_size(item)
+            elif isinstance(item, str):
+                # ノード名の文字列はグラフと共有されるので参照分のみ数える
+                continue
+            else:
+                size += sys.getsizeof(item)
+    return size
+
+
+def _copy_result(result):
+    """呼び出し側が経路リストを書き換えてもキャッシュが壊れないように複製"""
+    if isinstance(result, tuple):
+        return tuple(list(item) if isinstance(item, list) else item for item in result)
+    return result
+
+
+def default_algorithms():
+    """
+    22〜25番の探索関数を (graph, start, goal) で呼べる形にまとめる
+
+    Returns:
+        dict: {アルゴリズム名: 関数}
+    """
+    basic = importlib.import_module('22_dijkstra_basic')
+    simple = importlib.import_module('23_dijkstra_simple')
+    astar = importlib.import_module('24_astar_simple')
+    visualization = importlib.import_module('25_graph_visualization')
+
+    def edges_of(graph):
+        return getattr(graph, 'edges', graph)
+
+    def heuristic_of(graph):
+        return getattr(graph, 'heuristic', lambda node, goal: 0.0)
+
+    return {
+        'dijkstra_basic': lambda g, s, t: basic.dijkstra_basic(edges_of(g), s, t, trace=None),
+        'dijkstra_simple': lambda g, s, t: simple.dijkstra_simple(edges_of(g), s, t, trace=None),
+        'astar_simple': lambda g, s, t: astar.astar_simple(edges_of(g), s, t, heuristic_of(g), trace=None),
+        'dijkstra': visualization.dijkstra,
+        'a_star': visualization.a_star,
+    }
+
+
+class PathCache:
+    """
+    LRU 方式の最短経路キャッシュ
+
+    OrderedDict をアクセス順に並べ、ヒットした結果を末尾へ移動する。
+    上限を超えたら先頭（最も古く使われた結果）から削除する。
+    """
+
+    def __init__(self, graph, max_entries=1024, max_bytes=None, algorithms=None):
+        """
+        Args:
+            graph: 探索対象のグラフ（25番の Graph / CSRGraph / GridGraph または辞書）
+            max_entries (int): 保持する結果の最大数（None で無制限）
+            max_bytes (int): 保持する結果の推定メモリ量の上限（None で無制限）
+            algorithms (dict): {アルゴリズム名: 関数(graph, start, goal)}
+                （省略時は default_algorithms()）
+        """
+        self.graph = graph
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.algorithms = algorithms if algorithms is not None else default_algorithms()
+        self._entries = OrderedDict()  # (start, goal, algorithm) → (結果, バイト数)
+        self._version = getattr(graph, 'version', None)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def query(self, start, goal, algorithm='dijkstra_simple'):
+        """
+        キャッシュを通して最短経路を求める
+
+        Args:
+            start: 始点ノード
+            goal: 目標ノード
+            algorithm (str): algorithms に登録されたアルゴリズム名
+
+        Returns:
+            探索関数の戻り値（経路リストは複製して返す）
+        """
+        if algorithm not in self.algorithms:
+            raise KeyError(f"未登録のアルゴリズムです: {algorithm}")
+
+        version = getattr(self.graph, 'version', None)
+        if version != self._version:
+            # グラフが変更されたので、古い結果はすべて使えない
+            if self._entries:
+                self.invalidations += 1
+            self.clear()
+            self._version = version
+
+        key = (start, goal, algorithm)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return _copy_result(entry[0])
+
+        self.misses += 1
+        result = self.algorithms[algorithm](self.graph, start, goal)
+        size = _result_size(result)
+        self._entries[key] = (result, size)
+        self.total_bytes += size
+        self._evict()
+        return _copy_result(result)
+
+    def _evict(self):
+        """上限を超えている間、最も古く使われた結果を削除"""
+        entries = self._entries
+        while entries and (
+                (self.max_entries is not None and len(entries) > self.max_entries)
+                or (self.max_bytes is not None and self.total_bytes > self.max_bytes)):
+            _, (_, size) = entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """すべての結果を破棄（統計は残す）"""
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        """
+        キャッシュの統計
+
+        Returns:
+            dict: hits, misses, hit_rate, evictions, invalidations, entries, bytes
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+        }
+
+
+def main():
+    """
+    メイン実行関数：偏りのある問い合わせでキャッシュの効果と無効化を確認
+    """
+    graph, _ = importlib.import_module('24_astar_simple').create_usa_network_with_coordinates()
+    visualization = importlib.import_module('25_graph_visualization')
+    cities = list(graph)
+
+    print("\n" + "=" * 60)
+    print("最短経路キャッシュ（LRU + 版番号による無効化）")
+    print("=" * 60)
+
+    # 一部の都市ペアに問い合わせが集中する（ジップ分布に近い）トラフィック
+    rng = random.Random(0)
+    pairs = [(s, g) for s in cities for g in cities if s != g]
+    rng.shuffle(pairs)
+    weights = [1 / (rank + 1) for rank in range(len(pairs))]
+    traffic = rng.choices(pairs, weights=weights, k=5000)
+
+    for label, cache in (('エントリ数 100 まで', PathCache(graph, max_entries=100)),
+                         ('32KB まで', PathCache(graph, max_entries=None, max_bytes=32 * 1024))):
+        start_time = time.perf_counter()
+        for start, goal in traffic:
+            cache.query(start, goal)
+        cached_time = time.perf_counter() - start_time
+        stats = cache.stats()
+        print(f"\n[{label}] {len(traffic)} 件の問い合わせ: {cached_time * 1000:.1f} ms")
+        print(f"  ヒット {stats['hits']}, ミス {stats['misses']}, ヒット率 {stats['hit_rate']:.1%}")
+        print(f"  削除 {stats['evictions']}, 保持 {stats['entries']} 件（約 {stats['bytes']} バイト）")
+
+    dijkstra_simple = importlib.import_module('23_dijkstra_simple').dijkstra_simple
+    start_time = time.perf_counter()
+    for start, goal in traffic:
+        dijkstra_simple(graph, start, goal, trace=None)
+    print(f"\nキャッシュなし: {(time.perf_counter() - start_time) * 1000:.1f} ms")
+
+    # Graph を変更すると版番号が変わり、キャッシュが自動で破棄される
+    print("\n[グラフ変更による無効化]")
+    sample = visualization.create_sample_graph()
+    cache = PathCache(sample)
+    before = cache.query('A', 'T', 'a_star')
+    cache.query('A', 'T', 'a_star')
+    sample.add_edge('A', 'T', 1.0)
+    after = cache.query('A', 'T', 'a_star')
+    stats = cache.stats()
+    print(f"  変更前: コスト {before[1]}, 変更後: コスト {after[1]}")
+    print(f"  ヒット {stats['hits']}, ミス {stats['misses']}, 無効化 {stats['invalidations']} 回")
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+辺の重みの変化に対応する逐次的な最短経路探索（D* Lite / Lifelong Planning A*）
+
+このプログラムは、前回の探索結果を再利用して経路を修復するプランナーを実装します。
+- g（確定した距離）と rhs（隣接ノードから見た1手先の距離）の2つの値を各ノードに持つ
+- g と rhs が食い違うノード（局所的に不整合なノード）だけを優先度キューで処理
+- 辺の重みの変更はまとめて受け付け、影響を受けるノードだけを再計算
+- 目標から始点へ向かって探索するため、移動して始点が変わっても探索を続けられる（D* Lite）
+- 始点を動かさなければ Lifelong Planning A*（LPA*）と同じ動作になる
+
+交通状況で道路の重みが変わるたびに astar_simple を最初から実行すると、
+毎回グラフ全体に近い範囲を探索し直します。変化が一部の区間に限られる場合、
+D* Lite は変化の影響が及ぶノードだけを展開するため、修復が大幅に安くなります。
+
+25番の Graph（無向グラフ）を対象とし、前任ノードは隣接ノードと同じとみなします。
+"""
+
+import heapq
+import importlib
+import random
+import time
+
+
+class DStarLite:
+    """
+    D* Lite による逐次的な経路計画
+
+    - g[node]: 目標から node までの距離の現在の推定値
+    - rhs[node]: min(c(node, s) + g[s])（目標では 0）
+    - km: 始点が移動した分だけヒューリスティックを補正する値
+    ヒューリスティックは h(始点, node) の形で使うため、許容的（過大評価しない）である必要がある。
+    """
+
+    def __init__(self, graph, start, goal, heuristic=None):
+        """
+        Args:
+            graph: 25番の Graph（get_neighbors / update_edge_weight を持つ無向グラフ）
+            start: 始点ノード
+            goal: 目標ノード
+            heuristic: h(node1, node2) の形の関数（省略時は graph.heuristic）
+        """
+        self.graph = graph
+        self.start = start
+        self.goal = goal
+        self.heuristic = heuristic or graph.heuristic
+        self.km = 0.0
+        self._last_start = start
+        self.g = {}
+        self.rhs = {goal: 0.0}
+        self._queue = []     # (キー, ノード) のヒープ（遅延削除）
+        self._queued = {}    # ノード → キューに入っている現在のキー
+        self.expanded = 0    # これまでに展開したノード数の合計
+        self._push(goal, (self.heuristic(start, goal), 0.0))
+
+    def _calculate_key(self, node):
+        best = min(self.g.get(node, float('inf')), self.rhs.get(node, float('inf')))
+        return (best + self.heuristic(self.start, node) + self.km, best)
+
+    def _push(self, node, key):
+        self._queued[node] = key
+        heapq.heappush(self._queue, (key, node))
+
+    def _top(self):
+        """古いエントリを読み飛ばして先頭の (キー, ノード) を返す"""
+        queue = self._queue
+        while queue:
+            key, node = queue[0]
+            if self._queued.get(node) == key:
+                return key, node
+            heapq.heappop(queue)
+        return (float('inf'), float('inf')), None
+
+    def _update_vertex(self, node):
+        """node の rhs を隣接ノードから計算し直し、不整合ならキューに入れる"""
+        inf = float('inf')
+        if node != self.goal:
+            g = self.g
+            self.rhs[node] = min((weight + g.get(neighbor, inf)
+                                  for neighbor, weight in self.graph.get_neighbors(node)),
+                                 default=inf)
+        self._queued.pop(node, None)
+        if self.g.get(node, inf) != self.rhs.get(node, inf):
+            self._push(node, self._calculate_key(node))
+
+    def compute_shortest_path(self):
+        """
+        始点の値が確定するまで不整合なノードを処理する
+
+        Returns:
+            int: 今回展開したノード数
+        """
+        inf = float('inf')
+        g, rhs = self.g, self.rhs
+        expanded = 0
+        while True:
+            top_key, node = self._top()
+            start_key = self._calculate_key(self.start)
+            if node is None or (top_key >= start_key
+                                and rhs.get(self.start, inf) == g.get(self.start, inf)):
+                break
+
+            new_key = self._calculate_key(node)
+            if top_key < new_key:
+                # 始点の移動でキーが古くなっていたので入れ直す
+                self._push(node, new_key)
+                continue
+
+            heapq.heappop(self._queue)
+            del self._queued[node]
+            expanded += 1
+
+            if g.get(node, inf) > rhs.get(node, inf):
+                # 距離が短くなった（過剰に見積もっていた）: 値を確定して隣接ノードへ伝える
+                g[node] = rhs[node]
+                for neighbor, _ in self.graph.get_neighbors(node):
+                    self._update_vertex(neighbor)
+            else:
+                # 距離が長くなった: いったん inf にして自分と隣接ノードを計算し直す
+                g[node] = inf
+                self._update_vertex(node)
+                for neighbor, _ in self.graph.get_neighbors(node):
+                    self._update_vertex(neighbor)
+
+        self.expanded += expanded
+        return expanded
+
+    def path(self):
+        """
+        現在の g 値から始点→目標の経路を取り出す
+
+        Returns:
+            tuple: (経路のリスト, 総コスト)。到達不可能な場合は (None, inf)
+        """
+        inf = float('inf')
+        cost = self.g.get(self.start, inf)
+        if cost == inf:
+            return None, inf
+
+        path = [self.start]
+        node = self.start
+        visited = {node}
+        while node != self.goal:
+            best, best_cost = None, inf
+            for neighbor, weight in self.graph.get_neighbors(node):
+                candidate = weight + self.g.get(neighbor, inf)
+                if candidate < best_cost:
+                    best, best_cost = neighbor, candidate
+            if best is None or best in visited:
+                return None, inf
+            path.append(best)
+            visited.add(best)
+            node = best
+        return path, cost
+
+    def plan(self):
+        """
+        経路を計画（または修復）する
+
+        Returns:
+            tuple: (経路のリスト, 総コスト, 今回展開したノード数)
+        """
+        expanded = self.compute_shortest_path()
+        path, cost = self.path()
+        return path, cost, expanded
+
+    def update_edges(self, changes):
+        """
+        辺の重みの変更をまとめてグラフに反映し、影響を受けるノードを更新する
+
+        Args:
+            changes (list): [(ノード1, ノード2, 新しい重み), ...]
+        """
+        for node1, node2, weight in changes:
+            self.graph.update_edge_weight(node1, node2, weight)
+        # 始点が移動していた場合はキーの補正値を進める
+        self.km += self.heuristic(self._last_start, self.start)
+        self._last_start = self.start
+        touched = set()
+        for node1, node2, _ in changes:
+            touched.add(node1)
+            touched.add(node2)
+        for node in touched:
+            self._update_vertex(node)
+
+    def move_start(self, start):
+        """始点を移動する（経路に沿って進んだ場合など）"""
+        self.start = start
+
+
+def main():
+    """
+    メイン実行関数：グリッド状の道路網で渋滞による重みの変化を修復
+    """
+    visualization = importlib.import_module('25_graph_visualization')
+    astar_simple = importlib.import_module('24_astar_simple').astar_simple
+
+    print("\n" + "=" * 60)
+    print("逐次的な経路修復（D* Lite）")
+    print("=" * 60)
+
+    size = 60
+    rng = random.Random(0)
+    obstacles = [(x, y) for y in range(size) for x in range(size)
+                 if rng.random() < 0.2 and (x, y) not in ((0, 0), (size - 1, size - 1))]
+    graph = visualization.create_grid_graph(size, size, obstacles)
+    start, goal = '0,0', f"{size - 1},{size - 1}"
+
+    planner = DStarLite(graph, start, goal)
+    start_time = time.perf_counter()
+    path, cost, expanded = planner.plan()
+    print(f"\n{size}x{size} グリッド（障害物 {len(obstacles)} マス）")
+    print(f"初回の計画: コスト {cost}, 展開ノード数 {expanded}, "
+          f"{(time.perf_counter() - start_time) * 1000:.1f} ms")
+
+    for step in range(5):
+        # 経路上の一部区間で渋滞が発生（重みが5倍になる）
+        # あわせて始点を経路に沿って数マス進める
+        planner.move_start(path[3])
+        path = path[3:]
+        i = rng.randrange(len(path) // 3, 2 * len(path) // 3)
+        changes = [(u, v, 5.0) for u, v in zip(path[i:i + 4], path[i + 1:i + 5])]
+
+        start_time = time.perf_counter()
+        planner.update_edges(changes)
+        path, cost, expanded = planner.plan()
+        repair_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        trace = importlib.import_module('22_dijkstra_basic').SearchTrace()
+        _, expected = astar_simple(graph.edges, planner.start, goal, graph.heuristic, trace=trace)
+        full_time = time.perf_counter() - start_time
+
+        print(f"\n[{step + 1}] 渋滞 {len(changes)} 区間、現在地 {planner.start}")
+        print(f"  D* Lite 修復:       コスト {cost:6.1f}, 展開 {expanded:5} ノード, {repair_time * 1000:7.1f} ms")
+        print(f"  astar_simple 再計算: コスト {expected:6.1f}, 展開 {trace.count('pop'):5} ノード, "
+              f"{full_time * 1000:7.1f} ms")
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
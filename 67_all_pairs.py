@@ -0,0 +1,313 @@
+"""
+全点対最短経路（All-Pairs Shortest Paths）の前計算と表引き
+
+このプログラムは、全ノード間の距離表と経路復元用の直前ノード表を前計算します。
+- Floyd–Warshall 法: 中継ノード k ごとに行列全体を NumPy のブロードキャストで一括更新（密なグラフ向け）
+- Johnson 法: Bellman–Ford 法で重みを非負に付け替え、出発地ごとのダイクストラ法を
+  プロセスプールで並列実行（疎なグラフ向け、負の重みにも対応）
+- 直前ノード表（predecessor matrix）からの経路復元
+- AllPairsTable: 前計算した表で問い合わせに答え、.npz ファイルに保存・読み込み
+
+22〜24番の日本・ヨーロッパ・アメリカの道路網のような数十〜数千ノードのグラフでは、
+全点対の表を1度作っておけば、問い合わせは探索なしの表引きで済みます。
+Floyd–Warshall 法は O(n^3)、Johnson 法は O(n m log n) なので、
+辺の少ない大きなグラフでは Johnson 法の方が速くなります。
+"""
+
+import importlib
+import os
+import time
+
+from process_pool import map_chunks
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _require_numpy(name):
+    if np is None:
+        raise ImportError(f"{name} には NumPy が必要です（pip install numpy）")
+
+
+def _index_graph(graph):
+    """
+    グラフをノード名のリストと整数インデックスの隣接リストに変換
+
+    Returns:
+        tuple: (ノード名のリスト, [[(隣接インデックス, 重み), ...], ...])
+    """
+    graph = getattr(graph, 'edges', graph)
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    for edges in list(graph.values()):
+        for neighbor, _ in edges:
+            if neighbor not in index:
+                index[neighbor] = len(nodes)
+                nodes.append(neighbor)
+    adjacency = [[(index[neighbor], weight) for neighbor, weight in graph.get(node, [])]
+                 for node in nodes]
+    return nodes, adjacency
+
+
+class AllPairsTable:
+    """
+    前計算した全点対の距離表と直前ノード表
+
+    - distances[i][j]: nodes[i] から nodes[j] への最短距離（到達不可能は inf）
+    - predecessors[i][j]: nodes[i] からの最短経路で nodes[j] の直前のノード番号（なしは -1）
+    """
+
+    def __init__(self, nodes, distances, predecessors):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.distances = distances
+        self.predecessors = predecessors
+
+    def distance(self, start, goal):
+        """表引きで最短距離を返す"""
+        i, j = self.index.get(start), self.index.get(goal)
+        if i is None or j is None:
+            return float('inf')
+        return float(self.distances[i][j])
+
+    def path(self, start, goal):
+        """
+        直前ノード表をたどって最短経路を復元
+
+        Returns:
+            tuple: (最短経路のリスト, 総コスト)。到達不可能な場合は ([], inf)
+        """
+        cost = self.distance(start, goal)
+        if cost == float('inf'):
+            return [], cost
+        i, j = self.index[start], self.index[goal]
+        row = self.predecessors[i]
+        path = [j]
+        while path[-1] != i:
+            path.append(int(row[path[-1]]))
+        path.reverse()
+        return [self.nodes[k] for k in path], cost
+
+    def save(self, filename):
+        """距離表と直前ノード表を .npz ファイルに保存"""
+        _require_numpy('AllPairsTable.save')
+        np.savez_compressed(filename, nodes=np.array(self.nodes, dtype=str),
+                            distances=np.asarray(self.distances, dtype=float),
+                            predecessors=np.asarray(self.predecessors, dtype=np.int32))
+
+    @classmethod
+    def load(cls, filename):
+        """.npz ファイルから読み込み"""
+        _require_numpy('AllPairsTable.load')
+        with np.load(filename) as data:
+            return cls(data['nodes'].tolist(), data['distances'], data['predecessors'])
+
+
+def floyd_warshall(graph):
+    """
+    NumPy でベクトル化した Floyd–Warshall 法
+
+    中継ノード k について、全ペア (i, j) の「i → k → j」を
+    列 D[:, k] と行 D[k, :] のブロードキャストで一度に計算し、短くなった要素だけ更新する。
+    Python のループは k の n 回だけになる。
+
+    Args:
+        graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}（25番の Graph も可）
+
+    Returns:
+        AllPairsTable: 全点対の距離表
+
+    Raises:
+        ValueError: 負の閉路がある場合
+    """
+    _require_numpy('floyd_warshall')
+    nodes, adjacency = _index_graph(graph)
+    n = len(nodes)
+
+    distances = np.full((n, n), np.inf)
+    predecessors = np.full((n, n), -1, dtype=np.int32)
+    for u, edges in enumerate(adjacency):
+        for v, weight in edges:
+            if weight < distances[u, v]:
+                distances[u, v] = weight
+                predecessors[u, v] = u
+    for i in range(n):
+        if distances[i, i] > 0:
+            distances[i, i] = 0
+            predecessors[i, i] = -1
+
+    # 作業用の配列は1度だけ確保し、各反復では上書きする
+    via = np.empty((n, n))
+    better = np.empty((n, n), dtype=bool)
+    for k in range(n):
+        np.add(distances[:, k, None], distances[None, k, :], out=via)
+        np.less(via, distances, out=better)
+        if better.any():
+            np.copyto(distances, via, where=better)
+            # i → k → j の経路では、j の直前ノードは k からの経路での直前ノードと同じ
+            np.copyto(predecessors, predecessors[k].copy()[None, :], where=better)
+
+    if (np.diag(distances) < 0).any():
+        raise ValueError("負の閉路があるため最短経路が定まりません")
+    return AllPairsTable(nodes, distances, predecessors)
+
+
+def _bellman_ford_potentials(adjacency):
+    """
+    全ノードへ重み0の辺を張った仮想ノードからの Bellman–Ford 法でポテンシャルを求める
+
+    Raises:
+        ValueError: 負の閉路がある場合
+    """
+    n = len(adjacency)
+    potential = [0.0] * n  # 仮想ノードから各ノードへの距離（初期値は直接の辺の 0）
+    for _ in range(n):
+        changed = False
+        for u, edges in enumerate(adjacency):
+            pu = potential[u]
+            for v, weight in edges:
+                if pu + weight < potential[v]:
+                    potential[v] = pu + weight
+                    changed = True
+        if not changed:
+            return potential
+    raise ValueError("負の閉路があるため最短経路が定まりません")
+
+
+def _reweight(adjacency, potential):
+    """重みを w'(u, v) = w(u, v) + h(u) - h(v) ≥ 0 に付け替えた {ノード番号: [(隣接番号, 重み), ...]}"""
+    return {u: [(v, weight + potential[u] - potential[v]) for v, weight in edges]
+            for u, edges in enumerate(adjacency)}
+
+
+def _dijkstra_row(state, source):
+    """付け替えた非負の重みで source から全ノードへのダイクストラ法を実行し、距離と直前ノードの行を返す"""
+    reweighted, potential = state
+    distances, previous_nodes = \
+        importlib.import_module('23_dijkstra_simple').dijkstra_distances(reweighted, source)
+    # 元の重みでの距離に戻す: d(s, v) = d'(s, v) - h(s) + h(v)
+    inf = float('inf')
+    ps = potential[source]
+    row = [distances[v] - ps + potential[v] if v in distances else inf for v in range(len(potential))]
+    predecessors = [-1 if previous_nodes.get(v) is None else previous_nodes[v] for v in range(len(potential))]
+    return row, predecessors
+
+
+def johnson(graph, processes=None, chunk_size=None):
+    """
+    Johnson 法による全点対最短経路
+
+    Bellman–Ford 法で求めたポテンシャル h で重みを w + h(u) - h(v) に付け替えると
+    すべての重みが非負になるため、出発地ごとにダイクストラ法を使える。
+    出発地は塊に分けてプロセスプールで並列に処理する（process_pool.map_chunks、
+    processes=1 なら同じプロセスで実行）。
+
+    Args:
+        graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}（25番の Graph も可）
+        processes (int): ワーカープロセス数（省略時は CPU コア数）
+        chunk_size (int): 1タスクあたりの出発地数（省略時はワーカー数から自動決定）
+
+    Returns:
+        AllPairsTable: 全点対の距離表（NumPy があれば配列、なければリストで保持）
+
+    Raises:
+        ValueError: 負の閉路がある場合
+    """
+    nodes, adjacency = _index_graph(graph)
+    n = len(nodes)
+    potential = _bellman_ford_potentials(adjacency)
+    reweighted = _reweight(adjacency, potential)
+
+    rows = map_chunks(_dijkstra_row, range(n), (reweighted, potential), processes, chunk_size)
+
+    distances = [row for row, _ in rows]
+    predecessors = [pred for _, pred in rows]
+    if np is not None:
+        distances = np.array(distances, dtype=float).reshape(n, n)
+        predecessors = np.array(predecessors, dtype=np.int32).reshape(n, n)
+    return AllPairsTable(nodes, distances, predecessors)
+
+
+def main():
+    """
+    メイン実行関数：3つの道路網で全点対の表を作り、オンライン探索と比較
+    """
+    dijkstra_simple = importlib.import_module('23_dijkstra_simple').dijkstra_simple
+    networks = [
+        ('日本主要都市道路網', importlib.import_module('22_dijkstra_basic').create_japan_road_network()),
+        ('ヨーロッパ主要都市鉄道網', importlib.import_module('23_dijkstra_simple').create_europe_network()),
+        ('アメリカ主要都市道路網', importlib.import_module('24_astar_simple').create_usa_network_with_coordinates()[0]),
+    ]
+
+    for title, graph in networks:
+        print("\n" + "=" * 60)
+        print(f"全点対最短経路: {title}")
+        print("=" * 60)
+
+        methods = []
+        if np is not None:
+            methods.append(('Floyd–Warshall 法（NumPy）', lambda: floyd_warshall(graph)))
+        else:
+            print("NumPy がインストールされていないため、Floyd–Warshall 法はスキップしました")
+        methods.append(('Johnson 法（2プロセス）', lambda: johnson(graph, processes=2)))
+
+        pairs = [(s, g) for s in graph for g in graph if s != g]
+        start_time = time.perf_counter()
+        expected = [dijkstra_simple(graph, s, g, trace=None)[1] for s, g in pairs]
+        online_time = time.perf_counter() - start_time
+
+        for label, build in methods:
+            start_time = time.perf_counter()
+            table = build()
+            build_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            results = [table.path(s, g) for s, g in pairs]
+            lookup_time = time.perf_counter() - start_time
+            mismatches = sum(1 for (_, cost), exp in zip(results, expected) if abs(cost - exp) > 1e-9)
+            print(f"\n{label}")
+            print(f"  前計算: {build_time * 1000:.1f} ms（{len(table.nodes)} ノード）")
+            print(f"  全 {len(pairs)} ペアの経路復元: {lookup_time * 1000:.1f} ms"
+                  f"（オンライン探索 {online_time * 1000:.1f} ms）")
+            print(f"  コストの不一致: {mismatches} 件")
+
+        start_city, goal_city = pairs[0][0], pairs[-1][0]
+        path, cost = table.path(start_city, goal_city)
+        print(f"\n例: {start_city} → {goal_city}")
+        print(f"  最短経路: {' → '.join(path)}")
+        print(f"  コスト: {cost}")
+
+    # 疎な大きいグラフでは Johnson 法が有利
+    grid = importlib.import_module('25_graph_visualization').create_grid_graph(30, 30)
+    print("\n" + "=" * 60)
+    print(f"疎なグラフ: 30x30 グリッド（{len(grid.edges)} ノード）")
+    print("=" * 60)
+    timings = []
+    if np is not None:
+        start_time = time.perf_counter()
+        fw_table = floyd_warshall(grid)
+        timings.append(('Floyd–Warshall 法（NumPy）', time.perf_counter() - start_time))
+    start_time = time.perf_counter()
+    johnson_table = johnson(grid)
+    timings.append((f"Johnson 法（{os.cpu_count() or 1}プロセス）", time.perf_counter() - start_time))
+    for label, elapsed in timings:
+        print(f"  {label}: {elapsed * 1000:.1f} ms")
+    if np is not None:
+        print(f"  結果の一致: {bool(np.allclose(fw_table.distances, johnson_table.distances))}")
+
+    # 負の重みを含むグラフ（Johnson 法は Bellman–Ford 法で重みを付け替えて対応）
+    print("\n" + "=" * 60)
+    print("負の重みを含むグラフ")
+    print("=" * 60)
+    graph = {'A': [('B', 4), ('C', 2)], 'B': [('D', -3)], 'C': [('B', 1), ('D', 5)], 'D': []}
+    table = johnson(graph, processes=1)
+    path, cost = table.path('A', 'D')
+    print(f"A → D: {' → '.join(path)}（コスト {cost}）")
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
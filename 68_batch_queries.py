@@ -0,0 +1,139 @@
+"""
+多数の始点・目標ペアに対する A* の並列バッチ実行
+
+このプログラムは、(始点, 目標) のリストをまとめて処理するバッチ API を実装します。
+- ProcessPoolExecutor で問い合わせを塊に分けて複数コアに配分（process_pool.map_chunks）
+- グラフはワーカーごとに1度だけ、プールの initializer で渡す（タスクごとに pickle しない。
+  fork で起動する環境では pickle もせずに引き継ぐ）
+  - 64番のバイナリファイル名を渡すと、各ワーカーが mmap で同じファイルを共有
+- 結果は入力と同じ順序で、1件ごとの所要時間と探索ノード数つきで返す
+
+24番の main() や compare_search_visualization は1件ずつ探索しますが、
+問い合わせが独立していれば、コア数に応じてスループットを伸ばせます。
+"""
+
+import importlib
+import multiprocessing
+import multiprocessing.util
+import os
+import random
+import time
+
+from process_pool import map_chunks
+
+ALGORITHMS = ('a_star', 'dijkstra')
+
+
+def _load_graph(state):
+    """
+    ワーカー起動時にグラフファイルを mmap で読み込む
+
+    写像はワーカーの終了時（同じプロセスで実行した場合はグラフが不要になった時点）に解放する。
+    """
+    filename, algorithm = state
+    graph = importlib.import_module('64_graph_binary_format').load_graph(filename)
+    multiprocessing.util.Finalize(graph, graph.mapped.close, exitpriority=0)
+    return graph, algorithm
+
+
+def _run_query(state, pair):
+    """
+    ワーカー内で1件の問い合わせを処理
+
+    Returns:
+        tuple: (経路, コスト, 探索ノード数, 秒)
+    """
+    graph, algorithm = state
+    search = getattr(importlib.import_module('25_graph_visualization'), algorithm)
+    start_time = time.perf_counter()
+    path, cost, explored = search(graph, *pair)
+    return path, cost, explored, time.perf_counter() - start_time
+
+
+def run_batch(graph, pairs, algorithm='a_star', processes=None, chunk_size=None):
+    """
+    始点・目標ペアのリストを並列に探索
+
+    Args:
+        graph: 25番の Graph / CSRGraph / GridGraph、または 64番のグラフファイル名
+        pairs (list): [(始点, 目標), ...]
+        algorithm (str): 'a_star' または 'dijkstra'（25番の関数）
+        processes (int): ワーカープロセス数（省略時は CPU コア数、1 なら同じプロセスで実行）
+        chunk_size (int): 1タスクあたりの問い合わせ数（省略時はワーカー数から自動決定）
+
+    Returns:
+        list: pairs と同じ順序の (経路, コスト, 探索ノード数, 所要秒数)
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"algorithm は {ALGORITHMS} のいずれかです: {algorithm}")
+
+    setup = _load_graph if isinstance(graph, str) else None
+    return map_chunks(_run_query, pairs, (graph, algorithm), processes, chunk_size, setup=setup)
+
+
+def summarize(results, elapsed):
+    """
+    バッチ結果の集計
+
+    Args:
+        results (list): run_batch の戻り値
+        elapsed (float): バッチ全体の所要秒数
+
+    Returns:
+        dict: queries, qps, found, explored, mean_ms, max_ms
+    """
+    times = [seconds for _, _, _, seconds in results]
+    return {
+        'queries': len(results),
+        'qps': len(results) / elapsed if elapsed > 0 else float('inf'),
+        'found': sum(1 for path, _, _, _ in results if path is not None),
+        'explored': sum(explored for _, _, explored, _ in results),
+        'mean_ms': sum(times) / len(times) * 1000 if times else 0.0,
+        'max_ms': max(times) * 1000 if times else 0.0,
+    }
+
+
+def main():
+    """
+    メイン実行関数：大きなグリッドで逐次実行とプロセス数ごとの並列実行を比較
+    """
+    visualization = importlib.import_module('25_graph_visualization')
+
+    print("\n" + "=" * 60)
+    print("A* の並列バッチ実行")
+    print("=" * 60)
+
+    size = 200
+    rng = random.Random(0)
+    obstacles = {(x, y) for y in range(size) for x in range(size) if rng.random() < 0.2}
+    grid = visualization.GridGraph(size, size, obstacles, diagonal=True)
+    free = [cell for cell in range(grid.num_nodes) if not grid.blocked[cell]]
+    pairs = [tuple(rng.sample(free, 2)) for _ in range(200)]
+    print(f"{size}x{size} グリッド（8近傍、障害物 {len(obstacles)} マス）, {len(pairs)} 件の問い合わせ")
+    print(f"CPU コア数: {os.cpu_count()}, 起動方式: {multiprocessing.get_start_method()}")
+
+    baseline = None
+    for processes in sorted({1, 2, os.cpu_count() or 1}):
+        start_time = time.perf_counter()
+        results = run_batch(grid, pairs, processes=processes)
+        elapsed = time.perf_counter() - start_time
+        stats = summarize(results, elapsed)
+        if baseline is None:
+            baseline = results
+        same = all(abs(a[1] - b[1]) < 1e-9 or a[1] == b[1] for a, b in zip(results, baseline))
+        print(f"\n{processes} プロセス: {elapsed * 1000:.1f} ms, {stats['qps']:.1f} 件/秒")
+        print(f"  到達 {stats['found']} 件, 探索ノード数 合計 {stats['explored']}, "
+              f"1件あたり 平均 {stats['mean_ms']:.2f} ms / 最大 {stats['max_ms']:.2f} ms")
+        print(f"  逐次実行と同じコスト: {same}")
+
+    # 最初の数件の結果（入力と同じ順序）
+    print("\n先頭5件:")
+    for (start, goal), (path, cost, explored, seconds) in zip(pairs[:5], baseline[:5]):
+        print(f"  {grid.cell_xy(start)} → {grid.cell_xy(goal)}: コスト {cost:.2f}, "
+              f"探索 {explored} ノード, {seconds * 1000:.2f} ms")
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+経路探索のベンチマークスイート（合成グラフ生成器つき）
+
+このプログラムは、探索関数を大きなグラフで計測し、結果を JSON で出力します。
+- 生成器: ランダム幾何グラフ・障害物密度を指定できるグリッド迷路・スケールフリーグラフ
+  （Barabási–Albert モデル）を 1e3〜1e6 ノードで生成
+- 対象: dijkstra_basic（22）, dijkstra_simple（23）, astar_simple（24）, dijkstra / a_star（25）
+- 指標: 1秒あたりの問い合わせ数、確定（展開）ノード数、tracemalloc によるピークメモリ、
+  レイテンシのパーセンタイル（p50 / p90 / p99 / 最大）
+
+09_performance_analysis.py の measure_time は実行時間を表示するだけですが、
+このスイートは同じ条件の結果を JSON に保存するため、変更前後を比べて
+性能の劣化（リグレッション）を見つけられます。
+
+使い方:
+    python 69_benchmark_suite.py --generators grid geometric --sizes 1000 10000 --output bench.json
+"""
+
+import argparse
+import importlib
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+
+def random_geometric_graph(num_nodes, radius=None, seed=None):
+    """
+    ランダム幾何グラフ: 単位正方形に点を置き、距離 radius 以内の点同士を結ぶ
+
+    点をマス目（大きさ radius）に振り分けて近傍のマスだけを調べるため O(n) で生成できる。
+    辺の重みはユークリッド距離なので、ユークリッド距離のヒューリスティックは許容的。
+
+    Args:
+        num_nodes (int): ノード数
+        radius (float): 接続半径（省略時は平均次数が 1.5 ln n 程度になる sqrt(1.5 ln n / (π n))）
+        seed (int): 乱数シード
+
+    Returns:
+        Graph: 25番の Graph（座標つき）
+    """
+    Graph = importlib.import_module('25_graph_visualization').Graph
+    rng = random.Random(seed)
+    if radius is None:
+        radius = math.sqrt(1.5 * math.log(max(num_nodes, 2)) / (math.pi * max(num_nodes, 1)))
+
+    graph = Graph()
+    points = [(rng.random(), rng.random()) for _ in range(num_nodes)]
+    cells = {}
+    for i, (x, y) in enumerate(points):
+        graph.set_position(str(i), x, y)
+        graph.add_node(str(i))
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(i)
+
+    for (cx, cy), members in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                others = cells.get((cx + dx, cy + dy))
+                if not others:
+                    continue
+                for i in members:
+                    xi, yi = points[i]
+                    for j in others:
+                        if j <= i:
+                            continue
+                        distance = math.hypot(xi - points[j][0], yi - points[j][1])
+                        if distance <= radius:
+                            graph.add_edge(str(i), str(j), distance)
+    return graph
+
+
+def grid_maze_graph(num_nodes, obstacle_density=0.2, seed=None):
+    """
+    障害物をランダムに置いた正方形のグリッド迷路
+
+    Args:
+        num_nodes (int): おおよそのセル数（一辺は sqrt(num_nodes) を切り上げ）
+        obstacle_density (float): 障害物にするセルの割合（0〜1）
+        seed (int): 乱数シード
+
+    Returns:
+        Graph: 25番の create_grid_graph によるグラフ（ノード名 "x,y"）
+    """
+    if num_nodes < 1:
+        raise ValueError(f"num_nodes は 1 以上にしてください: {num_nodes}")
+    create_grid_graph = importlib.import_module('25_graph_visualization').create_grid_graph
+    rng = random.Random(seed)
+    size = max(2, math.isqrt(num_nodes - 1) + 1)
+    obstacles = [(x, y) for y in range(size) for x in range(size) if rng.random() < obstacle_density]
+    return create_grid_graph(size, size, obstacles)
+
+
+def scale_free_graph(num_nodes, edges_per_node=2, seed=None):
+    """
+    スケールフリーグラフ（Barabási–Albert モデルの優先的選択）
+
+    新しいノードは、次数に比例した確率で既存ノードと edges_per_node 本の辺を結ぶ。
+    次数に比例した選択は「辺の端点をすべて並べたリスト」から一様に選ぶことで O(1) で行う。
+    座標は一様乱数で与え、辺の重みはそのユークリッド距離とする。
+
+    Args:
+        num_nodes (int): ノード数
+        edges_per_node (int): 新しいノードが張る辺の数
+        seed (int): 乱数シード
+
+    Returns:
+        Graph: 25番の Graph（座標つき）
+    """
+    Graph = importlib.import_module('25_graph_visualization').Graph
+    rng = random.Random(seed)
+    graph = Graph()
+    points = [(rng.random(), rng.random()) for _ in range(num_nodes)]
+    for i, (x, y) in enumerate(points):
+        graph.set_position(str(i), x, y)
+        graph.add_node(str(i))
+
+    def connect(i, j):
+        distance = math.hypot(points[i][0] - points[j][0], points[i][1] - points[j][1])
+        graph.add_edge(str(i), str(j), distance)
+
+    initial = min(num_nodes, edges_per_node + 1)
+    endpoints = []
+    for i in range(initial):
+        for j in range(i):
+            connect(i, j)
+            endpoints += (i, j)
+    for i in range(initial, num_nodes):
+        targets = set()
+        while len(targets) < edges_per_node:
+            targets.add(rng.choice(endpoints) if endpoints else rng.randrange(i))
+        for j in targets:
+            connect(i, j)
+            endpoints += (i, j)
+    return graph
+
+
+GENERATORS = {
+    'geometric': random_geometric_graph,
+    'grid': grid_maze_graph,
+    'scalefree': scale_free_graph,
+}
+
+
+class _SettledCounter:
+    """
+    指定したイベントのノードを重複なしで数える軽量なトレース（SearchTrace のように全イベントは記録しない）
+
+    同じノードが何度通知されても1回と数えるため、どの探索関数でも「確定したノードの数」になる。
+    """
+
+    def __init__(self, event):
+        self.event = event
+        self.nodes = set()
+
+    def __call__(self, event, **fields):
+        if event == self.event:
+            self.nodes.add(fields['node'])
+
+    @property
+    def count(self):
+        return len(self.nodes)
+
+
+def _algorithms():
+    """
+    計測対象の探索関数を共通の形 search(graph, start, goal) -> (コスト, 確定ノード数) にまとめる
+
+    確定ノード数はすべての関数で「取り出して展開した異なるノードの数」とし、
+    遅延削除で読み飛ばした古いエントリや同じノードの再展開は数えない
+    （22番は 'select'、23・24番は 'pop' イベント、25番は expanded のノード）。
+    """
+    basic = importlib.import_module('22_dijkstra_basic').dijkstra_basic
+    simple = importlib.import_module('23_dijkstra_simple').dijkstra_simple
+    astar = importlib.import_module('24_astar_simple').astar_simple
+    visualization = importlib.import_module('25_graph_visualization')
+
+    def traced(search, event, extra=lambda graph: ()):
+        def run(graph, start, goal):
+            counter = _SettledCounter(event)
+            result = search(graph.edges, start, goal, *extra(graph), trace=counter)
+            return result[1], counter.count
+        return run
+
+    def returned(search):
+        def run(graph, start, goal):
+            expanded = []
+            _, cost, _ = search(graph, start, goal, expanded=expanded)
+            return cost, len(set(expanded))
+        return run
+
+    return {
+        'dijkstra_basic': traced(basic, 'select'),
+        'dijkstra_simple': traced(simple, 'pop'),
+        'astar_simple': traced(astar, 'pop', lambda graph: (graph.heuristic,)),
+        'dijkstra': returned(visualization.dijkstra),
+        'a_star': returned(visualization.a_star),
+    }
+
+
+# dijkstra_basic は未訪問ノードを毎回全走査する O(n^2) の実装なので、既定ではこの大きさまで
+BASIC_MAX_NODES = 5000
+
+
+def percentile(sorted_values, q):
+    """昇順に並んだ値の q パーセンタイル（最近傍順位法）"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def benchmark_algorithm(search, graph, pairs, memory_queries=3):
+    """
+    1つの探索関数を問い合わせのリストで計測
+
+    実行時間は tracemalloc なしで計測し、ピークメモリは先頭の数件だけ
+    tracemalloc を有効にして別に計測する（tracemalloc は実行を大きく遅くするため）。
+
+    Returns:
+        dict: queries, qps, found, settled_total, settled_mean, peak_memory_bytes, latency_ms
+    """
+    latencies = []
+    settled = []
+    found = 0
+    start_time = time.perf_counter()
+    for start, goal in pairs:
+        query_start = time.perf_counter()
+        cost, count = search(graph, start, goal)
+        latencies.append(time.perf_counter() - query_start)
+        settled.append(count)
+        if cost != float('inf'):
+            found += 1
+    elapsed = time.perf_counter() - start_time
+
+    tracemalloc.start()
+    peak = 0
+    for start, goal in pairs[:memory_queries]:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        search(graph, start, goal)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'queries': len(pairs),
+        'qps': len(pairs) / elapsed if elapsed > 0 else None,
+        'found': found,
+        'settled_total': sum(settled),
+        'settled_mean': sum(settled) / len(settled) if settled else 0.0,
+        'peak_memory_bytes': peak,
+        'latency_ms': {
+            'p50': percentile(latencies, 50) * 1000,
+            'p90': percentile(latencies, 90) * 1000,
+            'p99': percentile(latencies, 99) * 1000,
+            'max': latencies[-1] * 1000 if latencies else 0.0,
+        },
+    }
+
+
+def run_suite(generators, sizes, algorithms=None, queries=20, seed=0,
+              obstacle_density=0.2, basic_max_nodes=BASIC_MAX_NODES, log=print):
+    """
+    生成器 × ノード数 × 探索関数 の組み合わせを計測
+
+    Args:
+        generators (list): GENERATORS のキー
+        sizes (list): ノード数のリスト
+        algorithms (list): 探索関数名（省略時はすべて）
+        queries (int): グラフごとの問い合わせ数（同じ組をすべての探索関数で使う）
+        seed (int): 乱数シード
+        obstacle_density (float): グリッド迷路の障害物密度
+        basic_max_nodes (int): dijkstra_basic を実行する最大ノード数
+        log: 進捗表示用の関数（None で表示しない）
+
+    Returns:
+        dict: JSON に変換できる計測結果
+    """
+    available = _algorithms()
+    names = list(algorithms or available)
+    for name in names:
+        if name not in available:
+            raise ValueError(f"未知の探索関数です: {name}（{', '.join(available)}）")
+
+    results = []
+    for generator in generators:
+        for size in sizes:
+            options = {'obstacle_density': obstacle_density} if generator == 'grid' else {}
+            start_time = time.perf_counter()
+            graph = GENERATORS[generator](size, seed=seed, **options)
+            build_seconds = time.perf_counter() - start_time
+            nodes = list(graph.edges)
+            num_edges = sum(len(edges) for edges in graph.edges.values())
+            rng = random.Random(seed)
+            pairs = [tuple(rng.sample(nodes, 2)) for _ in range(queries)] if len(nodes) >= 2 else []
+            if log:
+                log(f"{generator} n={len(nodes)} m={num_edges}（生成 {build_seconds:.2f} 秒）")
+
+            for name in names:
+                if name == 'dijkstra_basic' and len(nodes) > basic_max_nodes:
+                    if log:
+                        log(f"  {name:<16} スキップ（O(n^2) のため {basic_max_nodes} ノードまで）")
+                    continue
+                record = benchmark_algorithm(available[name], graph, pairs)
+                record.update({'generator': generator, 'nodes': len(nodes), 'edges': num_edges,
+                               'algorithm': name, 'build_seconds': build_seconds})
+                results.append(record)
+                if log:
+                    log(f"  {name:<16} {record['qps'] or 0:10.1f} 件/秒  "
+                        f"確定 {record['settled_mean']:10.1f}  "
+                        f"p50 {record['latency_ms']['p50']:9.2f} ms  "
+                        f"p99 {record['latency_ms']['p99']:9.2f} ms  "
+                        f"メモリ {record['peak_memory_bytes'] / 1024:9.1f} KB")
+
+    return {
+        'config': {'generators': list(generators), 'sizes': list(sizes), 'algorithms': names,
+                   'queries': queries, 'seed': seed, 'obstacle_density': obstacle_density},
+        'environment': {'python': sys.version.split()[0], 'platform': platform.platform()},
+        'results': results,
+    }
+
+
+def main(argv=None):
+    """
+    メイン実行関数：コマンドライン引数で条件を指定して計測し、JSON を出力
+    """
+    parser = argparse.ArgumentParser(description="経路探索のベンチマークスイート")
+    parser.add_argument('--generators', nargs='+', choices=sorted(GENERATORS),
+                        default=['geometric', 'grid', 'scalefree'], help="グラフ生成器")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000],
+                        help="ノード数（例: 1000 10000 100000 1000000）")
+    parser.add_argument('--algorithms', nargs='+', default=None,
+                        help="探索関数（省略時はすべて）")
+    parser.add_argument('--queries', type=int, default=20, help="グラフごとの問い合わせ数")
+    parser.add_argument('--seed', type=int, default=0, help="乱数シード")
+    parser.add_argument('--obstacle-density', type=float, default=0.2,
+                        help="グリッド迷路の障害物密度（0〜1）")
+    parser.add_argument('--basic-max-nodes', type=int, default=BASIC_MAX_NODES,
+                        help="dijkstra_basic を実行する最大ノード数")
+    parser.add_argument('--output', default=None, help="JSON の出力先（省略時は標準出力）")
+    args = parser.parse_args(argv)
+
+    print("\n" + "=" * 60, file=sys.stderr)
+    print("経路探索ベンチマーク", file=sys.stderr)
+    print("=" * 60, file=sys.stderr)
+
+    report = run_suite(args.generators, args.sizes, args.algorithms, args.queries, args.seed,
+                       args.obstacle_density, args.basic_max_nodes,
+                       log=lambda message: print(message, file=sys.stderr))
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        print(f"\n{args.output} に保存しました", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
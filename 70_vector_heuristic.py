@@ -0,0 +1,298 @@
+"""
+座標配列によるヒューリスティックのベクトル化
+
+このプログラムは、A* のヒューリスティック計算を NumPy でまとめて行う仕組みを実装します。
+- 座標をノードの整数ID順の NumPy 配列に格納（CSRGraph の xs / ys はコピーせずに参照）
+- 問い合わせごとに、目標までの h 値を全ノード分まとめて1回だけ計算（h ベクトル）
+- 以降の h(node, goal) は辞書1回と配列の添字参照だけで済む（sqrt を呼ばない）
+- batch: 複数ノード（隣接ノード全部など）の h 値を1回の呼び出しで計算
+- a_star_vectorized: 隣接ノードの g / h / f の計算と緩和をノードごとに配列演算で行う A*
+
+euclidean_heuristic（24）や Graph.heuristic（25）は、隣接ノードを積むたびに
+辞書を2回引いて math.sqrt を呼びます。次数の大きい密なグラフでは
+ヒューリスティックの計算が A* の実行時間の大きな割合を占めるため、まとめて計算します。
+"""
+
+import heapq
+import importlib
+import math
+import random
+import time
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_NO_GOAL = object()  # heuristic がまだ目標を使っていないことを表す
+
+
+class CoordinateHeuristic:
+    """
+    NumPy 配列の座標による h(node, goal) の提供者
+
+    - xs, ys: ノードID順の座標（座標のないノードは has_position が 0）
+    - goal_vector(goal): 全ノードから goal までの推定コスト（新しい目標ごとに O(V)、
+      最近使った max_goals 個の目標はキャッシュ）
+    - heuristic(node, goal): 1ノード分（a_star / astar_simple にそのまま渡せる）
+    - batch(node_ids, goal): 複数ノード分をまとめて計算
+    座標のないノードや目標に対しては 0（許容的）を返す。
+    """
+
+    def __init__(self, graph, coordinates=None, scale=1.0, metric=None, max_goals=8):
+        """
+        Args:
+            graph: 25番の CSRGraph / GridGraph / Graph、または辞書 {ノード: [(隣接ノード, 重み), ...]}
+            coordinates (dict): 座標 {ノード: (x, y)}（省略時は graph.positions）
+            scale (float): 距離に掛ける係数（24番の euclidean_heuristic は 0.15）
+            metric (str): 'euclidean' / 'manhattan' / 'octile'
+                （省略時は GridGraph ならその移動方法に合わせ、それ以外は 'euclidean'）
+            max_goals (int): h ベクトルを保持する目標の数（1つあたりノード数 x 8 バイト）
+        """
+        if np is None:
+            raise ImportError("CoordinateHeuristic には NumPy が必要です（pip install numpy）")
+
+        self.scale = scale
+        self.index = None  # ノード → ID（GridGraph ではセルIDがそのままIDなので不要）
+        if hasattr(graph, 'cell_xy'):
+            # GridGraph: 座標はセルIDから計算できる
+            cells = np.arange(graph.num_nodes)
+            self.ys, self.xs = np.divmod(cells, graph.width)
+            self.xs = self.xs.astype(float)
+            self.ys = self.ys.astype(float)
+            self.has_position = np.ones(graph.num_nodes, dtype=bool)
+            default_metric = 'octile' if graph.diagonal else 'manhattan'
+        elif hasattr(graph, 'xs') and coordinates is None:
+            # CSRGraph: 配列をコピーせずに NumPy から参照
+            self.index = graph.index
+            n = graph.num_nodes
+            self.xs = np.frombuffer(graph.xs, dtype=float, count=n) if len(graph.xs) else np.zeros(n)
+            self.ys = np.frombuffer(graph.ys, dtype=float, count=n) if len(graph.ys) else np.zeros(n)
+            self.has_position = np.frombuffer(bytes(graph.has_position), dtype=np.uint8).astype(bool)
+            default_metric = 'euclidean'
+        else:
+            edges = getattr(graph, 'edges', graph)
+            if coordinates is None:
+                coordinates = getattr(graph, 'positions', {})
+            names = list(getattr(graph, 'names', edges))
+            self.index = {name: i for i, name in enumerate(names)}
+            self.xs = np.zeros(len(names))
+            self.ys = np.zeros(len(names))
+            self.has_position = np.zeros(len(names), dtype=bool)
+            for name, (x, y) in coordinates.items():
+                i = self.index.get(name)
+                if i is not None:
+                    self.xs[i], self.ys[i] = x, y
+                    self.has_position[i] = True
+            default_metric = 'euclidean'
+
+        self.metric = metric or default_metric
+        if self.metric not in ('euclidean', 'manhattan', 'octile'):
+            raise ValueError(f"未知の距離です: {self.metric}")
+        self.max_goals = max(1, max_goals)
+        # 目標 → [h ベクトル, 要素参照用のリスト（heuristic で初めて作る）]、アクセス順
+        self._goals = OrderedDict()
+        # heuristic が直前に使った目標とそのリスト（同じ目標の間は LRU に触れない）
+        self._goal = _NO_GOAL
+        self._goal_values = None
+
+    def node_id(self, node):
+        """ノードのID（座標配列の添字）。未知のノードは None"""
+        if self.index is None:
+            return node if isinstance(node, int) and 0 <= node < len(self.xs) else None
+        return self.index.get(node)
+
+    def _distances(self, xs, ys, has_position, goal_id):
+        """goal_id から座標配列の各点までの距離（座標がなければ 0）"""
+        if goal_id is None or not self.has_position[goal_id]:
+            return np.zeros(len(xs))
+        dx = np.abs(xs - self.xs[goal_id])
+        dy = np.abs(ys - self.ys[goal_id])
+        if self.metric == 'euclidean':
+            h = np.hypot(dx, dy)
+        elif self.metric == 'manhattan':
+            h = dx + dy
+        else:
+            h = np.maximum(dx, dy) + (math.sqrt(2) - 1) * np.minimum(dx, dy)
+        h *= self.scale
+        h[~has_position] = 0.0
+        return h
+
+    def _goal_entry(self, goal):
+        """goal のキャッシュ項目（なければ h ベクトルを計算し、古い目標を追い出す）"""
+        entry = self._goals.get(goal)
+        if entry is not None:
+            self._goals.move_to_end(goal)
+            return entry
+        entry = [self._distances(self.xs, self.ys, self.has_position, self.node_id(goal)), None]
+        self._goals[goal] = entry
+        if len(self._goals) > self.max_goals:
+            self._goals.popitem(last=False)
+        return entry
+
+    def goal_vector(self, goal):
+        """
+        全ノードから goal までの推定コストを1回の配列演算で計算
+
+        初めての目標ではノード数に比例する計算（O(V)）とメモリが必要になる。
+        最近使った max_goals 個の目標はキャッシュを返すため、
+        同じ目標への問い合わせが続く場合はこの計算を繰り返さない。
+
+        Returns:
+            numpy.ndarray: ノードID順の h 値
+        """
+        return self._goal_entry(goal)[0]
+
+    def heuristic(self, node, goal):
+        """h(node, goal): h ベクトルの1要素を返す（最初の呼び出しで h ベクトルを作る）"""
+        if goal != self._goal:
+            entry = self._goal_entry(goal)
+            if entry[1] is None:
+                # 要素ごとの参照は Python のリストの方が速い
+                entry[1] = entry[0].tolist()
+            self._goal, self._goal_values = goal, entry[1]
+        i = self.node_id(node)
+        return 0.0 if i is None else self._goal_values[i]
+
+    __call__ = heuristic
+
+    def batch(self, node_ids, goal):
+        """
+        複数ノードの h 値をまとめて計算（h ベクトルを作らずに必要な分だけ）
+
+        Args:
+            node_ids: ノードIDの配列
+            goal: 目標ノード
+
+        Returns:
+            numpy.ndarray: node_ids と同じ順序の h 値
+        """
+        ids = np.asarray(node_ids, dtype=np.intp)
+        return self._distances(self.xs[ids], self.ys[ids], self.has_position[ids], self.node_id(goal))
+
+
+def a_star_vectorized(graph, start, goal, heuristic=None):
+    """
+    隣接ノードの緩和を配列演算で行う A*（CSRGraph 専用）
+
+    取り出したノードの辺を targets / weights の NumPy ビューで受け取り、
+    候補の g 値・h 値（h ベクトルの添字参照）・改善判定を一度に計算する。
+    ヒープへの追加だけは改善した隣接ノードについて Python で行う。
+    距離配列と h ベクトルは問い合わせごとにノード数分を作るため、
+    グラフ全体に比べて探索範囲が小さい問い合わせでは a_star(..., workspace=...) が向く。
+    展開ノード数は 25番の a_star と同じく、ヒープから取り出した回数（古いエントリを含む）。
+
+    Args:
+        graph: 25番の CSRGraph
+        start, goal: 始点・目標のノード名
+        heuristic (CoordinateHeuristic): 省略時はグラフの座標から作成
+
+    Returns:
+        tuple: (経路, コスト, 展開ノード数)
+    """
+    if not hasattr(graph, 'offsets'):
+        raise TypeError("a_star_vectorized は CSRGraph（配列ベースのグラフ）でのみ使用できます")
+    heuristic = heuristic or CoordinateHeuristic(graph)
+
+    n = graph.num_nodes
+    offsets = np.frombuffer(graph.offsets, dtype=np.int64, count=n + 1)
+    targets = np.frombuffer(graph.targets, dtype=np.int32, count=graph.num_edges)
+    weights = np.frombuffer(graph.weights, dtype=float, count=graph.num_edges)
+
+    source, target = graph.node_id(start), graph.node_id(goal)
+    h = heuristic.goal_vector(goal)
+    g_score = np.full(n, np.inf)
+    previous = np.full(n, -1, dtype=np.int64)
+    g_score[source] = 0.0
+    priority_queue = [(float(h[source]), source)]
+    explored_count = 0
+
+    while priority_queue:
+        current_f, current = heapq.heappop(priority_queue)
+        explored_count += 1
+        current_g = g_score[current]
+        if current_f > current_g + h[current]:
+            continue  # g 値が更新された後の古いエントリ
+
+        if current == target:
+            path = [target]
+            while previous[path[-1]] >= 0:
+                path.append(int(previous[path[-1]]))
+            path.reverse()
+            return [graph.node_name(i) for i in path], float(current_g), explored_count
+
+        lo, hi = offsets[current], offsets[current + 1]
+        neighbors = targets[lo:hi]
+        candidate = current_g + weights[lo:hi]
+        before = g_score[neighbors]
+        # 多重辺があっても最小値が残るように minimum.at で更新
+        np.minimum.at(g_score, neighbors, candidate)
+        improved = (candidate < before) & (candidate == g_score[neighbors])
+        if improved.any():
+            chosen = neighbors[improved]
+            previous[chosen] = current
+            f_values = candidate[improved] + h[chosen]
+            for f_value, neighbor in zip(f_values.tolist(), chosen.tolist()):
+                heapq.heappush(priority_queue, (f_value, neighbor))
+
+    return None, float('infinity'), explored_count
+
+
+def main():
+    """
+    メイン実行関数：密なランダム幾何グラフでヒューリスティックの計算方法を比較
+    """
+    if np is None:
+        print("NumPy がインストールされていないため、実行できません（pip install numpy）")
+        return
+
+    visualization = importlib.import_module('25_graph_visualization')
+    astar_module = importlib.import_module('24_astar_simple')
+
+    print("\n" + "=" * 60)
+    print("ヒューリスティックのベクトル化")
+    print("=" * 60)
+
+    # 24番の道路網: euclidean_heuristic と同じ値をそのまま astar_simple に渡せる
+    graph, coordinates = astar_module.create_usa_network_with_coordinates()
+    provider = CoordinateHeuristic(graph, coordinates, scale=0.15)
+    same = all(abs(provider(node, goal) - astar_module.euclidean_heuristic(node, goal, coordinates)) < 1e-9
+               for node in graph for goal in graph)
+    path, cost = astar_module.astar_simple(graph, 'ニューヨーク', 'ロサンゼルス', provider, trace=None)
+    print(f"\nアメリカ主要都市道路網: euclidean_heuristic と同じ値: {same}")
+    print(f"  ニューヨーク → ロサンゼルス: コスト {cost}")
+
+    # 密なグラフ（平均次数 約150、辺の重みはユークリッド距離）
+    n = 4000
+    rng = random.Random(0)
+    dense = importlib.import_module('69_benchmark_suite').random_geometric_graph(n, radius=0.11, seed=0)
+    frozen = dense.freeze()
+    provider = CoordinateHeuristic(frozen)
+    print(f"\n密なランダム幾何グラフ: {frozen.num_nodes} ノード, 平均次数 {frozen.num_edges / n:.0f}")
+
+    pairs = [(str(rng.randrange(n)), str(rng.randrange(n))) for _ in range(20)]
+    methods = [
+        ('a_star + Graph.heuristic', lambda s, t: visualization.a_star(frozen, s, t)),
+        ('a_star + h ベクトル', lambda s, t: visualization.a_star(frozen, s, t, heuristic=provider)),
+        ('a_star_vectorized', lambda s, t: a_star_vectorized(frozen, s, t, provider)),
+    ]
+    reference = None
+    for label, search in methods:
+        start_time = time.perf_counter()
+        results = [search(s, t) for s, t in pairs]
+        elapsed = time.perf_counter() - start_time
+        costs = [cost for _, cost, _ in results]
+        if reference is None:
+            reference = costs
+        same = all(a == b or abs(a - b) < 1e-9 for a, b in zip(costs, reference))
+        explored = sum(count for _, _, count in results)
+        print(f"  {label:<26} {elapsed * 1000:8.1f} ms  展開 {explored:6}  同じコスト: {same}")
+    print("  （展開はヒープから取り出した回数、古いエントリを含む）")
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+K 最短経路（Yen のアルゴリズム）
+
+このプログラムは、最短経路だけでなく2番目以降の候補経路も列挙する API を実装します。
+- Yen のアルゴリズム: 確定した経路の途中ノード（スパーノード）から分岐する経路を探し、
+  候補の中で最も短いものを次の経路として確定する（同じノードを2度通らない経路のみ）
+- 探索状態の共有: 目標から全ノードへの距離を1度だけ逆向きのダイクストラ法で求め、
+  すべてのスパー探索で A* の下界（ヒューリスティック）として再利用する
+- ルート部分（始点からスパーノードまで）のキャッシュ: 確定経路の接頭辞ごとに
+  「次に進んだノード」を辞書に保持して除外する辺を O(1) で求め、
+  ルート部分のコストは経路ごとの累積コストの表から引く
+- Lawler の改良: 各経路は分岐した位置より前のノードからは再びスパー探索しない
+
+ディスパッチャーが代替経路を求める場合、10本の候補を得るために
+dijkstra_simple を独立に10回以上呼ぶよりも、はるかに少ない探索で済みます。
+"""
+
+import heapq
+import importlib
+import time
+
+
+def _distances_to(graph, goal):
+    """全ノードから goal までの最短距離（辺を逆向きにしたダイクストラ法）"""
+    module = importlib.import_module('23_dijkstra_simple')
+    distances, _ = module.dijkstra_distances(module.reverse_graph(graph), goal)
+    return distances
+
+
+def _spur_search(graph, spur, goal, blocked_nodes, blocked_next, lower_bound, stats):
+    """
+    blocked_nodes を通らず、spur から blocked_next への辺を使わない spur → goal の最短経路
+
+    lower_bound（元のグラフでの goal までの距離）はノードや辺を除いても過大にならないので、
+    A* のヒューリスティックとしてそのまま使える。
+
+    Returns:
+        tuple: (経路, コスト)。見つからなければ (None, inf)
+    """
+    inf = float('inf')
+    if spur not in lower_bound:
+        return None, inf
+    distances = {spur: 0}
+    previous = {}
+    queue = [(lower_bound[spur], 0, spur)]
+    while queue:
+        _, distance, node = heapq.heappop(queue)
+        if distance > distances[node]:
+            continue
+        stats['settled'] += 1
+        if node == goal:
+            path = [goal]
+            while path[-1] in previous:
+                path.append(previous[path[-1]])
+            path.reverse()
+            return path, distance
+        for neighbor, weight in graph.get(node, []):
+            if neighbor in blocked_nodes or (node == spur and neighbor in blocked_next):
+                continue
+            bound = lower_bound.get(neighbor)
+            if bound is None:
+                continue  # 目標へ到達できないノード
+            new_distance = distance + weight
+            if new_distance < distances.get(neighbor, inf):
+                distances[neighbor] = new_distance
+                previous[neighbor] = node
+                heapq.heappush(queue, (new_distance + bound, new_distance, neighbor))
+    return None, inf
+
+
+def yen_paths(graph, start, goal, stats=None, reuse=True):
+    """
+    短い順に同じノードを2度通らない経路を1本ずつ生成する（必要な本数だけ取り出せる）
+
+    Args:
+        graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}（25番の Graph も可）
+        start: 始点ノード
+        goal: 目標ノード
+        stats (dict): 指定すると settled（確定ノード数）と spur_searches（スパー探索回数）を加算
+        reuse (bool): False の場合は下界と Lawler の改良を使わない素朴な Yen のアルゴリズム（比較用）
+
+    Yields:
+        tuple: (経路のリスト, 総コスト)
+    """
+    graph = getattr(graph, 'edges', graph)
+    stats = stats if stats is not None else {}
+    stats.setdefault('settled', 0)
+    stats.setdefault('spur_searches', 0)
+
+    # 共有する探索状態: 全ノードから goal までの距離
+    lower_bound = _distances_to(graph, goal)
+    if start not in lower_bound:
+        return
+    if not reuse:
+        # 下界をすべて 0 にすると、スパー探索は通常のダイクストラ法になる
+        lower_bound = dict.fromkeys(lower_bound, 0)
+    first, cost = _spur_search(graph, start, goal, set(), set(), lower_bound, stats)
+
+    # ルート部分のキャッシュ: 確定経路の接頭辞 → その次に進んだノードの集合
+    next_of_prefix = {}
+    # 辺の重み（多重辺は最小）を経路のコスト計算用に保持
+    weight_of = {}
+
+    def edge_weight(u, v):
+        key = (u, v)
+        if key not in weight_of:
+            weight_of[key] = min(w for n, w in graph[u] if n == v)
+        return weight_of[key]
+
+    def accept(path):
+        for i in range(len(path) - 1):
+            next_of_prefix.setdefault(tuple(path[:i + 1]), set()).add(path[i + 1])
+
+    accept(first)
+    yield first, cost
+
+    # 確定した経路: (経路, 累積コストのリスト, 分岐位置)
+    prefix_costs = [0]
+    for u, v in zip(first, first[1:]):
+        prefix_costs.append(prefix_costs[-1] + edge_weight(u, v))
+    last = (first, prefix_costs, 0)
+    candidates = []   # (コスト, 経路のタプル, 累積コスト, 分岐位置)
+    seen = {tuple(first)}
+
+    while True:
+        path, costs, deviation = last
+        # Lawler の改良: 親経路から分岐した位置より前はすでに調べてある
+        for i in range(deviation if reuse else 0, len(path) - 1):
+            root = path[:i + 1]
+            spur = path[i]
+            blocked_next = next_of_prefix.get(tuple(root), set())
+            blocked_nodes = set(root[:-1])
+            stats['spur_searches'] += 1
+            spur_path, spur_cost = _spur_search(graph, spur, goal, blocked_nodes,
+                                                blocked_next, lower_bound, stats)
+            if spur_path is None:
+                continue
+            total_path = root[:-1] + spur_path
+            key = tuple(total_path)
+            if key in seen:
+                continue
+            seen.add(key)
+            # ルート部分の累積コストは確定経路のものをそのまま使う
+            total_costs = costs[:i + 1]
+            for u, v in zip(spur_path, spur_path[1:]):
+                total_costs.append(total_costs[-1] + edge_weight(u, v))
+            heapq.heappush(candidates, (costs[i] + spur_cost, key, total_costs, i))
+
+        if not candidates:
+            return
+        cost, key, costs, deviation = heapq.heappop(candidates)
+        path = list(key)
+        accept(path)
+        last = (path, costs, deviation)
+        yield path, cost
+
+
+def k_shortest_paths(graph, start, goal, k, stats=None, reuse=True):
+    """
+    短い順に最大 k 本の経路を求める
+
+    Args:
+        graph (dict): グラフ構造 {ノード: [(隣接ノード, 重み), ...]}（25番の Graph も可）
+        start: 始点ノード
+        goal: 目標ノード
+        k (int): 求める経路の本数
+        stats (dict): 探索量の統計（yen_paths を参照）
+        reuse (bool): 探索状態の共有と Lawler の改良を使うかどうか
+
+    Returns:
+        list: [(経路のリスト, 総コスト), ...]（k 本に満たない場合はあるだけ）
+    """
+    results = []
+    if k <= 0:
+        return results
+    for path, cost in yen_paths(graph, start, goal, stats, reuse):
+        results.append((path, cost))
+        if len(results) >= k:
+            break
+    return results
+
+
+def main():
+    """
+    メイン実行関数：日本の道路網で代替経路を列挙
+    """
+    graph = importlib.import_module('22_dijkstra_basic').create_japan_road_network()
+    dijkstra_simple = importlib.import_module('23_dijkstra_simple').dijkstra_simple
+    SearchTrace = importlib.import_module('22_dijkstra_basic').SearchTrace
+
+    print("\n" + "=" * 60)
+    print("K 最短経路（Yen のアルゴリズム）: 日本主要都市道路網")
+    print("=" * 60)
+
+    start, goal, k = '札幌', '鹿児島', 10
+    stats = {}
+    start_time = time.perf_counter()
+    routes = k_shortest_paths(graph, start, goal, k, stats)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"\n{start} → {goal} の上位 {len(routes)} 経路:")
+    for rank, (path, cost) in enumerate(routes, 1):
+        print(f"  {rank:2}. コスト {cost:5.1f}: {' → '.join(path)}")
+
+    print(f"\nスパー探索 {stats['spur_searches']} 回, 確定ノード数 合計 {stats['settled']}"
+          f"（{elapsed * 1000:.1f} ms）")
+
+    # 比較: 探索状態を共有しない素朴な Yen のアルゴリズム
+    naive = {}
+    start_time = time.perf_counter()
+    naive_routes = k_shortest_paths(graph, start, goal, k, naive, reuse=False)
+    naive_time = time.perf_counter() - start_time
+    print(f"素朴な実装: スパー探索 {naive['spur_searches']} 回, 確定ノード数 合計 {naive['settled']}"
+          f"（{naive_time * 1000:.1f} ms）")
+    print(f"同じコストの列: {[c for _, c in naive_routes] == [c for _, c in routes]}")
+
+    # 参考: 最短経路1本を dijkstra_simple で求める場合の取り出し数
+    trace = SearchTrace()
+    dijkstra_simple(graph, start, goal, trace=trace)
+    print(f"dijkstra_simple 1回あたりの取り出し数: {trace.count('pop')}")
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
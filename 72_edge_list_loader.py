@@ -0,0 +1,402 @@
+"""
+辺リストファイル（CSV / TSV、gzip 圧縮可）からのストリーミング読み込み
+
+このプログラムは、道路網のエクスポートなど大きな辺リストからグラフを組み立てます。
+- ファイルを1行ずつ読み、一定行数ごとの塊（チャンク）で処理（ファイル全体をメモリに載せない）
+- 拡張子 .gz または gzip のマジックナンバーで自動的に展開しながら読み込む
+- 区切り文字は拡張子（.tsv は タブ）または先頭行から判定
+- 列は名前（source / from / u など OSM 風の別名も可）または番号で指定
+- 出力は 25番の Graph、または配列だけで組み立てる CSRGraph（compact=True）
+- 読み込んだ行数・バイト数・秒数から処理速度（行/秒、MB/秒）を記録
+
+create_europe_network や create_sample_graph のようにコードで組み立てる代わりに、
+数 GB の道路データでも一定のメモリと予測できる時間で取り込めます。
+"""
+
+import contextlib
+import csv
+import gzip
+import importlib
+import io
+import os
+import random
+import time
+from array import array
+
+# 列名の別名（OSM 由来のエクスポートでよく使われる名前を含む）
+SOURCE_NAMES = ('source', 'from', 'u', 'src', 'start', 'from_node', 'node1')
+TARGET_NAMES = ('target', 'to', 'v', 'dst', 'end', 'to_node', 'node2')
+WEIGHT_NAMES = ('weight', 'length', 'cost', 'distance', 'length_m', 'travel_time')
+
+
+class _CountingReader(io.RawIOBase):
+    """読み込んだバイト数（圧縮ファイルなら圧縮後の大きさ）を数える"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self.raw.readinto(buffer)
+        self.bytes_read += count or 0
+        return count
+
+    def close(self):
+        self.raw.close()
+        super().close()
+
+
+@contextlib.contextmanager
+def _open_text(filename, encoding):
+    """
+    gzip なら展開しながら読むテキストストリームと、バイト数カウンタ
+
+    with を抜けると、GzipFile が閉じない元のファイルも含めてすべて閉じる。
+    """
+    with open(filename, 'rb') as raw:
+        is_gzip = raw.read(2) == b'\x1f\x8b'
+        raw.seek(0)
+        counter = _CountingReader(raw)
+        with contextlib.ExitStack() as stack:
+            stream = stack.enter_context(io.BufferedReader(counter, buffer_size=1 << 20))
+            if is_gzip:
+                stream = stack.enter_context(gzip.GzipFile(fileobj=stream))
+            yield stack.enter_context(io.TextIOWrapper(stream, encoding=encoding, newline='')), counter
+
+
+def _detect_delimiter(filename, first_line):
+    name = filename[:-3] if filename.endswith('.gz') else filename
+    if name.endswith('.tsv') or name.endswith('.tab'):
+        return '\t'
+    for delimiter in ('\t', ',', ';', ' '):
+        if delimiter in first_line:
+            return delimiter
+    return ','
+
+
+def _resolve_column(header, requested, aliases, default, required=True):
+    """
+    列名・列番号・別名から列番号を決める
+
+    列の位置（default）で決めるのはヘッダーがない場合だけ。ヘッダーがあって
+    列名が見つからない場合、required なら ValueError、そうでなければ None を返す。
+    """
+    if isinstance(requested, int):
+        return requested
+    if header is None:
+        if requested is not None:
+            raise ValueError(f"ヘッダーがないため列名 {requested!r} は使えません（列番号で指定してください）")
+        return default
+    lowered = [name.strip().lower() for name in header]
+    for name in ([requested] if requested is not None else aliases):
+        if name is not None and name.lower() in lowered:
+            return lowered.index(name.lower())
+    if requested is not None:
+        raise ValueError(f"列 {requested!r} がヘッダーにありません: {header}")
+    if required:
+        names = list(dict.fromkeys(aliases))
+        raise ValueError(f"列 {names[0]!r}（別名 {', '.join(names[1:])}）がヘッダーにありません: {header}")
+    return None
+
+
+def iter_edge_chunks(filename, chunk_size=100000, delimiter=None, source=None, target=None,
+                     weight=None, header=None, default_weight=1.0, encoding='utf-8', stats=None):
+    """
+    辺リストファイルを塊ごとに読み込むジェネレーター
+
+    Args:
+        filename (str): CSV / TSV ファイル（.gz なら gzip 展開）
+        chunk_size (int): 1つの塊の行数
+        delimiter (str): 区切り文字（省略時は自動判定）
+        source, target, weight: 列名または列番号（省略時はヘッダーの別名から探す。
+            ヘッダーがなければ 0, 1, 2 列目）
+        header (bool): 先頭行がヘッダーかどうか（省略時は重みの列が数値でなければヘッダー）
+        default_weight (float): 重みの列がない場合（ヘッダーに重みの別名がない、
+            またはヘッダーなしで2列しかない行）の重み
+        encoding (str): 文字コード
+        stats (dict): 指定すると rows, skipped, bytes を加算していく
+
+    Yields:
+        list: [(始点, 終点, 重み), ...]
+    """
+    stats = stats if stats is not None else {}
+    for key in ('rows', 'skipped', 'bytes'):
+        stats.setdefault(key, 0)
+
+    with _open_text(filename, encoding) as (text, counter):
+        first_line = text.readline()
+        if not first_line:
+            return
+        delimiter = delimiter or _detect_delimiter(filename, first_line)
+        first = next(csv.reader([first_line], delimiter=delimiter))
+
+        if header is None:
+            # 既知の列名を含むか、重みの列が数値でなければヘッダーとみなす
+            known = set(SOURCE_NAMES + TARGET_NAMES + WEIGHT_NAMES)
+            known.update(str(name).lower() for name in (source, target, weight) if isinstance(name, str))
+            header = any(field.strip().lower() in known for field in first)
+            probe = weight if isinstance(weight, int) else 2
+            if not header and len(first) > probe:
+                try:
+                    float(first[probe])
+                except ValueError:
+                    header = True
+        columns = first if header else None
+        source_index = _resolve_column(columns, source, SOURCE_NAMES, 0)
+        target_index = _resolve_column(columns, target, TARGET_NAMES, 1)
+        weight_index = _resolve_column(columns, weight, WEIGHT_NAMES, 2, required=False)
+
+        def rows():
+            if not header:
+                yield first
+            yield from csv.reader(text, delimiter=delimiter)
+
+        chunk = []
+        base_bytes = stats['bytes']
+        for row in rows():
+            try:
+                u, v = row[source_index].strip(), row[target_index].strip()
+                if weight_index is not None and len(row) > weight_index and row[weight_index].strip():
+                    w = float(row[weight_index])
+                else:
+                    w = default_weight
+            except (IndexError, ValueError):
+                stats['skipped'] += 1
+                continue
+            chunk.append((u, v, w))
+            if len(chunk) >= chunk_size:
+                stats['rows'] += len(chunk)
+                stats['bytes'] = base_bytes + counter.bytes_read
+                yield chunk
+                chunk = []
+        stats['rows'] += len(chunk)
+        stats['bytes'] = base_bytes + counter.bytes_read
+        if chunk:
+            yield chunk
+
+
+def _finish_stats(stats, start_time):
+    stats['seconds'] = time.perf_counter() - start_time
+    seconds = stats['seconds'] or 1e-9
+    stats['rows_per_sec'] = stats['rows'] / seconds
+    stats['mb_per_sec'] = stats['bytes'] / seconds / 1e6
+    return stats
+
+
+def load_edge_list(filename, directed=False, compact=False, positions=None,
+                   progress=None, **options):
+    """
+    辺リストファイルからグラフを組み立てる
+
+    Args:
+        filename (str): CSV / TSV ファイル（.gz 可）
+        directed (bool): True なら1行を片方向の辺として扱う（既定は双方向）
+        compact (bool): True なら Graph を経由せず、配列だけで CSRGraph を組み立てる
+        positions (dict): ノードの座標 {ノード: (x, y)}（load_positions の戻り値など）
+        progress: 塊ごとに呼ばれる関数 progress(stats)
+        **options: iter_edge_chunks に渡す引数（chunk_size, delimiter, source, target, weight など）
+
+    Returns:
+        tuple: (Graph または CSRGraph, 統計 dict)
+            統計は rows, skipped, bytes, seconds, rows_per_sec, mb_per_sec, nodes, edges
+    """
+    visualization = importlib.import_module('25_graph_visualization')
+    stats = {}
+    start_time = time.perf_counter()
+
+    if not compact:
+        graph = visualization.Graph()
+        edges = graph.edges
+        for chunk in iter_edge_chunks(filename, stats=stats, **options):
+            for u, v, w in chunk:
+                if directed:
+                    edges.setdefault(u, []).append((v, w))
+                    edges.setdefault(v, [])
+                else:
+                    graph.add_edge(u, v, w)
+            if directed:
+                # edges を直接書き換えたので、キャッシュ（65番）が古い経路を返さないよう版番号を進める
+                graph.version += 1
+            if progress:
+                progress(_finish_stats(stats, start_time))
+        for name, (x, y) in (positions or {}).items():
+            if name in edges:
+                graph.set_position(name, x, y)
+        stats['nodes'] = len(edges)
+        stats['edges'] = sum(len(neighbors) for neighbors in edges.values())
+        return graph, _finish_stats(stats, start_time)
+
+    # 配列だけで組み立てる: ノード名を整数IDに変換し、辺を3本の配列に追記
+    index = {}
+    names = []
+    sources = array('i')
+    targets = array('i')
+    weights = array('d')
+    for chunk in iter_edge_chunks(filename, stats=stats, **options):
+        for u, v, w in chunk:
+            i = index.get(u)
+            if i is None:
+                i = index[u] = len(names)
+                names.append(u)
+            j = index.get(v)
+            if j is None:
+                j = index[v] = len(names)
+                names.append(v)
+            sources.append(i)
+            targets.append(j)
+            weights.append(w)
+            if not directed:
+                sources.append(j)
+                targets.append(i)
+                weights.append(w)
+        if progress:
+            progress(_finish_stats(stats, start_time))
+
+    # 始点ごとに数えて offsets を作り、辺を始点順に並べ替える（計数ソート）
+    n, m = len(names), len(sources)
+    offsets = array('q', bytes(8 * (n + 1)))
+    for i in sources:
+        offsets[i + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    position = array('q', offsets[:n])
+    csr_targets = array('i', bytes(4 * m))
+    csr_weights = array('d', bytes(8 * m))
+    for k in range(m):
+        i = sources[k]
+        p = position[i]
+        csr_targets[p] = targets[k]
+        csr_weights[p] = weights[k]
+        position[i] = p + 1
+    del sources, targets, weights, position
+
+    xs = array('d', bytes(8 * n))
+    ys = array('d', bytes(8 * n))
+    has_position = bytearray(n)
+    for name, (x, y) in (positions or {}).items():
+        i = index.get(name)
+        if i is not None:
+            xs[i], ys[i] = x, y
+            has_position[i] = 1
+
+    graph = visualization.CSRGraph(names, offsets, csr_targets, csr_weights, xs, ys, has_position)
+    stats['nodes'] = n
+    stats['edges'] = m
+    return graph, _finish_stats(stats, start_time)
+
+
+def load_positions(filename, node='id', x='x', y='y', delimiter=None, encoding='utf-8'):
+    """
+    ノードの座標ファイル（ヘッダーつき CSV / TSV、.gz 可）を読み込む
+
+    Args:
+        filename (str): 座標ファイル
+        node, x, y (str): ノードID・x座標・y座標の列名（OSM 風の lon / lat も可）
+
+    Returns:
+        dict: {ノード: (x, y)}
+    """
+    positions = {}
+    with _open_text(filename, encoding) as (text, _):
+        first_line = text.readline()
+        if not first_line:
+            return positions
+        delimiter = delimiter or _detect_delimiter(filename, first_line)
+        header = next(csv.reader([first_line], delimiter=delimiter))
+        # 列の位置からは推測せず、見つからなければ ValueError
+        node_index = _resolve_column(header, None, (node, 'id', 'node', 'osmid'), None)
+        x_index = _resolve_column(header, None, (x, 'x', 'lon', 'longitude'), None)
+        y_index = _resolve_column(header, None, (y, 'y', 'lat', 'latitude'), None)
+        for row in csv.reader(text, delimiter=delimiter):
+            try:
+                positions[row[node_index].strip()] = (float(row[x_index]), float(row[y_index]))
+            except (IndexError, ValueError):
+                continue
+    return positions
+
+
+def main():
+    """
+    メイン実行関数：合成した道路データ（gzip 圧縮 CSV）を Graph と CSRGraph に読み込む
+    """
+    visualization = importlib.import_module('25_graph_visualization')
+
+    print("\n" + "=" * 60)
+    print("辺リストファイルのストリーミング読み込み")
+    print("=" * 60)
+
+    # 1. 23番のヨーロッパ鉄道網を TSV に書き出して読み込み直す
+    europe = importlib.import_module('23_dijkstra_simple').create_europe_network()
+    filename = 'europe_edges.tsv'
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter='\t')
+        writer.writerow(['from', 'to', 'length'])
+        for u, neighbors in europe.items():
+            for v, w in neighbors:
+                writer.writerow([u, v, w])
+    graph, stats = load_edge_list(filename, directed=True)
+    print(f"\n{filename}: {stats['nodes']} ノード, {stats['edges']} 辺（列名 from / to / length を自動判定）")
+    same = all(sorted(graph.edges[u]) == sorted(europe[u]) for u in europe)
+    print(f"  元のグラフと同じ辺: {same}")
+    os.remove(filename)
+
+    # ヘッダーに重みの列名がない場合は、3列目ではなく default_weight を使う
+    filename = 'osm_edges.csv'
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['u', 'v', 'osmid', 'highway'])
+        writer.writerow(['A', 'B', 123456, 'primary'])
+        writer.writerow(['B', 'C', 123457, 'residential'])
+    graph, _ = load_edge_list(filename, default_weight=1.0)
+    weights = sorted(w for neighbors in graph.edges.values() for _, w in neighbors)
+    print(f"\n{filename}（列 u / v / osmid / highway）: 重み {weights}")
+    print(f"  osmid ではなく default_weight を使用: {weights == [1.0] * 4}")
+    os.remove(filename)
+
+    # 2. 大きな格子状の道路網（OSM 風の列名、gzip 圧縮）
+    size = 300
+    rng = random.Random(0)
+    filename = 'grid_roads.csv.gz'
+    nodes_filename = 'grid_nodes.csv'
+    with gzip.open(filename, 'wt', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['u', 'v', 'length_m', 'highway'])
+        for y in range(size):
+            for x in range(size):
+                if x + 1 < size:
+                    writer.writerow([f"{x},{y}", f"{x + 1},{y}", round(1 + rng.random(), 3), 'residential'])
+                if y + 1 < size:
+                    writer.writerow([f"{x},{y}", f"{x},{y + 1}", round(1 + rng.random(), 3), 'residential'])
+    with open(nodes_filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['osmid', 'x', 'y'])
+        for y in range(size):
+            for x in range(size):
+                writer.writerow([f"{x},{y}", x, y])
+    print(f"\n{filename}: {os.path.getsize(filename) / 1e6:.1f} MB（gzip 圧縮）")
+
+    positions = load_positions(nodes_filename)
+    results = {}
+    for label, compact in (('Graph', False), ('CSRGraph（配列のみ）', True)):
+        print(f"\n  {label}:")
+        graph, stats = load_edge_list(
+            filename, compact=compact, positions=positions, chunk_size=50000,
+            progress=lambda s: print(f"    {s['rows']:>7} 行 {s['rows_per_sec']:>10,.0f} 行/秒"))
+        results[label] = graph
+        print(f"    {stats['nodes']} ノード, {stats['edges']} 有向辺, {stats['seconds']:.2f} 秒"
+              f"（{stats['rows_per_sec']:,.0f} 行/秒, {stats['mb_per_sec']:.2f} MB/秒）")
+
+    start, goal = '0,0', f"{size - 1},{size - 1}"
+    costs = [visualization.a_star(graph, start, goal)[1] for graph in results.values()]
+    print(f"\n  {start} → {goal} の A* コスト: {costs[0]:.3f}（両方で一致: {abs(costs[0] - costs[1]) < 1e-9}）")
+
+    os.remove(filename)
+    os.remove(nodes_filename)
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+迷路の一括生成・検証パイプライン（プロセスプール + 共有メモリ）
+
+このプログラムは、多数の seed から迷路を生成して解き、統計を集計します。
+- 迷路は 11番の generate_maze_grid（1マス1バイト）で生成し、12番の solve で解く
+- 迷路はタスクの引数として pickle せず、共有メモリ（multiprocessing.shared_memory）の
+  スロットに書き込む。解くワーカーは同じスロットをコピーせずに読む
+- 生成と解法は別々のタスクとしてプールに投入し、空いたスロットから次の seed を流す
+  （同時に保持する迷路はスロット数まで）
+- 結果は完了した順に受け取り、経路長の分布・行き止まりの数・解法時間のパーセンタイルを
+  その場で集計する
+
+generate_maze と solve_maze を1つずつ順番に呼ぶ方法に比べて、
+コア数に応じてスループットが伸び、迷路の受け渡しはスロット番号だけで済みます。
+"""
+
+import importlib
+import multiprocessing
+import os
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ワーカープロセスが使う共有メモリと迷路の大きさ
+_worker_memory = None
+_worker_shape = None
+
+# seed の列の終わり（seed として None も使えるように専用のオブジェクトで表す）
+_END = object()
+
+
+def _init_worker(memory, width, height):
+    """ワーカー起動時に共有メモリ（名前、または同じプロセスなら SharedMemory そのもの）に接続"""
+    global _worker_memory, _worker_shape
+    # プールのワーカーは親と同じ resource_tracker を使うため、削除は親の unlink だけで行われる
+    if isinstance(memory, str):
+        memory = shared_memory.SharedMemory(name=memory)
+    _worker_memory = memory
+    _worker_shape = (width, height)
+
+
+def _slot(slot):
+    """スロットの迷路をコピーせずに参照する memoryview"""
+    width, height = _worker_shape
+    cells = width * height
+    return _worker_memory.buf[slot * cells:(slot + 1) * cells]
+
+
+def _generate(slot, seed, algorithm, loops):
+    """seed から迷路を生成してスロットに書き込む"""
+    width, height = _worker_shape
+    generation = importlib.import_module('11_maze_generation')
+    start_time = time.perf_counter()
+    grid = generation.generate_maze_grid(width, height, seed=seed, algorithm=algorithm)
+    if loops:
+        grid = importlib.import_module('12_maze_solver').add_loops(grid, width, height, loops, seed=seed)
+    _slot(slot)[:] = grid
+    return time.perf_counter() - start_time
+
+
+def count_dead_ends(grid, width, height):
+    """
+    行き止まり（通路の隣接マスがちょうど1つの通路マス）の数。入口と出口は数えない
+
+    Args:
+        grid: bytearray / memoryview の迷路（WALL=1 / PASSAGE=0）
+    """
+    (start_row, start_col), (goal_row, goal_col) = \
+        importlib.import_module('11_maze_generation').maze_endpoints(width, height)
+    endpoints = {start_row * width + start_col, goal_row * width + goal_col}
+    if np is not None:
+        passage = np.frombuffer(grid, dtype=np.uint8).reshape(height, width) == 0
+        degree = np.zeros((height, width), dtype=np.int8)
+        degree[1:, :] += passage[:-1, :]
+        degree[:-1, :] += passage[1:, :]
+        degree[:, 1:] += passage[:, :-1]
+        degree[:, :-1] += passage[:, 1:]
+        dead = passage & (degree == 1)
+        return int(dead.sum()) - sum(1 for cell in endpoints if dead.flat[cell])
+
+    count = 0
+    for cell in range(width, width * (height - 1)):
+        if grid[cell] or cell in endpoints:
+            continue
+        x = cell % width
+        degree = ((x > 0 and not grid[cell - 1]) + (x < width - 1 and not grid[cell + 1]) +
+                  (not grid[cell - width]) + (not grid[cell + width]))
+        count += degree == 1
+    return count
+
+
+def _solve(slot, seed, method, generate_seconds):
+    """スロットの迷路を解き、1件分の結果を返す"""
+    width, height = _worker_shape
+    grid = _slot(slot)
+    rows, _, visited, seconds = importlib.import_module('12_maze_solver').solve(
+        grid, width, height, method=method)
+    return {
+        'seed': seed,
+        'path_length': len(rows) - 1 if rows is not None else None,
+        'visited': visited,
+        'dead_ends': count_dead_ends(grid, width, height),
+        'generate_seconds': generate_seconds,
+        'solve_seconds': seconds,
+    }
+
+
+class MazeStatistics:
+    """
+    結果を1件ずつ受け取って集計する
+
+    - 経路長の分布（bin_size ごとの度数）、平均・最小・最大
+    - 行き止まりの数の平均・最小・最大
+    - 解法時間・生成時間のパーセンタイル
+    """
+
+    def __init__(self, bin_size=50):
+        self.bin_size = bin_size
+        self.count = 0
+        self.unsolved = 0
+        self.histogram = Counter()
+        self.path_lengths = array('q')
+        self.dead_ends = array('q')
+        self.solve_seconds = array('d')
+        self.generate_seconds = array('d')
+
+    def add(self, result):
+        self.count += 1
+        if result['path_length'] is None:
+            self.unsolved += 1
+        else:
+            self.path_lengths.append(result['path_length'])
+            self.histogram[result['path_length'] // self.bin_size * self.bin_size] += 1
+        self.dead_ends.append(result['dead_ends'])
+        self.solve_seconds.append(result['solve_seconds'])
+        self.generate_seconds.append(result['generate_seconds'])
+
+    def summary(self):
+        """
+        Returns:
+            dict: mazes, unsolved, path_length（mean / min / max / histogram）,
+                dead_ends（mean / min / max）, solve_ms・generate_ms（p50 / p90 / p99 / max）
+        """
+        percentile = importlib.import_module('69_benchmark_suite').percentile
+
+        def mean(values):
+            return sum(values) / len(values) if values else 0.0
+
+        def latency(values):
+            values = sorted(values)
+            return {f'p{q}': percentile(values, q) * 1000 for q in (50, 90, 99)} | \
+                {'max': values[-1] * 1000 if values else 0.0}
+
+        return {
+            'mazes': self.count,
+            'unsolved': self.unsolved,
+            'path_length': {
+                'mean': mean(self.path_lengths),
+                'min': min(self.path_lengths, default=0),
+                'max': max(self.path_lengths, default=0),
+                'histogram': dict(sorted(self.histogram.items())),
+            },
+            'dead_ends': {
+                'mean': mean(self.dead_ends),
+                'min': min(self.dead_ends, default=0),
+                'max': max(self.dead_ends, default=0),
+            },
+            'solve_ms': latency(self.solve_seconds),
+            'generate_ms': latency(self.generate_seconds),
+        }
+
+
+def run_batch(seeds, width=101, height=None, algorithm='backtracker', method='bfs', loops=0,
+              processes=None, slots=None, on_result=None, statistics=None):
+    """
+    seed のリストから迷路を生成して解き、統計を集計する
+
+    Args:
+        seeds: 乱数の種の列（イテレーターも可、順に取り出す）
+        width, height (int): 迷路の大きさ（奇数、height の省略時は width）
+        algorithm (str): 11番の生成アルゴリズム
+        method (str): 12番の解法（'bfs' / 'astar' / 'bidirectional'）
+        loops (int): 生成後に壊す壁の数（ループのある迷路にする）
+        processes (int): ワーカープロセス数（省略時は CPU コア数、1 なら同じプロセスで実行）
+        slots (int): 同時に共有メモリへ置く迷路の数（省略時はワーカー数の2倍）
+        on_result: 1件完了するごとに呼ばれる関数 on_result(結果の dict)
+        statistics (MazeStatistics): 集計先（省略時は新しく作る）
+
+    Returns:
+        MazeStatistics: 集計結果（summary() で dict になる）
+    """
+    height = width if height is None else height
+    if width % 2 == 0 or height % 2 == 0 or width < 3 or height < 3:
+        raise ValueError("迷路サイズは3以上の奇数にしてください (例: 21)")
+    if algorithm not in importlib.import_module('11_maze_generation').ALGORITHMS:
+        raise ValueError(f"未知の生成アルゴリズムです: {algorithm}")
+    if method not in importlib.import_module('12_maze_solver').METHODS:
+        raise ValueError(f"未知の解法です: {method}")
+
+    statistics = statistics or MazeStatistics()
+    processes = processes or os.cpu_count() or 1
+    slots = slots or processes * 2
+    seeds = iter(seeds)
+    memory = shared_memory.SharedMemory(create=True, size=max(1, slots * width * height))
+    try:
+        if processes == 1:
+            _init_worker(memory, width, height)
+            for seed in seeds:
+                result = _solve(0, seed, method, _generate(0, seed, algorithm, loops))
+                statistics.add(result)
+                if on_result:
+                    on_result(result)
+            return statistics
+
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context(),
+                                 initializer=_init_worker,
+                                 initargs=(memory.name, width, height)) as executor:
+            free_slots = list(range(slots))
+            pending = {}
+            exhausted = False
+            while True:
+                # 空いているスロットに次の seed の生成を割り当てる
+                while free_slots and not exhausted:
+                    seed = next(seeds, _END)
+                    if seed is _END:
+                        exhausted = True
+                        break
+                    slot = free_slots.pop()
+                    future = executor.submit(_generate, slot, seed, algorithm, loops)
+                    pending[future] = ('generate', slot, seed)
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, slot, seed = pending.pop(future)
+                    if stage == 'generate':
+                        solve = executor.submit(_solve, slot, seed, method, future.result())
+                        pending[solve] = ('solve', slot, seed)
+                    else:
+                        result = future.result()
+                        free_slots.append(slot)
+                        statistics.add(result)
+                        if on_result:
+                            on_result(result)
+        return statistics
+    finally:
+        global _worker_memory
+        if _worker_memory is memory:
+            _worker_memory = None
+        memory.close()
+        memory.unlink()
+
+
+def main():
+    """
+    メイン実行関数：多数の迷路を生成・検証し、逐次実行と並列実行を比較
+    """
+    print("\n" + "=" * 60)
+    print("迷路の一括生成・検証（プロセスプール + 共有メモリ）")
+    print("=" * 60)
+
+    size, count = 101, 400
+    print(f"\n{size}x{size} の迷路 {count} 個（壁を 50 枚壊してループを追加、BFS で解く）")
+    print(f"CPU コア数: {os.cpu_count()}, 起動方式: {multiprocessing.get_start_method()}")
+
+    summaries = {}
+    cores = os.cpu_count() or 1
+    for processes in sorted({1, 2, cores}):
+        start_time = time.perf_counter()
+        statistics = run_batch(range(count), size, loops=50, processes=processes)
+        elapsed = time.perf_counter() - start_time
+        summaries[processes] = statistics.summary()
+        # コア数を超えるワーカーは時間を分け合うだけなので、プロセス間の受け渡しの分だけ遅くなる
+        note = "（CPU コア数を超えるため速くならない、参考値）" if processes > cores else ""
+        print(f"  {processes} プロセス: {elapsed:.2f} 秒（{count / elapsed:.1f} 迷路/秒）{note}")
+
+    summary = summaries[1]
+    print(f"\n同じ集計結果: {all(s['path_length'] == summary['path_length'] for s in summaries.values())}")
+    lengths = summary['path_length']
+    print(f"\n経路長: 平均 {lengths['mean']:.1f}, 最小 {lengths['min']}, 最大 {lengths['max']}")
+    peak = max(lengths['histogram'].values())
+    for start, frequency in lengths['histogram'].items():
+        print(f"  {start:5}〜{start + 49:<5} {'#' * max(1, frequency * 40 // peak)} {frequency}")
+    dead_ends = summary['dead_ends']
+    print(f"行き止まり: 平均 {dead_ends['mean']:.1f}, 最小 {dead_ends['min']}, 最大 {dead_ends['max']}")
+    for label in ('solve_ms', 'generate_ms'):
+        values = summary[label]
+        print(f"{'解法' if label == 'solve_ms' else '生成'}時間: p50 {values['p50']:.2f} ms, "
+              f"p90 {values['p90']:.2f} ms, p99 {values['p99']:.2f} ms, 最大 {values['max']:.2f} ms")
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+プロセスプールによる塊ごとの並列処理（共通の補助モジュール）
+
+62_distance_matrix.py・67_all_pairs.py・68_batch_queries.py で共用します。
+- 要素の列を (先頭の位置, 要素のリスト) の塊に分け、ワーカーあたり4タスク程度にする
+- すべての要素で共有するデータは、プールの initializer でワーカー起動時に1度だけ渡す
+  （タスクごとに pickle しない。fork で起動する環境では initializer の引数も pickle されない）
+- 共有データはプールごとに渡すため、複数のスレッドから同時に呼んだり、
+  ワーカーの中から入れ子で呼んだりしても互いに上書きしない
+- 結果は入力と同じ順序で返す
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# ワーカープロセスの中だけで設定される、処理と共有データ（親プロセスでは使わない）
+_worker_function = None
+_worker_state = None
+
+
+def _init_worker(function, state, setup=None):
+    """ワーカー起動時に処理と共有データを受け取る（タスクごとに送らない）"""
+    global _worker_function, _worker_state
+    _worker_function = function
+    _worker_state = setup(state) if setup else state
+
+
+def _run_chunk(chunk):
+    """ワーカー内で塊を処理"""
+    start_index, items = chunk
+    return start_index, [_worker_function(_worker_state, item) for item in items]
+
+
+def split_chunks(items, processes, chunk_size=None):
+    """
+    items を (先頭の位置, 要素のリスト) の塊に分ける
+
+    Args:
+        items (list): 分割する要素
+        processes (int): ワーカープロセス数
+        chunk_size (int): 1つの塊の要素数（省略時はワーカー数から自動決定）
+    """
+    if chunk_size is None:
+        # ワーカーあたり4タスク程度に分けて負荷の偏りをならす
+        chunk_size = max(1, -(-len(items) // (processes * 4)))
+    return [(i, items[i:i + chunk_size]) for i in range(0, len(items), chunk_size)]
+
+
+def map_chunks(function, items, state, processes=None, chunk_size=None, setup=None):
+    """
+    items を塊に分けてプロセスプールで function(state, item) を実行する
+
+    共有データ state はプールの initializer でワーカーごとに1度だけ渡す。
+    setup を渡すと、各ワーカーで state を setup(state) に置き換えてから使う
+    （ファイル名から mmap で読み込むなど）。
+
+    Args:
+        function: モジュールの関数 function(state, item)
+        items (list): 処理する要素
+        state: すべての要素で共有するデータ
+        processes (int): ワーカープロセス数（省略時は CPU コア数、1 なら同じプロセスで実行）
+        chunk_size (int): 1タスクあたりの要素数（省略時はワーカー数から自動決定）
+        setup: ワーカーで state を変換する関数（省略可）
+
+    Returns:
+        list: items と同じ順序の結果
+    """
+    items = list(items)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(items) < 2:
+        state = setup(state) if setup else state
+        return [function(state, item) for item in items]
+
+    results = [None] * len(items)
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context(),
+                             initializer=_init_worker,
+                             initargs=(function, state, setup)) as executor:
+        for start_index, chunk_results in executor.map(_run_chunk, split_chunks(items, processes, chunk_size)):
+            results[start_index:start_index + len(chunk_results)] = chunk_results
+    return results
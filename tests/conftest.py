@@ -0,0 +1,16 @@
+"""
+テスト共通の設定
+
+番号つきのスクリプト（25_graph_visualization.py など）を importlib で読み込めるよう、
+リポジトリのルートを sys.path に追加する。
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# 画面のない環境でも 25番（Matplotlib）を読み込めるようにする
+os.environ.setdefault('MPLBACKEND', 'Agg')
@@ -0,0 +1,78 @@
+"""
+テスト用の小さなランダムグラフと、比較の基準にする素朴なダイクストラ法
+"""
+
+import heapq
+import importlib
+import math
+import random
+
+
+def module(name):
+    """番号つきのスクリプトを読み込む（例: module('25_graph_visualization')）"""
+    return importlib.import_module(name)
+
+
+def random_graph(seed, num_nodes=25, num_edges=50, directed=False):
+    """
+    座標つきのランダムなグラフを辞書で作る
+
+    重みは座標間の距離以上にするため、ユークリッド距離のヒューリスティックは許容的。
+
+    Returns:
+        tuple: ({ノード: [(隣接ノード, 重み), ...]}, {ノード: (x, y)})
+    """
+    rng = random.Random(seed)
+    nodes = [f"n{i}" for i in range(num_nodes)]
+    positions = {node: (rng.uniform(0, 100), rng.uniform(0, 100)) for node in nodes}
+    graph = {node: [] for node in nodes}
+    for _ in range(num_edges):
+        u, v = rng.sample(nodes, 2) if num_nodes > 1 else (nodes[0], nodes[0])
+        if u == v:
+            continue
+        weight = math.ceil(math.dist(positions[u], positions[v]) * rng.uniform(1.0, 1.5) * 1000) / 1000
+        graph[u].append((v, weight))
+        if not directed:
+            graph[v].append((u, weight))
+    return graph, positions
+
+
+def to_graph(graph, positions=None):
+    """辞書のグラフを 25番の Graph に変換（無向グラフのみ）"""
+    visualization = module('25_graph_visualization')
+    result = visualization.Graph()
+    for node in graph:
+        result.add_node(node)
+    for (node, (x, y)) in (positions or {}).items():
+        result.set_position(node, x, y)
+    for u, edges in graph.items():
+        for v, weight in edges:
+            if u < v:
+                result.add_edge(u, v, weight)
+    return result
+
+
+def reference_distances(graph, source):
+    """素朴なダイクストラ法で source から各ノードへの距離を求める"""
+    distances = {source: 0}
+    queue = [(0, source)]
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if distance > distances[node]:
+            continue
+        for neighbor, weight in graph.get(node, []):
+            if distance + weight < distances.get(neighbor, math.inf):
+                distances[neighbor] = distance + weight
+                heapq.heappush(queue, (distance + weight, neighbor))
+    return distances
+
+
+def path_cost(graph, path):
+    """経路に沿った辺の重みの合計（存在しない辺があれば inf）"""
+    total = 0
+    for u, v in zip(path, path[1:]):
+        weights = [weight for neighbor, weight in graph.get(u, []) if neighbor == v]
+        if not weights:
+            return math.inf
+        total += min(weights)
+    return total
@@ -0,0 +1,68 @@
+"""全点対最短経路（67番）の Floyd–Warshall 法と Johnson 法を照合する"""
+
+import math
+import random
+
+import pytest
+
+from graph_helpers import module, path_cost, random_graph, reference_distances
+
+
+def with_negative_edges(graph, seed):
+    """ポテンシャルで重みを付け替え、負の閉路なしで負の辺を作る（最短経路は変わらない）"""
+    rng = random.Random(seed)
+    potential = {node: rng.uniform(0, 60) for node in graph}
+    return {u: [(v, weight + potential[u] - potential[v]) for v, weight in edges]
+            for u, edges in graph.items()}, potential
+
+
+def assert_table(table, graph, expected):
+    for start in graph:
+        for goal in graph:
+            cost = table.distance(start, goal)
+            assert cost == pytest.approx(expected(start, goal), abs=1e-6)
+            path, _ = table.path(start, goal)
+            if cost < math.inf:
+                assert path[0] == start and path[-1] == goal
+                assert path_cost(graph, path) == pytest.approx(cost, abs=1e-6)
+            else:
+                assert path == []
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_nonnegative_weights_match_dijkstra(seed):
+    all_pairs = module('67_all_pairs')
+    graph, _ = random_graph(seed, num_nodes=15, num_edges=35, directed=True)
+    reference = {node: reference_distances(graph, node) for node in graph}
+
+    def expected(start, goal):
+        return reference[start].get(goal, math.inf)
+
+    assert_table(all_pairs.johnson(graph, processes=1), graph, expected)
+    if all_pairs.np is not None:
+        assert_table(all_pairs.floyd_warshall(graph), graph, expected)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_negative_weights(seed):
+    all_pairs = module('67_all_pairs')
+    graph, _ = random_graph(seed, num_nodes=15, num_edges=35, directed=True)
+    shifted, potential = with_negative_edges(graph, seed)
+    reference = {node: reference_distances(graph, node) for node in graph}
+
+    def expected(start, goal):
+        return reference[start].get(goal, math.inf) + potential[start] - potential[goal]
+
+    assert_table(all_pairs.johnson(shifted, processes=2, chunk_size=2), shifted, expected)
+    if all_pairs.np is not None:
+        assert_table(all_pairs.floyd_warshall(shifted), shifted, expected)
+
+
+def test_negative_cycle():
+    all_pairs = module('67_all_pairs')
+    graph = {'a': [('b', 1.0)], 'b': [('c', -3.0)], 'c': [('a', 1.0)]}
+    with pytest.raises(ValueError):
+        all_pairs.johnson(graph, processes=1)
+    if all_pairs.np is not None:
+        with pytest.raises(ValueError):
+            all_pairs.floyd_warshall(graph)
@@ -0,0 +1,35 @@
+"""ALT ヒューリスティック（61番）の許容性と、A* に渡したときの最適性を確かめる"""
+
+import math
+
+import pytest
+
+from graph_helpers import module, random_graph, reference_distances, to_graph
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_admissible_on_directed_graph(seed):
+    LandmarkHeuristic = module('61_alt_landmarks').LandmarkHeuristic
+    graph, _ = random_graph(seed, num_nodes=20, num_edges=45, directed=True)
+    heuristic = LandmarkHeuristic(graph, num_landmarks=3, seed=seed)
+
+    for node in graph:
+        distances = reference_distances(graph, node)
+        for goal in graph:
+            estimate = heuristic(node, goal)
+            assert estimate >= 0
+            assert estimate <= distances.get(goal, math.inf) + 1e-9
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_astar_with_landmarks_is_optimal(seed):
+    visualization = module('25_graph_visualization')
+    astar_simple = module('24_astar_simple').astar_simple
+    edges, positions = random_graph(seed, num_nodes=20, num_edges=35)
+    graph = to_graph(edges, positions)
+    heuristic = module('61_alt_landmarks').LandmarkHeuristic(graph, num_landmarks=4, seed=seed)
+
+    expected = reference_distances(edges, 'n0')
+    for goal in expected:
+        assert visualization.a_star(graph, 'n0', goal, heuristic=heuristic)[1] == pytest.approx(expected[goal])
+        assert astar_simple(edges, 'n0', goal, heuristic)[1] == pytest.approx(expected[goal])
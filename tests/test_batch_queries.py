@@ -0,0 +1,50 @@
+"""並列バッチ実行（68番）の結果が1件ずつの探索と同じ順序・値になることを確かめる"""
+
+import random
+
+import pytest
+
+from graph_helpers import module
+
+
+def grid_and_pairs(seed):
+    visualization = module('25_graph_visualization')
+    rng = random.Random(seed)
+    obstacles = {(x, y) for y in range(20) for x in range(20) if rng.random() < 0.2}
+    grid = visualization.GridGraph(20, 20, obstacles, diagonal=True)
+    free = list(grid.edges)
+    return grid, [tuple(rng.sample(free, 2)) for _ in range(15)]
+
+
+@pytest.mark.parametrize('algorithm', ['a_star', 'dijkstra'])
+@pytest.mark.parametrize('processes', [1, 2])
+def test_matches_single_queries(processes, algorithm):
+    batch = module('68_batch_queries')
+    search = getattr(module('25_graph_visualization'), algorithm)
+    grid, pairs = grid_and_pairs(0)
+
+    results = batch.run_batch(grid, pairs, algorithm=algorithm, processes=processes, chunk_size=4)
+    assert [result[:3] for result in results] == [search(grid, *pair) for pair in pairs]
+
+    summary = batch.summarize(results, elapsed=1.0)
+    assert summary['queries'] == len(pairs)
+    assert summary['found'] == sum(1 for path, _, _, _ in results if path is not None)
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_graph_file(tmp_path, processes):
+    batch = module('68_batch_queries')
+    a_star = module('25_graph_visualization').a_star
+    grid, pairs = grid_and_pairs(1)
+    filename = str(tmp_path / 'grid.csrg')
+    module('64_graph_binary_format').write_graph(grid, filename)
+
+    pairs = [(str(start), str(goal)) for start, goal in pairs]
+    costs = [cost for _, cost, _, _ in batch.run_batch(filename, pairs, processes=processes)]
+    assert costs == pytest.approx([a_star(grid, int(start), int(goal))[1] for start, goal in pairs])
+
+
+def test_unknown_algorithm():
+    grid, pairs = grid_and_pairs(0)
+    with pytest.raises(ValueError):
+        module('68_batch_queries').run_batch(grid, pairs, algorithm='bfs')
@@ -0,0 +1,50 @@
+"""ベンチマークスイート（69番）の生成器と、探索関数ごとの計測値の一貫性を確かめる"""
+
+import math
+import random
+
+import pytest
+
+from graph_helpers import module, reference_distances
+
+
+@pytest.mark.parametrize('generator', ['geometric', 'grid', 'scalefree'])
+def test_generators(generator):
+    benchmark = module('69_benchmark_suite')
+    graph = benchmark.GENERATORS[generator](200, seed=1)
+    assert len(graph.edges) >= 150
+    for node, edges in graph.edges.items():
+        for neighbor, weight in edges:
+            assert any(n == node for n, _ in graph.edges[neighbor])
+            assert weight >= math.dist(graph.positions[node], graph.positions[neighbor]) - 1e-12
+
+
+@pytest.mark.parametrize('generator', ['geometric', 'grid', 'scalefree'])
+def test_algorithms_agree(generator):
+    benchmark = module('69_benchmark_suite')
+    graph = benchmark.GENERATORS[generator](150, seed=2)
+    algorithms = benchmark._algorithms()
+    rng = random.Random(0)
+    nodes = list(graph.edges)
+
+    for _ in range(5):
+        start, goal = rng.sample(nodes, 2)
+        expected = reference_distances(graph.edges, start).get(goal, math.inf)
+        settled = {}
+        for name, search in algorithms.items():
+            cost, settled[name] = search(graph, start, goal)
+            assert cost == pytest.approx(expected), name
+        if generator != 'grid':
+            # 距離の同点がなければ、ダイクストラ法の3つの実装は同じノードを確定する
+            assert settled['dijkstra_basic'] == settled['dijkstra_simple'] == settled['dijkstra']
+
+
+def test_run_suite_and_percentile():
+    benchmark = module('69_benchmark_suite')
+    report = benchmark.run_suite(['geometric', 'grid'], [50], queries=4, log=None)
+    assert len(report['results']) == 2 * len(benchmark._algorithms())
+    assert all(record['queries'] == 4 for record in report['results'])
+    assert benchmark.percentile([1, 2, 3, 4], 50) == 2
+    assert benchmark.percentile([], 99) == 0.0
+    with pytest.raises(ValueError):
+        benchmark.grid_maze_graph(0)
@@ -0,0 +1,41 @@
+"""双方向ダイクストラ法（23番・25番）を素朴なダイクストラ法に照合する"""
+
+import math
+
+import pytest
+
+from graph_helpers import module, path_cost, random_graph, reference_distances, to_graph
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_dijkstra_simple_directed(seed):
+    dijkstra_simple = module('23_dijkstra_simple').dijkstra_simple
+    graph, _ = random_graph(seed, num_nodes=15, num_edges=35, directed=True)
+
+    for start in graph:
+        expected = reference_distances(graph, start)
+        for goal in graph:
+            path, cost = dijkstra_simple(graph, start, goal, bidirectional=True)
+            assert cost == pytest.approx(expected.get(goal, math.inf))
+            if cost < math.inf:
+                assert path[0] == start and path[-1] == goal
+                assert path_cost(graph, path) == pytest.approx(cost)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_graph_visualization_undirected(seed):
+    visualization = module('25_graph_visualization')
+    edges, positions = random_graph(seed, num_nodes=20, num_edges=30)
+    graph = to_graph(edges, positions)
+
+    for start in ('n0', 'n5'):
+        expected = reference_distances(edges, start)
+        for target in (graph, graph.freeze()):
+            for goal in edges:
+                path, cost, _ = visualization.dijkstra(target, start, goal, bidirectional=True)
+                if goal not in expected:
+                    assert path is None and cost == math.inf
+                    continue
+                assert cost == pytest.approx(expected[goal])
+                assert path[0] == start and path[-1] == goal
+                assert path_cost(edges, path) == pytest.approx(cost)
@@ -0,0 +1,51 @@
+"""縮約階層（60番）の問い合わせを素朴なダイクストラ法に照合する"""
+
+import math
+
+import pytest
+
+from graph_helpers import module, path_cost, random_graph, reference_distances
+
+
+def assert_matches_reference(graph, ch):
+    for start in graph:
+        expected = reference_distances(graph, start)
+        for goal in graph:
+            path, cost = ch.query(start, goal)
+            assert cost == pytest.approx(expected.get(goal, math.inf))
+            if cost < math.inf:
+                assert path[0] == start and path[-1] == goal
+                assert path_cost(graph, path) == pytest.approx(cost)
+            else:
+                assert path == []
+
+
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', range(6))
+def test_query_matches_reference(seed, directed):
+    ContractionHierarchy = module('60_contraction_hierarchies').ContractionHierarchy
+    graph, _ = random_graph(seed, num_nodes=18, num_edges=40, directed=directed)
+    assert_matches_reference(graph, ContractionHierarchy.build(graph))
+
+
+def test_small_witness_limit_stays_exact():
+    ContractionHierarchy = module('60_contraction_hierarchies').ContractionHierarchy
+    graph, _ = random_graph(1, num_nodes=20, num_edges=50)
+    assert_matches_reference(graph, ContractionHierarchy.build(graph, witness_limit=1))
+
+
+def test_save_and_load_keep_int_ids(tmp_path):
+    ContractionHierarchy = module('60_contraction_hierarchies').ContractionHierarchy
+    named, _ = random_graph(2, num_nodes=15, num_edges=30)
+    graph = {int(u[1:]): [(int(v[1:]), weight) for v, weight in edges] for u, edges in named.items()}
+
+    filename = tmp_path / 'ch.json'
+    ContractionHierarchy.build(graph).save(filename)
+    assert_matches_reference(graph, ContractionHierarchy.load(filename))
+
+
+def test_save_rejects_unsupported_ids(tmp_path):
+    ContractionHierarchy = module('60_contraction_hierarchies').ContractionHierarchy
+    ch = ContractionHierarchy.build({(0, 0): [((0, 1), 1.0)], (0, 1): [((0, 0), 1.0)]})
+    with pytest.raises(TypeError):
+        ch.save(tmp_path / 'ch.json')
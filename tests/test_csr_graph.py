@@ -0,0 +1,49 @@
+"""CSRGraph（25番）の探索結果を Graph と素朴なダイクストラ法に照合する"""
+
+import math
+
+import pytest
+
+from graph_helpers import module, path_cost, random_graph, reference_distances, to_graph
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_search_matches_reference(seed):
+    visualization = module('25_graph_visualization')
+    edges, positions = random_graph(seed)
+    graph = to_graph(edges, positions)
+    csr = graph.freeze()
+
+    for start in ('n0', 'n7'):
+        expected = reference_distances(edges, start)
+        for goal in edges:
+            for search in (visualization.dijkstra, visualization.a_star):
+                path, cost, _ = search(csr, start, goal)
+                if goal not in expected:
+                    assert path is None and cost == math.inf
+                    continue
+                assert cost == pytest.approx(expected[goal])
+                assert path[0] == start and path[-1] == goal
+                assert path_cost(edges, path) == pytest.approx(cost)
+                assert search(graph, start, goal)[1] == pytest.approx(cost)
+
+
+def test_views_match_graph():
+    edges, positions = random_graph(3)
+    graph = to_graph(edges, positions)
+    csr = graph.freeze()
+
+    assert csr.num_nodes == len(graph.edges)
+    assert csr.num_edges == sum(len(neighbors) for neighbors in graph.edges.values())
+    assert set(csr.edges) == set(graph.edges)
+    for node in graph.edges:
+        assert csr.get_neighbors(node) == graph.get_neighbors(node)
+        assert csr.positions[node] == graph.positions[node]
+        assert csr.heuristic(node, 'n0') == pytest.approx(graph.heuristic(node, 'n0'))
+    assert csr.get_neighbors('missing') == []
+
+
+def test_frozen():
+    csr = to_graph(*random_graph(0)).freeze()
+    with pytest.raises(TypeError):
+        csr.add_edge('n0', 'n1', 1.0)
@@ -0,0 +1,40 @@
+"""距離行列（62番）を素朴なダイクストラ法に照合する"""
+
+import math
+
+import pytest
+
+from graph_helpers import module, random_graph, reference_distances
+
+
+def expected_matrix(graph, sources, targets):
+    rows = []
+    for source in sources:
+        distances = reference_distances(graph, source)
+        rows.append([distances.get(target, math.inf) for target in targets])
+    return rows
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_distance_matrix(seed):
+    distance_matrix = module('62_distance_matrix').distance_matrix
+    graph, _ = random_graph(seed, num_nodes=20, num_edges=40, directed=True)
+    sources, targets = list(graph)[:7], list(graph)[5:]
+
+    result = distance_matrix(graph, sources, targets)
+    for row, expected in zip(result, expected_matrix(graph, sources, targets), strict=True):
+        assert row == pytest.approx(expected)
+
+
+def test_parallel_distance_matrix():
+    pytest.importorskip('numpy')
+    matrix = module('62_distance_matrix')
+    graph, _ = random_graph(4, num_nodes=20, num_edges=40, directed=True)
+    sources, targets = list(graph), list(graph)[::2]
+    expected = expected_matrix(graph, sources, targets)
+
+    for processes in (1, 2):
+        result = matrix.parallel_distance_matrix(graph, sources, targets, processes=processes, chunk_size=3)
+        assert result.shape == (len(sources), len(targets))
+        for row, expected_row in zip(result.tolist(), expected):
+            assert row == pytest.approx(expected_row)
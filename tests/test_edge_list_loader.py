@@ -0,0 +1,67 @@
+"""辺リストの読み込み（72番）を、書き出した元のグラフと照合する"""
+
+import gzip
+import math
+
+import pytest
+
+from graph_helpers import module, random_graph, reference_distances
+
+
+def write_edges(filename, rows, header='source,target,weight'):
+    text = '\n'.join([header] + [f"{u},{v},{w}" for u, v, w in rows]) + '\n'
+    if filename.endswith('.gz'):
+        with gzip.open(filename, 'wt', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+def edge_rows(graph, directed):
+    return [(u, v, w) for u, edges in graph.items() for v, w in edges if directed or u < v]
+
+
+@pytest.mark.parametrize('compact', [False, True])
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('suffix', ['.csv', '.csv.gz'])
+def test_load_matches_source(tmp_path, compact, directed, suffix):
+    loader = module('72_edge_list_loader')
+    visualization = module('25_graph_visualization')
+    graph, _ = random_graph(3, num_nodes=20, num_edges=40, directed=directed)
+    filename = str(tmp_path / f"edges{suffix}")
+    write_edges(filename, edge_rows(graph, directed))
+
+    loaded, stats = loader.load_edge_list(filename, directed=directed, compact=compact, chunk_size=7)
+    assert stats['rows'] == len(edge_rows(graph, directed))
+    for node, edges in graph.items():
+        if node in loaded.edges:
+            assert sorted(loaded.get_neighbors(node)) == sorted(edges)
+        else:
+            assert not edges
+
+    expected = reference_distances(graph, 'n0')
+    for goal in loaded.edges:
+        assert visualization.dijkstra(loaded, 'n0', goal)[1] == pytest.approx(expected.get(goal, math.inf))
+
+
+def test_positions_and_default_weight(tmp_path):
+    loader = module('72_edge_list_loader')
+    filename = str(tmp_path / 'edges.csv')
+    write_edges(filename, [('a', 'b', 'x'), ('b', 'c', 'y')], header='u,v,highway')
+    (tmp_path / 'nodes.csv').write_text('id,lon,lat\na,0,0\nb,3,4\n', encoding='utf-8')
+    positions = loader.load_positions(str(tmp_path / 'nodes.csv'))
+    assert positions == {'a': (0.0, 0.0), 'b': (3.0, 4.0)}
+
+    for compact in (False, True):
+        graph, _ = loader.load_edge_list(filename, compact=compact, positions=positions, default_weight=2.5)
+        assert sorted(graph.get_neighbors('b')) == [('a', 2.5), ('c', 2.5)]
+        assert graph.heuristic('a', 'b') == pytest.approx(5.0)
+
+
+def test_missing_column(tmp_path):
+    loader = module('72_edge_list_loader')
+    filename = str(tmp_path / 'edges.csv')
+    write_edges(filename, [('a', 'b', 1)], header='left,right,weight')
+    with pytest.raises(ValueError):
+        loader.load_edge_list(filename)
@@ -0,0 +1,68 @@
+"""グラフのバイナリ形式（64番）の書き出しと mmap での読み込みを確かめる"""
+
+import math
+
+import pytest
+
+from graph_helpers import module, random_graph, reference_distances, to_graph
+
+
+@pytest.mark.parametrize('directed', [False, True])
+def test_round_trip_dict(tmp_path, directed):
+    binary = module('64_graph_binary_format')
+    visualization = module('25_graph_visualization')
+    graph, positions = random_graph(1, directed=directed)
+    filename = tmp_path / 'graph.csrg'
+    binary.write_graph(graph, filename, positions=positions)
+
+    with binary.load_graph(filename) as loaded:
+        assert loaded.num_nodes == len(graph)
+        assert loaded.positions['n3'] == positions['n3']
+        expected = reference_distances(graph, 'n0')
+        for goal in graph:
+            cost = visualization.dijkstra(loaded, 'n0', goal)[1]
+            assert cost == pytest.approx(expected.get(goal, math.inf))
+    assert loaded.mapped is None
+
+
+def test_round_trip_graph_and_grid(tmp_path):
+    binary = module('64_graph_binary_format')
+    visualization = module('25_graph_visualization')
+
+    graph = to_graph(*random_graph(2))
+    binary.write_graph(graph, tmp_path / 'graph.csrg')
+    with binary.load_graph(tmp_path / 'graph.csrg') as loaded:
+        for node in graph.edges:
+            assert loaded.get_neighbors(node) == graph.get_neighbors(node)
+
+    grid = visualization.GridGraph(7, 5, {(3, y) for y in range(4)})
+    binary.write_graph(grid, tmp_path / 'grid.csrg')
+    with binary.load_graph(tmp_path / 'grid.csrg') as loaded:
+        assert loaded.num_nodes == grid.free_count
+        for cell in grid.edges:
+            assert visualization.a_star(loaded, '0', str(cell))[1] == visualization.a_star(grid, 0, cell)[1]
+
+
+def test_closed_graph_cannot_be_searched(tmp_path):
+    binary = module('64_graph_binary_format')
+    binary.write_graph(random_graph(0)[0], tmp_path / 'graph.csrg')
+    loaded = binary.load_graph(tmp_path / 'graph.csrg')
+    loaded.close()
+    loaded.close()
+    with pytest.raises(ValueError):
+        loaded.get_neighbors('n0')
+
+
+def test_invalid_input(tmp_path):
+    binary = module('64_graph_binary_format')
+    with pytest.raises(TypeError):
+        binary.write_graph(object(), tmp_path / 'graph.csrg')
+
+    binary.write_graph(random_graph(0)[0], tmp_path / 'graph.csrg')
+    data = (tmp_path / 'graph.csrg').read_bytes()
+    (tmp_path / 'short.csrg').write_bytes(data[:len(data) // 2])
+    with pytest.raises(ValueError):
+        binary.load_graph(tmp_path / 'short.csrg')
+    (tmp_path / 'other.csrg').write_bytes(b'XXXX' + data[4:])
+    with pytest.raises(ValueError):
+        binary.load_graph(tmp_path / 'other.csrg')
@@ -0,0 +1,77 @@
+"""GridGraph と create_grid_graph（25番）を素朴な隣接関係と最短距離に照合する"""
+
+import math
+import random
+
+import pytest
+
+from graph_helpers import module, reference_distances
+
+
+def random_obstacles(seed, width, height, density=0.25):
+    rng = random.Random(seed)
+    return {(x, y) for y in range(height) for x in range(width) if rng.random() < density} - {(0, 0)}
+
+
+def expected_neighbors(width, height, obstacles, x, y, diagonal):
+    """角をすり抜けない上下左右（と斜め）の隣接セル {(x, y): 重み}"""
+    def free(cx, cy):
+        return 0 <= cx < width and 0 <= cy < height and (cx, cy) not in obstacles
+
+    result = {}
+    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+        if free(x + dx, y + dy):
+            result[(x + dx, y + dy)] = 1.0
+    if diagonal:
+        for dx in (1, -1):
+            for dy in (1, -1):
+                if free(x + dx, y + dy) and free(x + dx, y) and free(x, y + dy):
+                    result[(x + dx, y + dy)] = math.sqrt(2)
+    return result
+
+
+@pytest.mark.parametrize('diagonal', [False, True])
+@pytest.mark.parametrize('seed', range(4))
+def test_grid_graph_neighbors_and_distances(seed, diagonal):
+    visualization = module('25_graph_visualization')
+    width, height = 9, 7
+    obstacles = random_obstacles(seed, width, height)
+    grid = visualization.GridGraph(width, height, obstacles, diagonal=diagonal)
+
+    reference = {}
+    for y in range(height):
+        for x in range(width):
+            if (x, y) in obstacles:
+                continue
+            cell = grid.cell_id(x, y)
+            neighbors = {grid.cell_xy(n): w for n, w in grid.get_neighbors(cell)}
+            assert neighbors == pytest.approx(expected_neighbors(width, height, obstacles, x, y, diagonal))
+            reference[cell] = grid.get_neighbors(cell)
+    assert len(grid.edges) == len(reference)
+
+    expected = reference_distances(reference, 0)
+    for cell in reference:
+        for search in (visualization.dijkstra, visualization.a_star):
+            path, cost, _ = search(grid, 0, cell)
+            if cell in expected:
+                assert cost == pytest.approx(expected[cell])
+                assert path[0] == 0 and path[-1] == cell
+            else:
+                assert path is None
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_create_grid_graph(seed):
+    visualization = module('25_graph_visualization')
+    width, height = 8, 6
+    obstacles = random_obstacles(seed, width, height)
+    graph = visualization.create_grid_graph(width, height, list(obstacles))
+
+    for y in range(height):
+        for x in range(width):
+            name = f"{x},{y}"
+            if (x, y) in obstacles:
+                assert name not in graph.edges
+                continue
+            neighbors = {tuple(map(int, n.split(','))): w for n, w in graph.get_neighbors(name)}
+            assert neighbors == expected_neighbors(width, height, obstacles, x, y, diagonal=False)
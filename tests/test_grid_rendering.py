@@ -0,0 +1,48 @@
+"""グリッド探索のラスター描画（25番 render_grid_image）と展開順の記録を確かめる"""
+
+import pytest
+
+from graph_helpers import module
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('matplotlib')
+
+
+def test_expanded_order_is_settled_nodes():
+    visualization = module('25_graph_visualization')
+    grid = visualization.create_grid_graph(12, 9, [(5, y) for y in range(7)])
+    for search in (visualization.dijkstra, visualization.a_star):
+        expanded = []
+        path, _, _ = search(grid, '0,0', '11,0', expanded=expanded)
+        assert expanded[0] == '0,0' and expanded[-1] == '11,0'
+        assert set(path) <= set(expanded)
+
+
+@pytest.mark.parametrize('implicit', [False, True])
+def test_render_colors_cells(implicit):
+    visualization = module('25_graph_visualization')
+    colors = visualization.GRID_COLORS
+    width, height = 10, 6
+    obstacles = [(4, y) for y in range(5)]
+    if implicit:
+        graph = visualization.GridGraph(width, height, obstacles)
+        start, goal = graph.cell_id(0, 0), graph.cell_id(9, 0)
+        image_obstacles = None
+    else:
+        graph = visualization.create_grid_graph(width, height, obstacles)
+        start, goal = '0,0', '9,0'
+        image_obstacles = obstacles
+
+    expanded = []
+    path, _, _ = visualization.dijkstra(graph, start, goal, expanded=expanded)
+    image = visualization.render_grid_image(graph, width, height, image_obstacles, path=path, explored=expanded)
+
+    assert image.shape == (height, width, 3)
+    for x, y in obstacles:
+        assert tuple(image[y, x]) == colors['obstacle']
+    assert tuple(image[0, 0]) == colors['start']
+    assert tuple(image[0, 9]) == colors['goal']
+    assert tuple(image[5, 4]) == colors['path']  # 障害物の下を回り込む
+
+    heatmap = visualization.render_grid_image(graph, width, height, image_obstacles, explored=expanded, heatmap=True)
+    assert not np.allclose(heatmap[0, 0], heatmap[0, 9])
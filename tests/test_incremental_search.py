@@ -0,0 +1,59 @@
+"""D* Lite（66番）の再計画結果を、辺の変更後のグラフでの素朴なダイクストラ法に照合する"""
+
+import math
+import random
+
+import pytest
+
+from graph_helpers import module, path_cost, random_graph, reference_distances, to_graph
+
+
+def assert_plan_is_shortest(planner, graph):
+    path, cost, _ = planner.plan()
+    expected = reference_distances(graph.edges, planner.start).get(planner.goal, math.inf)
+    assert cost == pytest.approx(expected)
+    if expected < math.inf:
+        assert path[0] == planner.start and path[-1] == planner.goal
+        assert path_cost(graph.edges, path) == pytest.approx(cost)
+    else:
+        assert path is None
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_replanning_after_weight_changes(seed):
+    DStarLite = module('66_incremental_search').DStarLite
+    edges, positions = random_graph(seed, num_nodes=25, num_edges=50)
+    graph = to_graph(edges, positions)
+    pairs = sorted({tuple(sorted((u, v))) for u in edges for v, _ in edges[u]})
+    rng = random.Random(seed)
+
+    planner = DStarLite(graph, 'n0', 'n1')
+    assert_plan_is_shortest(planner, graph)
+    for _ in range(10):
+        changes = []
+        for u, v in rng.sample(pairs, 3):
+            # 座標間の距離以上に保ち、ヒューリスティックを許容的にする
+            weight = math.dist(positions[u], positions[v]) * rng.choice([1.0, 1.2, 3.0, 50.0])
+            changes.append((u, v, weight))
+        planner.update_edges(changes)
+        assert_plan_is_shortest(planner, graph)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_replanning_after_moving_start(seed):
+    DStarLite = module('66_incremental_search').DStarLite
+    edges, positions = random_graph(seed, num_nodes=25, num_edges=60)
+    graph = to_graph(edges, positions)
+    pairs = sorted({tuple(sorted((u, v))) for u in edges for v, _ in edges[u]})
+    rng = random.Random(seed)
+
+    planner = DStarLite(graph, 'n0', 'n2')
+    path = planner.plan()[0]
+    for _ in range(30):
+        if path is None or len(path) == 1:
+            break
+        planner.move_start(path[1])
+        u, v = rng.choice(pairs)
+        planner.update_edges([(u, v, math.dist(positions[u], positions[v]) * rng.uniform(1.0, 4.0))])
+        assert_plan_is_shortest(planner, graph)
+        path = planner.plan()[0]
@@ -0,0 +1,90 @@
+"""Union-Find による島のラベリング（13番）を幅優先探索の塗りつぶしに照合する"""
+
+import random
+from collections import deque
+
+import pytest
+
+from graph_helpers import module
+
+
+def flood_fill_components(grid, connectivity):
+    """幅優先探索で連結成分を走査順に求める: [(画素の集合), ...]"""
+    height, width = len(grid), len(grid[0]) if grid else 0
+    steps = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+    if connectivity == 8:
+        steps += [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+    seen = set()
+    components = []
+    for r in range(height):
+        for c in range(width):
+            if not grid[r][c] or (r, c) in seen:
+                continue
+            component = {(r, c)}
+            seen.add((r, c))
+            queue = deque([(r, c)])
+            while queue:
+                y, x = queue.popleft()
+                for dy, dx in steps:
+                    ny, nx = y + dy, x + dx
+                    if 0 <= ny < height and 0 <= nx < width and grid[ny][nx] and (ny, nx) not in seen:
+                        seen.add((ny, nx))
+                        component.add((ny, nx))
+                        queue.append((ny, nx))
+            components.append(component)
+    return components
+
+
+def assert_labels(labels, info, components):
+    for label, component in enumerate(components, start=1):
+        assert {(r, c) for r, row in enumerate(labels) for c, value in enumerate(row) if value == label} == component
+        rows, cols = [r for r, _ in component], [c for _, c in component]
+        assert info[label] == {'size': len(component), 'bbox': (min(rows), min(cols), max(rows), max(cols))}
+
+
+@pytest.mark.parametrize('connectivity', [4, 8])
+@pytest.mark.parametrize('use_numpy', [False, True])
+@pytest.mark.parametrize('seed', range(6))
+def test_matches_flood_fill(seed, use_numpy, connectivity):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    labeling = module('13_island_labeling')
+    rng = random.Random(seed)
+    height, width = rng.randint(1, 25), rng.randint(1, 25)
+    grid = labeling.create_sea_map(height, width, land=rng.uniform(0.2, 0.7), seed=seed)
+
+    labels, count, info = labeling.label_components(grid, connectivity, use_numpy=use_numpy)
+    components = flood_fill_components(grid, connectivity)
+    assert count == len(components)
+    assert_labels([list(row) for row in labels], info, components)
+
+
+def test_label_islands_in_place():
+    labeling = module('13_island_labeling')
+    grid = labeling.create_sea_map(12, 15, seed=1)
+    grid[0][0] = 7  # 1 以外の値のマスはそのまま残る
+    components = flood_fill_components([[cell == 1 for cell in row] for row in grid], 4)
+
+    count = labeling.label_islands(grid)
+    assert count == len(components)
+    assert grid[0][0] == 7
+    for label, component in enumerate(components, start=2):
+        assert all(grid[r][c] == label for r, c in component)
+
+
+def test_sea_map_seeds_are_reproducible():
+    create_sea_map = module('13_island_labeling').create_sea_map
+    assert create_sea_map(10, 12, seed=3) == create_sea_map(10, 12, seed=3)
+
+    random.seed(7)
+    first = create_sea_map(10, 12)
+    random.seed(7)
+    assert create_sea_map(10, 12) == first
+
+
+def test_empty_map_and_invalid_connectivity():
+    labeling = module('13_island_labeling')
+    assert labeling.label_components([], 4, use_numpy=False)[1] == 0
+    assert labeling.label_islands([]) == 0
+    with pytest.raises(ValueError):
+        labeling.label_components([[1]], connectivity=6)
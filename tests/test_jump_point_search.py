@@ -0,0 +1,41 @@
+"""Jump Point Search（25番）を GridGraph 上のダイクストラ法に照合する"""
+
+import math
+import random
+
+import pytest
+
+from graph_helpers import module, reference_distances
+
+
+@pytest.mark.parametrize('diagonal', [False, True])
+@pytest.mark.parametrize('seed', range(8))
+def test_matches_dijkstra(seed, diagonal):
+    visualization = module('25_graph_visualization')
+    rng = random.Random(seed)
+    width, height = 12, 10
+    obstacles = {(x, y) for y in range(height) for x in range(width) if rng.random() < 0.3}
+    grid = visualization.GridGraph(width, height, obstacles, diagonal=diagonal)
+    free = list(grid.edges)
+    adjacency = {cell: grid.get_neighbors(cell) for cell in free}
+
+    for start in rng.sample(free, 3):
+        expected = reference_distances(adjacency, start)
+        for goal in free:
+            path, cost, _ = visualization.jump_point_search(grid, start, goal)
+            if goal not in expected:
+                assert path is None and cost == math.inf
+                continue
+            assert cost == pytest.approx(expected[goal])
+            assert path[0] == start and path[-1] == goal
+            steps = [dict(adjacency[u]).get(v) for u, v in zip(path, path[1:])]
+            assert None not in steps
+            assert sum(steps) == pytest.approx(cost)
+
+
+def test_blocked_endpoints():
+    visualization = module('25_graph_visualization')
+    grid = visualization.GridGraph(4, 4, {(1, 1)})
+    assert visualization.jump_point_search(grid, grid.cell_id(1, 1), 0)[0] is None
+    assert visualization.jump_point_search(grid, 0, grid.cell_id(1, 1))[0] is None
+    assert visualization.jump_point_search(grid, 0, 0)[:2] == ([0], 0)
@@ -0,0 +1,49 @@
+"""K 最短経路（71番）を、小さなグラフの単純経路の全列挙と照合する"""
+
+import pytest
+
+from graph_helpers import module, path_cost, random_graph
+
+
+def all_simple_path_costs(graph, start, goal):
+    """start から goal への単純経路をすべて列挙し、コストを昇順に返す"""
+    costs = []
+    stack = [(start, [start])]
+    while stack:
+        node, path = stack.pop()
+        if node == goal:
+            costs.append(path_cost(graph, path))
+            continue
+        for neighbor in {neighbor for neighbor, _ in graph[node]}:
+            if neighbor not in path:
+                stack.append((neighbor, path + [neighbor]))
+    return sorted(costs)
+
+
+@pytest.mark.parametrize('reuse', [True, False])
+@pytest.mark.parametrize('directed', [False, True])
+@pytest.mark.parametrize('seed', range(6))
+def test_matches_enumeration(seed, directed, reuse):
+    k_shortest_paths = module('71_k_shortest_paths').k_shortest_paths
+    graph, _ = random_graph(seed, num_nodes=8, num_edges=16, directed=directed)
+    k = 12
+
+    for goal in ('n1', 'n5'):
+        expected = all_simple_path_costs(graph, 'n0', goal)[:k]
+        results = k_shortest_paths(graph, 'n0', goal, k, reuse=reuse)
+        assert [cost for _, cost in results] == pytest.approx(expected)
+
+        paths = [tuple(path) for path, _ in results]
+        assert len(set(paths)) == len(paths)
+        for path, cost in results:
+            assert path[0] == 'n0' and path[-1] == goal
+            assert len(set(path)) == len(path)
+            assert path_cost(graph, path) == pytest.approx(cost)
+
+
+def test_degenerate_requests():
+    k_shortest_paths = module('71_k_shortest_paths').k_shortest_paths
+    graph = {'a': [('b', 1.0)], 'b': [], 'c': []}
+    assert k_shortest_paths(graph, 'a', 'b', 0) == []
+    assert k_shortest_paths(graph, 'a', 'c', 3) == []
+    assert k_shortest_paths(graph, 'a', 'b', 3) == [(['a', 'b'], 1.0)]
@@ -0,0 +1,53 @@
+"""迷路のバッチ処理（73番）の結果を、1件ずつ生成して解いた結果と照合する"""
+
+import pytest
+
+from graph_helpers import module
+
+
+def direct_result(seed, width, height, loops, method):
+    maze = module('11_maze_generation')
+    solver = module('12_maze_solver')
+    grid = maze.generate_maze_grid(width, height, seed=seed)
+    if loops:
+        grid = solver.add_loops(grid, width, height, loops, seed=seed)
+    rows = solver.solve(grid, width, height, method=method)[0]
+    return len(rows) - 1, grid
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+@pytest.mark.parametrize('loops', [0, 10])
+def test_matches_direct_solving(processes, loops):
+    batch = module('73_maze_batch')
+    width, height = 21, 15
+    results = []
+    statistics = batch.run_batch(range(10), width, height, method='bidirectional', loops=loops,
+                                 processes=processes, slots=3, on_result=results.append)
+
+    assert sorted(result['seed'] for result in results) == list(range(10))
+    for result in results:
+        length, grid = direct_result(result['seed'], width, height, loops, 'bfs')
+        assert result['path_length'] == length
+        assert result['dead_ends'] == batch.count_dead_ends(grid, width, height)
+
+    summary = statistics.summary()
+    assert summary['mazes'] == 10 and summary['unsolved'] == 0
+    lengths = [result['path_length'] for result in results]
+    assert summary['path_length']['min'] == min(lengths)
+    assert summary['path_length']['max'] == max(lengths)
+
+
+def test_count_dead_ends_without_numpy(monkeypatch):
+    batch = module('73_maze_batch')
+    grid = module('11_maze_generation').generate_maze_grid(31, 21, seed=2)
+    expected = batch.count_dead_ends(grid, 31, 21)
+    monkeypatch.setattr(batch, 'np', None)
+    assert batch.count_dead_ends(grid, 31, 21) == expected
+
+
+def test_invalid_arguments():
+    batch = module('73_maze_batch')
+    with pytest.raises(ValueError):
+        batch.run_batch([0], width=20)
+    with pytest.raises(ValueError):
+        batch.run_batch([0], method='dfs')
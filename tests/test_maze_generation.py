@@ -0,0 +1,67 @@
+"""迷路生成（11番）が完全迷路（通路が木になる迷路）を作ることを幅優先探索で確かめる"""
+
+import random
+from collections import deque
+
+import pytest
+
+from graph_helpers import module
+
+
+def passage_cells(grid, width, height):
+    return {(r, c) for r in range(height) for c in range(width) if grid[r * width + c] == 0}
+
+
+def assert_perfect_maze(grid, width, height):
+    """通路がすべてつながり、辺の数が「マス数 - 1」（閉路なし）であること"""
+    maze = module('11_maze_generation')
+    cells = passage_cells(grid, width, height)
+    start, goal = maze.maze_endpoints(width, height)
+    assert start in cells and goal in cells
+
+    # 入口と出口を除く外周はすべて壁
+    for r, c in cells - {start, goal}:
+        assert 0 < r < height - 1 and 0 < c < width - 1
+
+    edges = sum(1 for r, c in cells for neighbor in ((r + 1, c), (r, c + 1)) if neighbor in cells)
+    assert edges == len(cells) - 1
+
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        r, c = queue.popleft()
+        for neighbor in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+            if neighbor in cells and neighbor not in seen:
+                seen.add(neighbor)
+                queue.append(neighbor)
+    assert seen == cells
+
+
+@pytest.mark.parametrize('algorithm', ['backtracker', 'wilson', 'eller', 'kruskal'])
+@pytest.mark.parametrize('width, height', [(3, 3), (21, 21), (31, 11), (9, 25)])
+def test_perfect_maze(algorithm, width, height):
+    generate_maze_grid = module('11_maze_generation').generate_maze_grid
+    for seed in range(3):
+        grid = generate_maze_grid(width, height, seed=seed, algorithm=algorithm)
+        assert len(grid) == width * height
+        assert_perfect_maze(grid, width, height)
+
+
+@pytest.mark.parametrize('algorithm', ['backtracker', 'wilson', 'eller', 'kruskal'])
+def test_seeds_are_reproducible(algorithm):
+    generate_maze_grid = module('11_maze_generation').generate_maze_grid
+    assert generate_maze_grid(21, seed=5, algorithm=algorithm) == generate_maze_grid(21, seed=5, algorithm=algorithm)
+
+    random.seed(7)
+    first = generate_maze_grid(21, algorithm=algorithm)
+    random.seed(7)
+    assert generate_maze_grid(21, algorithm=algorithm) == first
+
+
+def test_invalid_arguments():
+    maze = module('11_maze_generation')
+    for width, height in ((4, 5), (5, 1), (1, 1)):
+        with pytest.raises(ValueError):
+            maze.generate_maze_grid(width, height)
+    with pytest.raises(ValueError):
+        maze.generate_maze_grid(5, algorithm='prim')
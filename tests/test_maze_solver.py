@@ -0,0 +1,76 @@
+"""迷路の解法（12番）を素朴な幅優先探索の最短距離に照合する"""
+
+import random
+from collections import deque
+
+import pytest
+
+from graph_helpers import module
+
+METHODS = ['bfs', 'astar', 'bidirectional']
+
+
+def bfs_length(grid, width, height, start, goal):
+    """start から goal までの最短経路のマス数（到達できなければ None）"""
+    distance = {start: 1}
+    queue = deque([start])
+    while queue:
+        r, c = queue.popleft()
+        if (r, c) == goal:
+            return distance[goal]
+        for nr, nc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+            if 0 <= nr < height and 0 <= nc < width and grid[nr * width + nc] == 0 \
+                    and (nr, nc) not in distance:
+                distance[(nr, nc)] = distance[(r, c)] + 1
+                queue.append((nr, nc))
+    return None
+
+
+def assert_solution(grid, width, height, start, goal, method):
+    solve = module('12_maze_solver').solve
+    original = bytes(grid)
+    rows, cols, visited, _ = solve(grid, width, height, start, goal, method=method)
+    assert bytes(grid) == original
+    expected = bfs_length(grid, width, height, start, goal)
+    if expected is None:
+        assert rows is None
+        return
+    cells = list(zip(rows, cols))
+    assert len(cells) == expected and visited >= 1
+    assert cells[0] == start and cells[-1] == goal
+    for (r1, c1), (r2, c2) in zip(cells, cells[1:]):
+        assert abs(r1 - r2) + abs(c1 - c2) == 1
+        assert grid[r2 * width + c2] == 0
+
+
+@pytest.mark.parametrize('method', METHODS)
+@pytest.mark.parametrize('loops', [0, 15])
+def test_matches_bfs(method, loops):
+    maze = module('11_maze_generation')
+    add_loops = module('12_maze_solver').add_loops
+    rng = random.Random(loops)
+    for seed in range(4):
+        width, height = 25, 15
+        grid = add_loops(maze.generate_maze_grid(width, height, seed=seed), width, height, loops, seed=seed)
+        assert_solution(grid, width, height, *maze.maze_endpoints(width, height), method)
+
+        passages = [(r, c) for r in range(height) for c in range(width) if grid[r * width + c] == 0]
+        for _ in range(5):
+            assert_solution(grid, width, height, rng.choice(passages), rng.choice(passages), method)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_unreachable_goal(method):
+    width = height = 7
+    grid = bytearray([1]) * (width * height)
+    for r, c in ((1, 1), (1, 2), (1, 3), (5, 5)):
+        grid[r * width + c] = 0
+    assert_solution(grid, width, height, (1, 1), (5, 5), method)
+    assert_solution(grid, width, height, (1, 1), (1, 1), method)
+
+
+def test_solve_maze_lists():
+    solver = module('12_maze_solver')
+    maze = solver.generate_maze(15, seed=3)
+    assert solver.solve_maze(maze)
+    assert any('.' in row for row in maze)
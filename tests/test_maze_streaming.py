@@ -0,0 +1,50 @@
+"""Eller のアルゴリズムによる行ごとの迷路生成と書き出し（11番）を確かめる"""
+
+import io
+import socket
+
+import pytest
+
+from graph_helpers import module
+
+
+@pytest.mark.parametrize('width, height', [(3, 3), (21, 21), (41, 9)])
+def test_rows_match_whole_maze(width, height):
+    maze = module('11_maze_generation')
+    for seed in range(3):
+        rows = list(maze.iter_maze_rows(width, height, seed=seed))
+        assert all(len(row) == width for row in rows) and len(rows) == height
+        assert b''.join(rows) == maze.generate_maze_grid(width, height, seed=seed, algorithm='eller')
+
+
+def expected_text(width, height, seed):
+    maze = module('11_maze_generation')
+    grid = maze.generate_maze_grid(width, height, seed=seed, algorithm='eller')
+    return ''.join(line + '\n' for line in maze.format_maze(grid, width, height))
+
+
+def test_write_maze_outputs(tmp_path):
+    write_maze = module('11_maze_generation').write_maze
+    expected = expected_text(31, 17, 4)
+
+    text = io.StringIO()
+    assert write_maze(text, 31, 17, seed=4, buffer_rows=3) == len(expected)
+    assert text.getvalue() == expected
+
+    binary = io.BytesIO()
+    write_maze(binary, 31, 17, seed=4)
+    assert binary.getvalue().decode('ascii') == expected
+
+    filename = str(tmp_path / 'maze.txt')
+    write_maze(filename, 31, 17, seed=4, buffer_rows=1)
+    with open(filename, encoding='ascii') as f:
+        assert f.read() == expected
+
+    sender, receiver = socket.socketpair()
+    with sender, receiver:
+        write_maze(sender, 31, 17, seed=4, buffer_rows=5)
+        sender.shutdown(socket.SHUT_WR)
+        received = b''
+        while chunk := receiver.recv(4096):
+            received += chunk
+    assert received.decode('ascii') == expected
@@ -0,0 +1,55 @@
+"""最短経路キャッシュ（65番）のヒット・LRU 削除・版番号による無効化を確かめる"""
+
+import pytest
+
+from graph_helpers import module, random_graph, reference_distances, to_graph
+
+
+def test_results_match_reference():
+    edges, positions = random_graph(0)
+    graph = to_graph(edges, positions)
+    cache = module('65_path_cache').PathCache(graph)
+    expected = reference_distances(edges, 'n0')
+
+    for algorithm in cache.algorithms:
+        for goal in expected:
+            for _ in range(2):
+                assert cache.query('n0', goal, algorithm)[1] == pytest.approx(expected[goal])
+    stats = cache.stats()
+    assert stats['hits'] == stats['misses'] == len(cache.algorithms) * len(expected)
+
+
+def test_returned_path_is_a_copy():
+    graph = to_graph(*random_graph(1))
+    cache = module('65_path_cache').PathCache(graph)
+    path = cache.query('n0', 'n1', 'dijkstra')[0]
+    path.append('changed')
+    assert cache.query('n0', 'n1', 'dijkstra')[0][-1] == 'n1'
+
+
+def test_lru_eviction():
+    graph = to_graph(*random_graph(2))
+    cache = module('65_path_cache').PathCache(graph, max_entries=2)
+    cache.query('n0', 'n1')
+    cache.query('n0', 'n2')
+    cache.query('n0', 'n1')  # n1 を最近使った側にする
+    cache.query('n0', 'n3')  # n2 が追い出される
+    assert len(cache) == 2 and cache.evictions == 1
+
+    misses = cache.misses
+    cache.query('n0', 'n1')
+    assert cache.misses == misses
+    cache.query('n0', 'n2')
+    assert cache.misses == misses + 1
+
+
+def test_graph_change_invalidates():
+    graph = to_graph(*random_graph(3))
+    cache = module('65_path_cache').PathCache(graph)
+    before = cache.query('n0', 'n1')[1]
+    graph.add_edge('n0', 'n1', before / 2)
+    assert cache.query('n0', 'n1')[1] == pytest.approx(before / 2)
+    assert cache.invalidations == 1
+
+    with pytest.raises(KeyError):
+        cache.query('n0', 'n1', 'unknown')
@@ -0,0 +1,54 @@
+"""キー減少つき優先度キュー（63番）と、それを使う探索関数を確かめる"""
+
+import random
+
+import pytest
+
+from graph_helpers import module, random_graph, reference_distances, to_graph
+
+
+def integer_graph(seed):
+    """RadixHeap でも使えるよう、重みを整数に丸めたグラフ"""
+    graph, positions = random_graph(seed, num_nodes=20, num_edges=40)
+    return {node: [(neighbor, float(round(weight))) for neighbor, weight in edges]
+            for node, edges in graph.items()}, positions
+
+
+@pytest.mark.parametrize('name', ['IndexedDaryHeap', 'RadixHeap'])
+def test_pop_order_with_decrease_key(name):
+    queue_class = getattr(module('63_priority_queues'), name)
+    rng = random.Random(0)
+    queue = queue_class()
+    best = {}
+    for _ in range(300):
+        item, priority = rng.randrange(60), rng.randrange(1000)
+        queue.push(item, priority)
+        best[item] = min(priority, best.get(item, priority))
+    assert len(queue) == len(best)
+
+    popped = []
+    while queue:
+        priority, item = queue.pop()
+        assert priority == best.pop(item)
+        popped.append(priority)
+    assert popped == sorted(popped) and not best
+
+
+@pytest.mark.parametrize('name', ['IndexedDaryHeap', 'RadixHeap'])
+@pytest.mark.parametrize('seed', range(4))
+def test_searches_with_queue(name, seed):
+    queue_class = getattr(module('63_priority_queues'), name)
+    dijkstra_simple = module('23_dijkstra_simple').dijkstra_simple
+    astar_simple = module('24_astar_simple').astar_simple
+    visualization = module('25_graph_visualization')
+    edges, positions = integer_graph(seed)
+    graph = to_graph(edges, positions)
+
+    expected = reference_distances(edges, 'n0')
+    for goal in expected:
+        assert dijkstra_simple(edges, 'n0', goal, trace=None, queue=queue_class)[1] == expected[goal]
+        if name == 'IndexedDaryHeap':
+            # RadixHeap は整数キー専用なので、実数の h を足す A* には使わない
+            assert astar_simple(edges, 'n0', goal, lambda node, goal: 0.0, trace=None,
+                                queue=queue_class)[1] == expected[goal]
+            assert visualization.a_star(graph, 'n0', goal, queue=queue_class)[1] == pytest.approx(expected[goal])
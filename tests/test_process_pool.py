@@ -0,0 +1,34 @@
+"""process_pool.map_chunks の結果の順序と共有データの受け渡しを確かめる"""
+
+import pytest
+
+from process_pool import map_chunks, split_chunks
+
+
+def scaled(state, item):
+    return state * item
+
+
+def prefixed(state, item):
+    prefix, count = state
+    return f"{prefix}{item}:{count}"
+
+
+def setup_prefix(state):
+    return state, len(state)
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_results_keep_input_order(processes):
+    items = list(range(23))
+    assert map_chunks(scaled, items, 3, processes=processes, chunk_size=4) == [3 * i for i in items]
+    assert map_chunks(prefixed, items, 'ab', processes=processes, setup=setup_prefix) == \
+        [f"ab{i}:2" for i in items]
+
+
+def test_split_chunks_covers_items():
+    items = list(range(10))
+    chunks = split_chunks(items, processes=2)
+    assert [item for _, chunk in chunks for item in chunk] == items
+    assert [start for start, _ in chunks] == [0, 2, 4, 6, 8]
+    assert map_chunks(scaled, [], 1, processes=2) == []
@@ -0,0 +1,46 @@
+"""22〜24番の trace 引数（表示なしの実行と構造化トレース）を確かめる"""
+
+import math
+
+import pytest
+
+from graph_helpers import module, random_graph, reference_distances
+
+
+def searches(positions):
+    """(名前, 関数(graph, start, goal, trace), 確定ノードのイベント名)"""
+    astar = module('24_astar_simple')
+
+    def heuristic(node, goal):
+        return math.dist(positions[node], positions[goal])
+
+    return [
+        ('dijkstra_basic', module('22_dijkstra_basic').dijkstra_basic, 'select'),
+        ('dijkstra_simple', module('23_dijkstra_simple').dijkstra_simple, 'pop'),
+        ('astar_simple', lambda graph, start, goal, trace: astar.astar_simple(graph, start, goal, heuristic, trace=trace), 'pop'),
+    ]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_silent_search_prints_nothing(seed, capsys):
+    graph, positions = random_graph(seed, num_nodes=15, num_edges=30)
+    expected = reference_distances(graph, 'n0')
+
+    for name, search, _ in searches(positions):
+        for goal in expected:
+            assert search(graph, 'n0', goal, trace=None)[1] == pytest.approx(expected[goal]), name
+    assert capsys.readouterr().out == ''
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_trace_reports_each_settled_node_once(seed):
+    SearchTrace = module('22_dijkstra_basic').SearchTrace
+    graph, positions = random_graph(seed, num_nodes=15, num_edges=30)
+    goal = max(reference_distances(graph, 'n0'), key=lambda node: int(node[1:]))
+
+    for name, search, event in searches(positions):
+        trace = SearchTrace()
+        search(graph, 'n0', goal, trace=trace)
+        settled = trace.nodes(event)
+        assert settled[0] == 'n0' and settled[-1] == goal, name
+        assert len(settled) == len(set(settled)), name
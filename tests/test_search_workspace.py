@@ -0,0 +1,51 @@
+"""SearchWorkspace（25番）を使い回した探索が、使わない場合と同じ結果になることを確かめる"""
+
+import random
+
+import pytest
+
+from graph_helpers import module, path_cost, random_graph, reference_distances, to_graph
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_reused_workspace_on_csr_graph(seed):
+    visualization = module('25_graph_visualization')
+    edges, positions = random_graph(seed)
+    csr = to_graph(edges, positions).freeze()
+    workspace = visualization.SearchWorkspace.for_graph(csr)
+
+    rng = random.Random(seed)
+    for _ in range(30):
+        start, goal = rng.choice(list(edges)), rng.choice(list(edges))
+        expected = reference_distances(edges, start)
+        for search in (visualization.dijkstra, visualization.a_star):
+            path, cost, _ = search(csr, start, goal, workspace=workspace)
+            if goal in expected:
+                assert cost == pytest.approx(expected[goal])
+                assert path_cost(edges, path) == pytest.approx(cost)
+            else:
+                assert path is None
+
+
+def test_reused_workspace_on_grid_graph():
+    visualization = module('25_graph_visualization')
+    rng = random.Random(0)
+    obstacles = {(x, y) for y in range(15) for x in range(15) if rng.random() < 0.25}
+    grid = visualization.GridGraph(15, 15, obstacles, diagonal=True)
+    workspace = visualization.SearchWorkspace(grid.num_nodes)
+    free = list(grid.edges)
+
+    for _ in range(30):
+        start, goal = rng.choice(free), rng.choice(free)
+        for search in (visualization.dijkstra, visualization.a_star):
+            assert search(grid, start, goal, workspace=workspace)[1] == pytest.approx(search(grid, start, goal)[1])
+
+
+def test_workspace_checks_graph():
+    visualization = module('25_graph_visualization')
+    edges, positions = random_graph(0)
+    graph = to_graph(edges, positions)
+    with pytest.raises(TypeError):
+        visualization.dijkstra(graph, 'n0', 'n1', workspace=visualization.SearchWorkspace(100))
+    with pytest.raises(ValueError):
+        visualization.a_star(graph.freeze(), 'n0', 'n1', workspace=visualization.SearchWorkspace(3))
@@ -0,0 +1,49 @@
+"""ベクトル化したヒューリスティック（70番）を 25番の heuristic と素朴なダイクストラ法に照合する"""
+
+import math
+
+import pytest
+
+from graph_helpers import module, path_cost, random_graph, reference_distances, to_graph
+
+np = pytest.importorskip('numpy')
+
+
+def test_matches_graph_heuristic():
+    vector = module('70_vector_heuristic')
+    visualization = module('25_graph_visualization')
+    graph = to_graph(*random_graph(0))
+    grid = visualization.GridGraph(8, 6, {(2, 2), (3, 3)}, diagonal=True)
+
+    for target in (graph, graph.freeze(), grid):
+        heuristic = vector.CoordinateHeuristic(target, max_goals=2)
+        nodes = list(target.edges)
+        for goal in nodes[:5] + nodes[:2]:
+            for node in nodes:
+                assert heuristic(node, goal) == pytest.approx(target.heuristic(node, goal))
+            ids = np.array([heuristic.node_id(node) for node in nodes])
+            assert heuristic.batch(ids, goal) == pytest.approx(heuristic.goal_vector(goal)[ids])
+        assert len(heuristic._goals) <= 2
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_a_star_vectorized(seed):
+    vector = module('70_vector_heuristic')
+    edges, positions = random_graph(seed)
+    csr = to_graph(edges, positions).freeze()
+    heuristic = vector.CoordinateHeuristic(csr)
+
+    expected = reference_distances(edges, 'n0')
+    for goal in edges:
+        path, cost, _ = vector.a_star_vectorized(csr, 'n0', goal, heuristic)
+        if goal not in expected:
+            assert path is None and cost == math.inf
+            continue
+        assert cost == pytest.approx(expected[goal])
+        assert path_cost(edges, path) == pytest.approx(cost)
+
+
+def test_a_star_vectorized_requires_csr():
+    graph = to_graph(*random_graph(0))
+    with pytest.raises(TypeError):
+        module('70_vector_heuristic').a_star_vectorized(graph, 'n0', 'n1')